@@ -0,0 +1,99 @@
+"""Import-time budget check based on ``python -X importtime``.
+
+Usage::
+
+    python benchmarks/import_time.py            # report, exit 1 if over budget
+    python benchmarks/import_time.py --runs 9 --budget-ms "import tabletkiua=5"
+
+For each statement, the cumulative time of every top-level module it
+imports (beyond bare interpreter startup) is summed; the median over
+``--runs`` fresh interpreters is compared with the budget.
+
+Budgets are milliseconds on the machine they were set on. Each run is
+paired with an import of :data:`REFERENCE` (stdlib modules the client needs
+anyway) and scaled down by how much slower than :data:`REFERENCE_MS` that
+was, so slower or busier hosts do not fail the check.
+``tests/test_import_time.py`` runs it in the test suite when
+``TABLETKIUA_IMPORT_BUDGETS=1`` is set.
+"""
+from __future__ import annotations
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# statement -> budget in milliseconds
+BUDGETS: Dict[str, float] = {
+    "import tabletkiua": 5.0,
+    "from tabletkiua import ProductCard": 25.0,
+    "from tabletkiua import TabletkiUA": 40.0,
+}
+
+# Stdlib-only calibration import and its cost where BUDGETS were set
+REFERENCE = "import concurrent.futures.thread, dataclasses, json, logging"
+REFERENCE_MS = 14.0
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\| ( *)(\S+)\s*$")
+
+
+def _top_level(stmt: str, pycache: str) -> Dict[str, int]:
+    """``{module: cumulative µs}`` for modules imported at nesting level 0."""
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONPYCACHEPREFIX=pycache)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", stmt],
+                          capture_output=True, text=True, env=env, check=True)
+    out: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m and not m.group(3):
+            out[m.group(4)] = int(m.group(2))
+    return out
+
+
+def measure(stmt: str) -> float:
+    """Milliseconds of imports caused by ``stmt`` (one run, after a warm-up
+    run that fills the bytecode cache)."""
+    # A private bytecode cache: an installed package imports from .pyc files,
+    # so stale or disabled bytecode must not count as import time
+    with tempfile.TemporaryDirectory(prefix="tabletkiua-importtime-") as pycache:
+        _top_level(stmt, pycache)
+        baseline = _top_level("pass", pycache)
+        imported = _top_level(stmt, pycache)
+    return sum(us for mod, us in imported.items() if mod not in baseline) / 1000.0
+
+
+def normalized(stmt: str) -> float:
+    """:func:`measure` scaled to the machine the budgets were set on."""
+    slowdown = max(1.0, measure(REFERENCE) / REFERENCE_MS)
+    return measure(stmt) / slowdown
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", action="append", default=[], metavar="STMT=MS",
+                        help="override/add a budget, e.g. 'import tabletkiua=5'")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS)
+    for item in args.budget_ms:
+        stmt, _, ms = item.rpartition("=")
+        budgets[stmt.strip()] = float(ms)
+
+    failed = False
+    for stmt, budget in budgets.items():
+        median = statistics.median(normalized(stmt) for _ in range(args.runs))
+        ok = median <= budget
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {median:7.2f} ms (budget {budget:g} ms)  {stmt}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Model serialization: ``to_bytes``/``from_bytes`` vs pickle vs JSON.
+
+Usage::
+
+    python benchmarks/serialization.py            # synthetic card
+    python benchmarks/serialization.py card.json  # a saved ProductCard/card response
+
+JSON round-trips the raw payload and rebuilds the card with ``from_dict``,
+as a cache storing responses would.
+"""
+from __future__ import annotations
+import json
+import os
+import pickle
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabletkiua.models import ProductCard
+
+
+def synthetic_card() -> Dict[str, Any]:
+    html = "<p>Склад: діюча речовина — парацетамол 500 мг; допоміжні речовини.</p>" * 8
+    return {
+        "goodsName": "Парацетамол таблетки 500 мг блістер №10",
+        "goodsId": "a1b2c3d4", "goodsIntCode": 1025098,
+        "tradeName": "Парацетамол", "tradenameLink": "/Paracetamol/", "tradeNameIntCode": "5521",
+        "topTradeNameIntCode": "120", "isDrugs": True, "isTradeName": False, "isSingleSku": False,
+        "canBeDelivered": True, "hasInstruction": True, "hasFaq": True,
+        "priceMin": 18.45, "priceMax": 31.2,
+        "shareUrl": "https://tabletki.ua/uk/Paracetamol/1025098/",
+        "canonicalUrl": "https://tabletki.ua/uk/Paracetamol/1025098/",
+        "analyticsUrl": "/Paracetamol/1025098/",
+        "images": [{"id": str(i), "type": "photo", "url": f"https://img/{i}.jpg",
+                    "bigUrl": f"https://img/{i}b.jpg", "previewUrl": f"https://img/{i}p.jpg",
+                    "order": i, "goodsname": "Парацетамол"} for i in range(6)],
+        "characteristics": [{"id": i, "name": f"Характеристика {i}", "order": i,
+                             "values": [{"id": f"{i}.{j}", "name": f"Значення {j}",
+                                         "code": f"c{j}", "urlName": f"v{j}"} for j in range(3)]}
+                            for i in range(12)],
+        "descriptionByParts": [{"id": i, "title": f"Розділ {i}", "anchor": f"a{i}",
+                                "order": i, "html": html} for i in range(4)],
+        "instructionByParts": [{"id": i, "title": f"Інструкція {i}", "anchor": f"i{i}",
+                                "order": i, "html": html} for i in range(10)],
+        "faqs": [{"title": "Питання", "priority": 1,
+                  "items": [{"title": f"Питання {k}?", "text": "Відповідь. " * 10,
+                             "priority": k, "anchor": f"q{k}"} for k in range(5)]}],
+        "aboutProduction": {"producersName": "Дарниця", "code": "D1", "logo": None},
+        "dosageInfo": {"inputType": 1, "count": 10.0, "nameUk": "табл."},
+        "hintData": {"waitlistInfo": {"goodsIntCode": 1025098, "showButton": False},
+                     "deliveryDataInfo": {"priceMin": 18.45}},
+        "dfp": {"GOODS": "1025098", "ATC": ["N02BE01 Paracetamol"], "ATCFull": [],
+                "CATEGORIES": ["1", "22", "333"], "TownId": "1"},
+        "priceHistory": {f"2024-{m:02d}-01": 18.0 + m for m in range(1, 13)},
+    }
+
+
+def main() -> int:
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as fh:
+            payload = json.load(fh)
+    else:
+        payload = synthetic_card()
+    card = ProductCard.from_dict(payload)
+
+    codecs: List[Tuple[str, Callable[[], bytes], Callable[[bytes], Any]]] = [
+        ("pickle", lambda: pickle.dumps(card, pickle.HIGHEST_PROTOCOL), pickle.loads),
+        ("json+from_dict",
+         lambda: json.dumps(card.raw, ensure_ascii=False).encode("utf-8"),
+         lambda b: ProductCard.from_dict(json.loads(b))),
+        ("to_bytes", card.to_bytes, ProductCard.from_bytes),
+        ("to_bytes(raw=0)", lambda: card.to_bytes(raw=False), ProductCard.from_bytes),
+    ]
+    print(f"{'codec':<16}{'bytes':>9}{'encode µs':>12}{'decode µs':>12}")
+    for name, enc, dec in codecs:
+        blob = enc()
+        back = dec(blob)
+        if back.raw:
+            assert back == card, name
+        n, t_enc = timeit.Timer(enc).autorange()
+        e_us = t_enc / n * 1e6
+        n, t_dec = timeit.Timer(lambda: dec(blob)).autorange()
+        d_us = t_dec / n * 1e6
+        print(f"{name:<16}{len(blob):>9}{e_us:>12.1f}{d_us:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,101 @@
-"""Public package surface for TabletkiUA API client."""
-from .client import TabletkiUA, ClientConfig
-from .device import DeviceProfile
-from .models import (
-    Location,
-    SearchHintsResponse,
-    ProductCard,
-)
-from .exceptions import ApiError, NetworkError, SerializationError
-
-
-__all__ = [
-    "TabletkiUA",
-    "ClientConfig",
-    "DeviceProfile",
-    "Location",
-    "SearchHintsResponse",
-    "ProductCard",
-    "ApiError",
-    "NetworkError",
-    "SerializationError",
-]
+"""Public package surface for TabletkiUA API client.
+
+Names are resolved lazily (PEP 562): ``import tabletkiua`` loads nothing
+else, and e.g. ``requests`` is only imported once a client sends traffic.
+"""
+from __future__ import annotations
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import TabletkiUA, ClientConfig
+    from .cache import ResponseCache
+    from .backends import MemoryBackend, RedisBackend
+    from .matrix import PriceMatrix
+    from .metrics import LatencyRecorder, TrafficStats
+    from .device import DeviceProfile
+    from .models import (
+        Location,
+        SearchHintsResponse,
+        ProductCard,
+    )
+    from .exceptions import (
+        ApiError,
+        BulkheadFullError,
+        CircuitOpenError,
+        DeadlineExceededError,
+        NetworkError,
+        SerializationError,
+    )
+    from .resilience import Resilience
+    from .search_index import SearchIndex
+    from .hints import HintsCache
+    from .columnar import HintsTable
+    from .locations import LocationRegistry
+    from .history import PriceHistoryStore
+    from .diff import CardDiffer, CardSnapshot, ChangeEvent
+    from .sections import SectionProcessor
+    from .shm import CardRing, parse_cards_shared
+    from .images import ImageMirror
+    from .family import TradeNameGraph
+    from .facets import FacetIndex
+    from .transport import FakeTransport, HttpxTransport, RequestsTransport, Transport
+    from .recording import RecordingTransport, ReplayTransport
+
+# public name -> defining submodule
+_LAZY = {
+    "TabletkiUA": "client",
+    "ClientConfig": "client",
+    "ResponseCache": "cache",
+    "MemoryBackend": "backends",
+    "RedisBackend": "backends",
+    "PriceMatrix": "matrix",
+    "TrafficStats": "metrics",
+    "LatencyRecorder": "metrics",
+    "DeviceProfile": "device",
+    "Location": "models",
+    "SearchHintsResponse": "models",
+    "ProductCard": "models",
+    "ApiError": "exceptions",
+    "NetworkError": "exceptions",
+    "SerializationError": "exceptions",
+    "CircuitOpenError": "exceptions",
+    "BulkheadFullError": "exceptions",
+    "DeadlineExceededError": "exceptions",
+    "Resilience": "resilience",
+    "SearchIndex": "search_index",
+    "HintsCache": "hints",
+    "HintsTable": "columnar",
+    "LocationRegistry": "locations",
+    "PriceHistoryStore": "history",
+    "CardDiffer": "diff",
+    "CardSnapshot": "diff",
+    "ChangeEvent": "diff",
+    "SectionProcessor": "sections",
+    "CardRing": "shm",
+    "parse_cards_shared": "shm",
+    "ImageMirror": "images",
+    "TradeNameGraph": "family",
+    "FacetIndex": "facets",
+    "Transport": "transport",
+    "RequestsTransport": "transport",
+    "HttpxTransport": "transport",
+    "FakeTransport": "transport",
+    "RecordingTransport": "recording",
+    "ReplayTransport": "recording",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
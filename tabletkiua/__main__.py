@@ -0,0 +1,6 @@
+"""``python -m tabletkiua`` entry point."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
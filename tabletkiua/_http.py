@@ -1,12 +1,21 @@
 from __future__ import annotations
+import functools
 import logging
-from typing import Iterable
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import re
+import time
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, FrozenSet, Iterable, Mapping, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+    from .transport import TransportResponse
 
 _LOG = logging.getLogger(__name__)
 
+# Mirrors urllib3.util.retry.Retry defaults
+_RETRY_AFTER_STATUS = frozenset({413, 429, 503})
+_BACKOFF_MAX = 120.0
+
 # Sensitive headers that will be redacted in logs
 _SENSITIVE = {"AppApiToken", "Cookie", "Authorization"}
 
@@ -20,8 +29,50 @@ def _redact_headers(headers: dict[str, str] | None) -> dict[str, str] | None:
     return redacted
 
 
+# Content-Encoding -> modules urllib3 / httpx use to decode it (any one suffices)
+_DECODERS = {
+    "zstd": ("zstandard",),
+    "br": ("brotli", "brotlicffi"),
+}
+
+
+def _urllib3_major() -> int:
+    import urllib3
+
+    return int(urllib3.__version__.split(".")[0])
+
+
+@functools.lru_cache(maxsize=None)
+def available_encodings(stack: Optional[str] = None) -> FrozenSet[str]:
+    """Content encodings that can be decoded here: by the HTTP ``stack``
+    (``"urllib3"`` behind requests, ``"httpx"``) or, with ``None``, by any."""
+    found = {"gzip", "deflate"}
+    for encoding, modules in _DECODERS.items():
+        if any(find_spec(m) is not None for m in modules):
+            found.add(encoding)
+    if stack == "urllib3" and _urllib3_major() < 2:  # zstd support arrived in 2.0
+        found.discard("zstd")
+    return frozenset(found)
+
+
+def accept_encoding(preferred: Sequence[str], usable: Optional[FrozenSet[str]] = None) -> str:
+    """``Accept-Encoding`` value: the ``preferred`` encodings (in order) that
+    can be decoded (``usable``, default :func:`available_encodings`),
+    falling back to gzip."""
+    if usable is None:
+        usable = available_encodings()
+    chosen = [e for e in preferred if e in usable]
+    return ", ".join(chosen) if chosen else "gzip"
+
+
 def build_session(*, retries: int = 3, backoff_factor: float = 0.5,
-                  status_forcelist: Iterable[int] = (429, 500, 502, 503, 504)) -> requests.Session:
+                  status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+                  pool_maxsize: int = 10) -> "requests.Session":
+    # Imported here: requests/urllib3 dominate the package's import time
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
     s = requests.Session()
     retry = Retry(
         total=retries,
@@ -32,20 +83,49 @@ def build_session(*, retries: int = 3, backoff_factor: float = 0.5,
         allowed_methods={"GET", "POST", "PUT", "PATCH", "DELETE"},
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
     s.mount("https://", adapter)
     s.mount("http://", adapter)
     return s
 
 
+def backoff_delay(attempt: int, backoff_factor: float) -> float:
+    """Sleep before retry number ``attempt`` (1-based), as urllib3 computes it."""
+    if attempt <= 1:
+        return 0.0
+    return min(_BACKOFF_MAX, backoff_factor * (2 ** (attempt - 1)))
+
+
+def retry_after(headers: Mapping[str, str], status_code: int) -> Optional[float]:
+    """Seconds from a ``Retry-After`` header on 413/429/503, else ``None``."""
+    if status_code not in _RETRY_AFTER_STATUS:
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    if re.match(r"^\s*[0-9]+\s*$", value):
+        seconds = float(int(value))
+    else:
+        import email.utils  # rare path; costly to import eagerly
+
+        parsed = email.utils.parsedate_tz(value)
+        if parsed is None:
+            return None
+        seconds = email.utils.mktime_tz(parsed) - time.time()
+    return min(_BACKOFF_MAX, max(0.0, seconds))
+
+
 def log_request(method: str, url: str, *, headers: dict[str, str] | None, params, json):
     if _LOG.isEnabledFor(logging.DEBUG):
         _LOG.debug("→ %s %s headers=%s params=%s json=%s",
                    method, url, _redact_headers(headers), params, json)
 
 
-def log_response(resp: requests.Response):
+def log_response(resp: "requests.Response | TransportResponse", *, body: bool = True):
     if _LOG.isEnabledFor(logging.DEBUG):
+        if not body:  # streamed: reading the body here would consume it
+            _LOG.debug("← %s %s <streamed>", resp.status_code, resp.url)
+            return
         try:
             body = resp.json()
         except Exception:
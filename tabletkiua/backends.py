@@ -0,0 +1,265 @@
+"""Shared second-tier stores for :class:`~tabletkiua.cache.ResponseCache`.
+
+Backends move opaque ``bytes`` (compressed, serialized entries built by
+the cache) and provide short-lived locks so that only one process or host
+refreshes a hot key. :class:`MemoryBackend` is an in-process stand-in;
+:class:`RedisBackend` speaks RESP to Redis or any compatible server
+(KeyDB, Dragonfly, Valkey) with nothing beyond the standard library.
+
+Usage::
+
+    backend = RedisBackend.from_url("redis://cache.internal:6379/2")
+    cache = ResponseCache(ttl=300, backend=backend)
+    client = TabletkiUA(token, cache=cache)
+"""
+from __future__ import annotations
+import queue
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from .exceptions import BackendError
+
+
+class CacheBackend(Protocol):
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]: ...
+
+    def set_many(self, items: Mapping[str, bytes], ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Token if the lock was taken, ``None`` if someone else holds it."""
+
+    def release_lock(self, key: str, token: str) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """Thread-safe in-process backend with per-key expiry (tests, single host)."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._data[key]
+            return None
+        return entry[1]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.monotonic()
+        with self._lock:
+            return [self._get(k, now) for k in keys]
+
+    def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        expires = time.monotonic() + ttl
+        with self._lock:
+            for k, v in items.items():
+                self._data[k] = (expires, v)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            if self._get(lock_key, now) is not None:
+                return None
+            self._data[lock_key] = (now + ttl, token.encode())
+        return token
+
+    def release_lock(self, key: str, token: str) -> None:
+        lock_key = f"lock:{key}"
+        with self._lock:
+            if self._get(lock_key, time.monotonic()) == token.encode():
+                del self._data[lock_key]
+
+    def close(self) -> None:
+        pass
+
+
+_Reply = Union[bytes, int, None, List["_Reply"]]
+
+# Deletes the lock only if it still holds our token
+_UNLOCK = (b"if redis.call('get', KEYS[1]) == ARGV[1] then "
+           b"return redis.call('del', KEYS[1]) else return 0 end")
+
+
+def _encode(*args: Union[str, bytes, int, float]) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for a in args:
+        b = a if isinstance(a, bytes) else str(a).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(b), b))
+    return b"".join(out)
+
+
+class _Connection:
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rb")
+
+    def execute(self, commands: Sequence[bytes]) -> List[_Reply]:
+        """Send all commands in one write, then read one reply per command."""
+        self.sock.sendall(b"".join(commands))
+        return [self._read() for _ in commands]
+
+    def _read(self) -> _Reply:
+        line = self.file.readline()
+        if not line.endswith(b"\r\n"):
+            raise BackendError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise BackendError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = self.file.read(n + 2)
+            if len(data) != n + 2:
+                raise BackendError("connection closed")
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read() for _ in range(n)]
+        raise BackendError(f"unexpected reply {line[:20]!r}")
+
+    def close(self) -> None:
+        try:
+            self.file.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisBackend:
+    """Redis-protocol backend: pooled sockets, pipelined ``MGET``/``SET``,
+    ``SET NX PX`` locks released by token via ``EVAL``.
+
+    Keys are namespaced with ``prefix``. Socket and protocol failures are
+    raised as :class:`BackendError`; the broken connection is discarded.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        *,
+        db: int = 0,
+        password: Optional[str] = None,
+        username: Optional[str] = None,
+        prefix: str = "tabletkiua:",
+        timeout: float = 2.0,
+        max_connections: int = 8,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.prefix = prefix
+        self.timeout = timeout
+        self._auth = (username, password)
+        self._pool: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisBackend":
+        """``redis://[[user]:password@]host[:port][/db]``."""
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme!r}")
+        db = parts.path.strip("/")
+        return cls(
+            parts.hostname or "localhost",
+            parts.port or 6379,
+            db=int(db) if db else 0,
+            username=unquote(parts.username) if parts.username else None,
+            password=unquote(parts.password) if parts.password else None,
+            **kwargs,
+        )
+
+    # ---- Connections ----
+    def _connect(self) -> _Connection:
+        conn = _Connection(self.host, self.port, self.timeout)
+        setup: List[bytes] = []
+        username, password = self._auth
+        if password is not None:
+            setup.append(_encode("AUTH", username, password) if username
+                         else _encode("AUTH", password))
+        if self.db:
+            setup.append(_encode("SELECT", self.db))
+        if setup:
+            conn.execute(setup)
+        return conn
+
+    def _execute(self, commands: Sequence[bytes]) -> List[_Reply]:
+        if not commands:
+            return []
+        if not self._slots.acquire(timeout=self.timeout):
+            raise BackendError("connection pool exhausted")
+        conn: Optional[_Connection] = None
+        try:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            replies = conn.execute(commands)
+        except (OSError, ValueError, BackendError) as e:
+            if conn is not None:
+                conn.close()
+            conn = None
+            if isinstance(e, BackendError):
+                raise
+            raise BackendError(str(e)) from e
+        finally:
+            if conn is not None:
+                self._pool.put(conn)
+            self._slots.release()
+        return replies
+
+    # ---- CacheBackend ----
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        reply = self._execute([_encode("MGET", *(self.prefix + k for k in keys))])[0]
+        if not isinstance(reply, list):
+            return [None] * len(keys)
+        return [r if isinstance(r, bytes) else None for r in reply]
+
+    def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        px = max(1, int(ttl * 1000))
+        self._execute([_encode("SET", self.prefix + k, v, "PX", px) for k, v in items.items()])
+
+    def delete(self, key: str) -> None:
+        self._execute([_encode("DEL", self.prefix + key)])
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reply = self._execute([_encode("SET", f"{self.prefix}lock:{key}", token,
+                                       "NX", "PX", max(1, int(ttl * 1000)))])[0]
+        return token if reply == b"OK" else None
+
+    def release_lock(self, key: str, token: str) -> None:
+        self._execute([_encode("EVAL", _UNLOCK, 1, f"{self.prefix}lock:{key}", token)])
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,343 @@
+from __future__ import annotations
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Mapping, Optional, Sequence, Set,
+                    Tuple)
+from urllib.parse import urlencode
+
+from .exceptions import BackendError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .backends import CacheBackend
+
+_LOG = logging.getLogger(__name__)
+
+
+def cache_key(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    json_body: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> str:
+    """Stable key for a request; only headers that change the answer are included."""
+    parts = [method.upper(), url]
+    if params:
+        parts.append(urlencode(sorted((k, str(v)) for k, v in params.items())))
+    if json_body is not None:
+        parts.append(json.dumps(json_body, sort_keys=True, ensure_ascii=False))
+    if headers:
+        parts.append(f"loc={headers.get('Location', '')};lang={headers.get('Lang', '')}")
+    return "|".join(parts)
+
+
+FRESH = "fresh"
+STALE = "stale"  # serve now, revalidate in the background
+STALE_IF_ERROR = "stale_if_error"  # serve only if a refetch fails
+MISS = "miss"
+
+_ENTRY_VERSION = 1
+
+
+def encode_entry(stored_at: float, value: Any) -> bytes:
+    """zlib-compressed JSON ``[version, stored_at (epoch seconds), value]``."""
+    raw = json.dumps([_ENTRY_VERSION, stored_at, value], ensure_ascii=False,
+                     separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, 6)
+
+
+def decode_entry(data: bytes) -> Optional[Tuple[float, Any]]:
+    """``(stored_at, value)``, or ``None`` for unreadable/foreign entries."""
+    try:
+        version, stored_at, value = json.loads(zlib.decompress(data))
+    except (zlib.error, ValueError, TypeError):
+        return None
+    return (float(stored_at), value) if version == _ENTRY_VERSION else None
+
+
+class ResponseCache:
+    """Thread-safe in-memory TTL + LRU cache of decoded JSON responses.
+
+    Values are shared, not copied: treat cached payloads as read-only.
+
+    Expired entries are kept for ``max(stale_while_revalidate,
+    stale_if_error)`` more seconds. Within ``stale_while_revalidate`` the
+    client returns them at once and refreshes them in the background (at
+    most ``max_refreshes`` at a time, one per key); within
+    ``stale_if_error`` they are returned when a refetch raises
+    :class:`NetworkError` or a 5xx :class:`ApiError`.
+
+    With a ``backend`` (see :mod:`tabletkiua.backends`) the in-memory LRU is
+    a first tier in front of a shared store: misses are looked up there,
+    writes go to both, and :meth:`fill` takes a backend lock so only one
+    host fetches a missing key while the others wait up to ``lock_timeout``
+    for its result. Backend failures degrade to local-only caching.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 10_000,
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        max_refreshes: int = 4,
+        backend: Optional["CacheBackend"] = None,
+        lock_timeout: float = 10.0,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.max_refreshes = max_refreshes
+        self.backend = backend
+        self.lock_timeout = lock_timeout
+        self.stats: Dict[str, int] = {
+            "hits": 0, "misses": 0, "stale": 0, "stale_if_error": 0,
+            "revalidated": 0, "revalidate_errors": 0,
+            "backend_hits": 0, "backend_errors": 0, "lock_waits": 0,
+        }
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def retention(self) -> float:
+        """Seconds an entry is kept after being stored."""
+        return self.ttl + max(self.stale_while_revalidate, self.stale_if_error)
+
+    def _state(self, age: float) -> str:
+        if age <= self.ttl:
+            return FRESH
+        if age <= self.ttl + self.stale_while_revalidate:
+            return STALE
+        if age <= self.ttl + self.stale_if_error:
+            return STALE_IF_ERROR
+        return MISS
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += n
+
+    # ---- Shared tier ----
+    @staticmethod
+    def _backend_key(key: str) -> str:
+        import hashlib  # only needed with a backend; kept off the client import path
+
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _backend_call(self, fn: Callable[[], Any], default: Any = None) -> Any:
+        try:
+            return fn()
+        except BackendError as e:
+            _LOG.debug("Cache backend error: %s", e)
+            self._count("backend_errors")
+            return default
+
+    def _pull(self, keys: Sequence[str]) -> Dict[str, Tuple[float, Any]]:
+        """Load ``keys`` from the backend into the local tier; ``{key: entry}``."""
+        backend = self.backend
+        if backend is None or not keys:
+            return {}
+        blobs = self._backend_call(
+            lambda: backend.get_many([self._backend_key(k) for k in keys]), [])
+        found: Dict[str, Tuple[float, Any]] = {}
+        now_wall, now_mono = time.time(), time.monotonic()
+        for key, blob in zip(keys, blobs):
+            decoded = decode_entry(blob) if blob is not None else None
+            if decoded is None:
+                continue
+            stored_at = now_mono - max(0.0, now_wall - decoded[0])
+            if self._state(now_mono - stored_at) != MISS:
+                found[key] = (stored_at, decoded[1])
+        if found:
+            with self._lock:
+                for key, entry in found.items():
+                    current = self._entries.get(key)
+                    if current is None or current[0] < entry[0]:
+                        self._entries[key] = entry
+                        self._entries.move_to_end(key)
+                self._evict()
+                self.stats["backend_hits"] += len(found)
+        return found
+
+    def _push(self, items: Mapping[str, Any]) -> None:
+        backend = self.backend
+        if backend is None or not items:
+            return
+        now = time.time()
+        blobs = {self._backend_key(k): encode_entry(now, v) for k, v in items.items()}
+        self._backend_call(lambda: backend.set_many(blobs, self.retention))
+
+    # ---- Lookups ----
+    def _local(self, key: str) -> Tuple[Optional[Any], str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, MISS
+            state = self._state(time.monotonic() - entry[0])
+            if state == MISS:
+                del self._entries[key]
+                return None, MISS
+            self._entries.move_to_end(key)
+            return entry[1], state
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], str]:
+        """``(value, state)`` where state is ``FRESH``, ``STALE``,
+        ``STALE_IF_ERROR`` or ``MISS`` (value ``None``)."""
+        value, state = self._local(key)
+        if state == MISS and self.backend is not None:
+            entry = self._pull([key]).get(key)
+            if entry is not None:
+                value, state = entry[1], self._state(time.monotonic() - entry[0])
+        self._count({FRESH: "hits", STALE: "stale"}.get(state, "misses"))
+        return (value, state) if state != MISS else (None, MISS)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Fresh value or ``None``."""
+        value, state = self.lookup(key)
+        return value if state == FRESH else None
+
+    def warm(self, keys: Iterable[str], *, batch_size: int = 500) -> int:
+        """Pull entries missing locally from the backend in pipelined batches
+        (for bulk paths); returns how many were found.
+
+        Only warm what is about to be used: the local tier keeps at most
+        ``max_entries``, so keys beyond that evict the first ones again.
+        """
+        if self.backend is None:
+            return 0
+        batch_size = max(1, min(batch_size, self.max_entries))
+        now = time.monotonic()
+        with self._lock:
+            todo = [k for k in dict.fromkeys(keys)
+                    if k not in self._entries or self._state(now - self._entries[k][0]) != FRESH]
+        found = 0
+        for i in range(0, len(todo), batch_size):
+            found += len(self._pull(todo[i:i + batch_size]))
+        return found
+
+    # ---- Writes ----
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        """Store several values; the backend gets them in one pipelined round trip."""
+        now = time.monotonic()
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+            self._evict()
+        self._push(items)
+
+    def fill(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        *,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """Fetch and store ``key``, letting only one backend client fetch it.
+
+        If another host holds the refresh lock, wait (up to ``lock_timeout``,
+        and never past the ``time.monotonic()`` instant ``deadline``) for the
+        value it stores; call ``fetch`` anyway if it never shows up.
+        """
+        backend = self.backend
+        token = None
+        if backend is not None:
+            token = self._backend_call(lambda: backend.acquire_lock(
+                self._backend_key(key), self.lock_timeout), "")
+            if token is None:  # someone else is fetching it
+                self._count("lock_waits")
+                wait_until = time.monotonic() + self.lock_timeout
+                if deadline is not None:
+                    wait_until = min(wait_until, deadline)
+                delay = 0.02
+                while (left := wait_until - time.monotonic()) > 0:
+                    time.sleep(min(delay, left))
+                    delay = min(delay * 2, 0.5)
+                    entry = self._pull([key]).get(key)
+                    if entry is not None and self._state(time.monotonic() - entry[0]) == FRESH:
+                        return entry[1]
+        try:
+            value = fetch()
+            self.set(key, value)
+            return value
+        finally:
+            if token and backend is not None:
+                self._backend_call(lambda: backend.release_lock(self._backend_key(key), token))
+
+    def served_stale(self) -> None:
+        """Count a ``STALE_IF_ERROR`` value returned in place of an error."""
+        self._count("stale_if_error")
+
+    def revalidate(self, key: str, fetch: Callable[[], Any]) -> bool:
+        """Refresh ``key`` with ``fetch()`` on a background thread.
+
+        Returns ``False`` (and does nothing) if ``key`` is already being
+        refreshed or ``max_refreshes`` refreshes are running. With a backend,
+        a refresh another host is already doing is skipped.
+        """
+        with self._lock:
+            if key in self._refreshing or len(self._refreshing) >= self.max_refreshes:
+                return False
+            self._refreshing.add(key)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, self.max_refreshes),
+                                                thread_name_prefix="tabletkiua-revalidate")
+            pool = self._pool
+
+        def run() -> None:
+            backend = self.backend
+            token = None
+            try:
+                if backend is not None:
+                    token = self._backend_call(lambda: backend.acquire_lock(
+                        self._backend_key(key), self.lock_timeout), "")
+                    if token is None:
+                        return
+                value = fetch()
+            except Exception as e:  # keep serving the stale value
+                _LOG.debug("Revalidation of %s failed: %s", key, e)
+                self._count("revalidate_errors")
+            else:
+                self.set(key, value)
+                self._count("revalidated")
+            finally:
+                if token and backend is not None:
+                    self._backend_call(
+                        lambda: backend.release_lock(self._backend_key(key), token))
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        pool.submit(run)
+        return True
+
+    def clear(self) -> None:
+        """Drop local entries (the shared backend is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Stop background revalidation (pending refreshes are dropped)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._refreshing.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
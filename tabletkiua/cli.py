@@ -0,0 +1,287 @@
+"""``tabletkiua`` command-line interface.
+
+Single lookups print one JSON document; batch subcommands (``cards``,
+``barcodes``) read one input per line from a file or stdin, fetch
+concurrently and stream one JSON line per input to stdout::
+
+    tabletkiua location
+    tabletkiua search "аквар"
+    tabletkiua card 1025098
+    cut -f1 codes.tsv | tabletkiua cards -j 16 --rate 20 --fields priceMin,priceMax
+
+The token is read from ``--token`` or ``$TABLETKIUA_TOKEN``.
+"""
+from __future__ import annotations
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import ResponseCache
+from .client import ClientConfig, TabletkiUA
+from .device import DeviceProfile
+from .exceptions import ApiError, NetworkError, SerializationError
+
+_ERRORS = (ApiError, NetworkError, SerializationError)
+
+
+class _RateLimiter:
+    """Token bucket shared by worker threads (``rate`` requests per second)."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+def _dump(obj: Any, out: IO[str]) -> None:
+    out.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+    out.write("\n")
+    out.flush()
+
+
+def _read_lines(path: Optional[str]) -> Iterator[str]:
+    fh = sys.stdin if path in (None, "-") else open(path, encoding="utf-8")
+    try:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def _parse_code(line: str) -> Tuple[str, str]:
+    """``code``, ``code<TAB>name`` or ``{"id"|"goodsIntCode": ..., "name": ...}``."""
+    if line.startswith("{"):
+        d = json.loads(line)
+        return str(d.get("id") or d.get("goodsIntCode")), d.get("name", "")
+    code, _, name = line.partition("\t")
+    return code.strip(), name.strip()
+
+
+def _project(raw: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    return {k: raw.get(k) for k in fields} if fields else raw
+
+
+def _run_batch(
+    inputs: Iterable[str],
+    work: Callable[[str], Any],
+    *,
+    jobs: int,
+    ordered: bool,
+    out: IO[str],
+) -> int:
+    """Run ``work`` over ``inputs`` with at most ``jobs * 2`` in flight; print JSONL.
+
+    A closed ``out`` (``BrokenPipeError``) ends the batch: queued work is
+    cancelled and the error propagates.
+    """
+    failures = 0
+
+    def emit(line: str, fut: "Future[Any]") -> None:
+        nonlocal failures
+        try:
+            record = {"input": line, "ok": True, "result": fut.result()}
+        except Exception as e:  # report per input, keep the pipeline going
+            failures += 1
+            record = {"input": line, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        _dump(record, out)
+
+    window = jobs * 2
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        try:
+            if ordered:
+                queue: Deque[Tuple[str, Future[Any]]] = deque()
+                for line in inputs:
+                    queue.append((line, pool.submit(work, line)))
+                    while len(queue) >= window or (queue and queue[0][1].done()):
+                        emit(*queue.popleft())
+                while queue:
+                    emit(*queue.popleft())
+            else:
+                pending: Dict[Future[Any], str] = {}
+                for line in inputs:
+                    pending[pool.submit(work, line)] = line
+                    if len(pending) >= window:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            emit(pending.pop(fut), fut)
+                for fut in as_completed(list(pending)):
+                    emit(pending.pop(fut), fut)
+        except BrokenPipeError:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return 1 if failures else 0
+
+
+def _silence_stdout() -> None:
+    """Point stdout at devnull so the interpreter's final flush does not
+    raise ``BrokenPipeError`` again."""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, sys.stdout.fileno())
+    except (AttributeError, OSError, ValueError):  # not backed by a file descriptor
+        sys.stdout = os.fdopen(devnull, "w")
+    else:
+        os.close(devnull)
+
+
+def _build_client(args: argparse.Namespace) -> TabletkiUA:
+    token = args.token or os.environ.get("TABLETKIUA_TOKEN", "")
+    config = ClientConfig(timeout=args.timeout, retries=args.retries,
+                          pool_maxsize=max(10, args.jobs * 2),
+                          deadline=args.deadline, hedge=args.hedge)
+    if args.base_url:
+        config.base_url = args.base_url
+    transport = None
+    if args.http2:
+        from .transport import HttpxTransport
+
+        transport = HttpxTransport(max_connections=max(1, args.jobs))
+    return TabletkiUA(
+        token,
+        identity=DeviceProfile.generate(lang=args.lang, location_header=args.location or ""),
+        config=config,
+        transport=transport,
+        cache=ResponseCache(ttl=args.cache_ttl) if args.cache_ttl > 0 else None,
+    )
+
+
+def _add_run_options(parser: argparse.ArgumentParser, *, suppress: bool = False) -> None:
+    """Transport and batch options, accepted before or after the subcommand.
+
+    ``suppress`` leaves unset options out of the namespace, so a subcommand
+    copy does not overwrite values given before the subcommand.
+    """
+    def default(value: Any) -> Any:
+        return argparse.SUPPRESS if suppress else value
+
+    parser.add_argument("--deadline", type=float, default=default(None),
+                        help="total seconds per lookup, across retries")
+    parser.add_argument("--hedge", action="store_true", default=default(False),
+                        help="hedge card/location GETs after the endpoint's p95 latency")
+    parser.add_argument("--http2", action="store_true", default=default(False),
+                        help="use the httpx HTTP/2 transport")
+    parser.add_argument("-j", "--jobs", type=int, default=default(8),
+                        help="parallel requests (batch)")
+    parser.add_argument("--rate", type=float, default=default(0.0),
+                        help="max requests per second across workers (0 = unlimited)")
+    parser.add_argument("--cache-ttl", type=float, default=default(300.0),
+                        help="in-process response cache TTL in seconds (0 = off)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tabletkiua", description="app.tabletki.ua API client")
+    parser.add_argument("--token", help="AppApiToken (default: $TABLETKIUA_TOKEN)")
+    parser.add_argument("--lang", default="uk", choices=("uk", "ru"))
+    parser.add_argument("--location", help="Location id sent with every request")
+    parser.add_argument("--base-url")
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--retries", type=int, default=3)
+    _add_run_options(parser)
+    shared = argparse.ArgumentParser(add_help=False)
+    _add_run_options(shared, suppress=True)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("location", help="location by caller IP", parents=[shared])
+
+    p = sub.add_parser("search", help="search hints for a term", parents=[shared])
+    p.add_argument("term")
+    p.add_argument("--transliterate", action="store_true")
+    p.add_argument("--type", default="DEFAULT")
+
+    p = sub.add_parser("card", help="one product card", parents=[shared])
+    p.add_argument("id", help="goodsIntCode")
+    p.add_argument("--name", default="")
+
+    for name, help_ in (("cards", "product cards for codes (code, code<TAB>name or JSON)"),
+                        ("barcodes", "resolve barcodes via search, then fetch cards")):
+        p = sub.add_parser(name, help=help_, parents=[shared])
+        p.add_argument("input", nargs="?", help="input file (default: stdin)")
+        p.add_argument("--ordered", action="store_true", help="emit results in input order")
+
+    for p in (sub.choices["card"], sub.choices["cards"], sub.choices["barcodes"]):
+        p.add_argument("--fields", help="comma-separated card fields to output")
+        p.add_argument("--skip", default="",
+                       help="comma-separated card fields to drop unparsed (streamed decode)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    limiter = _RateLimiter(args.rate, burst=args.jobs) if args.rate > 0 else None
+    fields = [f for f in (getattr(args, "fields", None) or "").split(",") if f] or None
+    skip = {f for f in (getattr(args, "skip", None) or "").split(",") if f}
+
+    def throttle() -> None:
+        if limiter is not None:
+            limiter.acquire()
+
+    try:
+        with _build_client(args) as client:
+            if args.command == "location":
+                _dump(dataclasses.asdict(client.location_by_ip(store=False)), out)
+                return 0
+            if args.command == "search":
+                resp = client.search_hints_v2(args.term, transliterate=args.transliterate,
+                                              type=args.type)
+                _dump(dataclasses.asdict(resp), out)
+                return 0
+
+            def card(code: str, name: str) -> Dict[str, Any]:
+                throttle()
+                raw = client.product_card(name=name, goods_int_code=code, skip=skip).raw
+                return _project(raw, fields)
+
+            if args.command == "card":
+                _dump(card(args.id, args.name), out)
+                return 0
+            if args.command == "cards":
+                return _run_batch(_read_lines(args.input), lambda line: card(*_parse_code(line)),
+                                  jobs=args.jobs, ordered=args.ordered, out=out)
+
+            def barcode(code: str) -> Dict[str, Any]:
+                throttle()
+                hints = client.search_hints_v2(code)
+                for grp in hints.group:
+                    for item in grp.searchItems:
+                        # Trade-name and category hits also carry codes
+                        if item.code and item.screenViewType == "GOODS":
+                            return card(item.code, item.name or "")
+                raise LookupError(f"No goods found for barcode {code}")
+
+            return _run_batch(_read_lines(args.input), barcode,
+                              jobs=args.jobs, ordered=args.ordered, out=out)
+    except BrokenPipeError:  # e.g. piped into `head`: stop, like a SIGPIPE'd tool
+        _silence_stdout()
+        return 141
+    except _ERRORS as e:
+        print(f"tabletkiua: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,17 +1,39 @@
 from __future__ import annotations
+import contextlib
 import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
-
-import requests
+from typing import (TYPE_CHECKING, Any, Callable, Collection, Dict, Iterator, List, Mapping,
+                    Optional, Sequence, Set, Tuple)
 
 from .device import DeviceProfile
-from .exceptions import ApiError, NetworkError, SerializationError
+from .exceptions import ApiError, DeadlineExceededError, NetworkError, SerializationError
 from .models import Location, SearchHintsResponse, ProductCard
-from ._http import build_session, log_request, log_response
+from .cache import FRESH, STALE, STALE_IF_ERROR, ResponseCache, cache_key
+from .matrix import PriceMatrix
+from .metrics import LatencyRecorder, RequestSample, TrafficStats
+from .resilience import Resilience
+from .streaming import decode_object
+from .transport import RequestsTransport, Transport, TransportResponse
+from ._http import (_redact_headers, accept_encoding, backoff_delay, build_session, log_request,
+                    log_response, retry_after)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+    from .recording import _Recording
 
 _LOG = logging.getLogger(__name__)
 
+# Card fields price_matrix never reads; streamed past instead of decoded
+_MATRIX_SKIP = frozenset({
+    "images", "characteristics", "descriptionByParts", "instructionByParts", "faqs",
+    "aboutProduction", "dosageInfo", "hintData", "dfp", "priceHistory",
+})
+
 
 @dataclass(slots=True)
 class ClientConfig:
@@ -21,6 +43,31 @@ class ClientConfig:
     retries: int = 3
     backoff_factor: float = 0.5
     status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504)
+    # connections kept per host; should cover the largest worker pool used
+    pool_maxsize: int = 32
+    # Accept-Encoding preference; encodings without an installed decoder are
+    # dropped (br: brotli/brotlicffi, zstd: zstandard), gzip is the fallback
+    encodings: tuple[str, ...] = ("zstd", "br", "gzip", "deflate")
+    # Default total budget per call in seconds, across retries (None = unbounded)
+    deadline: Optional[float] = None
+    # Hedge idempotent GETs: send a duplicate once the first attempt is slower
+    # than the endpoint's hedge_quantile latency (hedge_delay until enough samples)
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_delay: float = 1.0
+    hedge_min_samples: int = 20
+    # Keep full detail of failed requests and of those slower than the
+    # endpoint's sample_quantile latency (last sample_size; 0 disables)
+    sample_quantile: float = 0.99
+    sample_size: int = 100
+
+
+def _cap_timeout(
+    timeout: float | tuple[float, float], left: float,
+) -> float | tuple[float, float]:
+    if isinstance(timeout, tuple):
+        return (min(timeout[0], left), min(timeout[1], left))
+    return min(timeout, left)
 
 
 class TabletkiUA:
@@ -46,26 +93,54 @@ class TabletkiUA:
         *,
         identity: Optional[DeviceProfile] = None,
         config: Optional[ClientConfig] = None,
-        session: Optional[requests.Session] = None,
+        session: Optional["requests.Session"] = None,
+        transport: Optional[Transport] = None,
         cookies: Optional[Dict[str, str]] = None,
         proxies: Optional[Dict[str, str]] = None,
+        cache: Optional[ResponseCache] = None,
+        resilience: Optional[Resilience] = None,
     ) -> None:
         self._app_api_token = app_api_token
         self.identity = identity or DeviceProfile.generate()
         self.config = config or ClientConfig()
+        # Opt-in cache for card/hint responses (keyed incl. Location and Lang)
+        self.cache = cache
+        # Opt-in per-endpoint circuit breakers and concurrency limits
+        self.resilience = resilience
 
-        self.session = session or build_session(
-            retries=self.config.retries,
-            backoff_factor=self.config.backoff_factor,
-            status_forcelist=self.config.status_forcelist,
-        )
-        if proxies:
-            self.session.proxies.update(proxies)
-        if cookies:
-            self.session.cookies.update(cookies)
+        if transport is not None and session is not None:
+            raise ValueError("Pass either session or transport, not both")
+        if transport is None:
+            # Retries are applied by the client (see _send), not by urllib3
+            transport = RequestsTransport(session or build_session(
+                retries=0,
+                pool_maxsize=self.config.pool_maxsize,
+            ))
+        self.transport = transport
+        # requests.Session behind the default transport (None for others)
+        self.session: Optional["requests.Session"] = getattr(transport, "session", None)
+        if proxies or cookies:
+            if self.session is None:
+                raise ValueError("Configure proxies/cookies on the transport itself")
+            if proxies:
+                self.session.proxies.update(proxies)
+            if cookies:
+                self.session.cookies.update(cookies)
 
         # Normalize timeout
         self._timeout = self.config.timeout
+        # Transports may narrow encodings to what their HTTP stack decodes
+        self._accept_encoding = accept_encoding(
+            self.config.encodings, getattr(self.transport, "content_encodings", None))
+        # Per-endpoint wire vs decoded response bytes
+        self.traffic = TrafficStats()
+        # Per-endpoint/status latency histograms (also the hedge delay source)
+        # and slow-request samples
+        self.latency = LatencyRecorder(sample_quantile=self.config.sample_quantile,
+                                       sample_size=self.config.sample_size)
+        self.hedge_stats: Dict[str, int] = {"hedged": 0, "hedge_wins": 0}
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
 
     # ---- Context manager ----
     def __enter__(self) -> "TabletkiUA":  # pragma: no cover
@@ -75,78 +150,341 @@ class TabletkiUA:
         self.close()
 
     def close(self) -> None:
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
         try:
-            self.session.close()
+            self.transport.close()
         except Exception:
             pass
 
-    # ---- Internal request helper ----
-    def _request(
+    def record(self, path: str | os.PathLike[str]) -> "_Recording":
+        """Capture all traffic to ``path`` (``.gz``/``.xz`` compressed) until the
+        returned context exits; replay it with :class:`ReplayTransport`.
+        """
+        from .recording import RecordingTransport, _Recording
+
+        recorder = RecordingTransport(self.transport, path)
+        recording = _Recording(self, recorder)
+        self.transport = recorder
+        return recording
+
+    # ---- Internal request helpers ----
+    def _send(
         self,
         method: str,
-        path: str,
+        url: str,
         *,
-        params: Optional[Dict[str, Any]] = None,
-        json: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None,
-    ) -> Dict[str, Any]:
-        url = f"{self.config.base_url.rstrip('/')}/{path.lstrip('/')}"
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool,
+        endpoint: str = "",
+        deadline: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> TransportResponse:
+        """One logical request with retries on network errors and
+        ``status_forcelist`` statuses (urllib3-style backoff, ``Retry-After``
+        honored). After the last attempt the final response is returned as-is.
+
+        With :attr:`resilience`, every attempt passes the endpoint's circuit
+        breaker first, so retries stop as soon as it opens. ``deadline`` is a
+        ``time.monotonic()`` instant: attempt timeouts shrink to the time left
+        and no retry starts that could not finish before it. A set ``cancel``
+        event (the losing side of a hedge) stops further retries.
+        """
+        cfg = self.config
+        breaker = self.resilience.breaker(endpoint) if self.resilience is not None else None
+        attempt = 0
+        while True:
+            timeout = self._timeout
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise DeadlineExceededError(f"Deadline exceeded for {method} {url}")
+                timeout = _cap_timeout(timeout, left)
+            if breaker is not None:
+                breaker.allow()
+            started = time.monotonic()
+            try:
+                resp = self.transport.request(
+                    method, url, params=params, json=json, headers=headers,
+                    timeout=timeout, stream=stream)
+            except NetworkError as e:
+                if breaker is not None:
+                    breaker.record(True)
+                self._record_latency(endpoint, method, url, headers, params, json,
+                                     time.monotonic() - started, error=e)
+                delay = backoff_delay(attempt + 1, cfg.backoff_factor)
+                # A timeout capped to the time left, or a retry that would not
+                # fit, means the budget ended the call
+                if deadline is not None and time.monotonic() + (
+                        0.0 if attempt >= cfg.retries else delay) >= deadline:
+                    raise DeadlineExceededError(
+                        f"Deadline exceeded for {method} {url}: {e}") from e
+                if attempt >= cfg.retries or (cancel is not None and cancel.is_set()):
+                    raise
+            except BaseException:
+                # No outcome to record, but a half-open trial slot to give back
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                elapsed = time.monotonic() - started
+                if breaker is not None:
+                    breaker.record(resp.status_code >= 500)
+                self._record_latency(endpoint, method, url, headers, params, json,
+                                     elapsed, resp=resp, stream=stream)
+                if resp.status_code not in cfg.status_forcelist or attempt >= cfg.retries:
+                    return resp
+                delay = retry_after(resp.headers, resp.status_code)
+                if delay is None:
+                    delay = backoff_delay(attempt + 1, cfg.backoff_factor)
+                stop = (cancel is not None and cancel.is_set()) or (
+                    deadline is not None and time.monotonic() + delay >= deadline)
+                if stop:  # the last response is the answer
+                    return resp
+                resp.close()
+            attempt += 1
+            _LOG.debug("Retry %d/%d for %s %s in %.2fs", attempt, cfg.retries, method, url, delay)
+            if delay:
+                time.sleep(delay)
+
+    def _record_latency(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        seconds: float,
+        *,
+        resp: Optional[TransportResponse] = None,
+        error: Optional[BaseException] = None,
+        stream: bool = False,
+    ) -> None:
+        def detail(reason: str) -> RequestSample:
+            sample = RequestSample(
+                endpoint=endpoint, method=method, url=url, seconds=seconds,
+                status=None if resp is None else resp.status_code, reason=reason,
+                at=time.time(), request_headers=_redact_headers(headers) or {},
+                params=params, json=json,
+                error=None if error is None else f"{type(error).__name__}: {error}")
+            if resp is not None:
+                sample.response_headers = dict(resp.headers)
+                # A streamed body is read once, by the decoder
+                sample.body = None if stream else resp.text
+            return sample
+
+        self.latency.record(endpoint, None if resp is None else resp.status_code, seconds,
+                            detail)
+
+    def _url(self, path: str) -> str:
+        return f"{self.config.base_url.rstrip('/')}/{path.lstrip('/')}"
+
+    def _headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         base_headers = self.identity.headers(self._app_api_token)
 
         # Only attach Location if non-empty and not overridden
         if self.identity.location_header and (not headers or "Location" not in headers):
             base_headers["Location"] = self.identity.location_header
 
+        base_headers["Accept-Encoding"] = self._accept_encoding
         if headers:
             base_headers.update(headers)
+        return base_headers
+
+    @staticmethod
+    def _cache_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        skip: Collection[str] = (),
+    ) -> str:
+        key = cache_key(method, url, params=params, json_body=json, headers=headers)
+        if skip:
+            key += "|skip=" + ",".join(sorted(skip))
+        return key
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache: bool = False,
+        stream: bool = False,
+        skip: Collection[str] = (),
+        deadline: Optional[float] = None,
+        hedge: bool = False,
+    ) -> Dict[str, Any]:
+        """Send a request and decode its JSON object body.
 
-        # Logging (with redaction)
-        log_request(method, url, headers=base_headers,
-                    params=params, json=json)
+        With ``stream=True`` (implied by ``skip``) the body is decoded
+        incrementally while it downloads and top-level keys in ``skip`` are
+        never materialized. ``deadline`` is a total budget in seconds
+        (default ``config.deadline``); ``hedge`` enables a hedged duplicate
+        for GETs (see :meth:`_hedged`).
+        """
+        stream = stream or bool(skip)
+        url = self._url(path)
+        base_headers = self._headers(headers)
+        endpoint = path.strip("/")
+        budget = self.config.deadline if deadline is None else deadline
 
+        def fetch(deadline_at: Optional[float] = None) -> Dict[str, Any]:
+            # Without an instant the budget starts here, so background
+            # revalidations get their own
+            if deadline_at is None and budget is not None:
+                deadline_at = time.monotonic() + budget
+
+            def attempt(cancel: Optional[threading.Event]) -> Dict[str, Any]:
+                resp = self._send(method.upper(), url, params=params, json=json,
+                                  headers=base_headers, stream=stream, endpoint=endpoint,
+                                  deadline=deadline_at, cancel=cancel)
+                return self._read(resp, endpoint, stream=stream, skip=skip)
+
+            # Logging (with redaction)
+            log_request(method, url, headers=base_headers,
+                        params=params, json=json)
+            bulkhead = self.resilience.bulkhead(endpoint) if self.resilience is not None else None
+            with bulkhead or contextlib.nullcontext():
+                if hedge and method.upper() == "GET":
+                    return self._hedged(endpoint, attempt)
+                return attempt(None)
+
+        store = self.cache if cache else None
+        if store is None:
+            return fetch()
+        key = self._cache_key(method, url, params, json, base_headers, skip)
+        cached, state = store.lookup(key)
+        if state == FRESH:
+            return cached
+        if state == STALE:
+            store.revalidate(key, fetch)
+            return cached
+        # Waiting for another host's refresh spends the same budget as fetching
+        deadline_at = None if budget is None else time.monotonic() + budget
         try:
-            resp = self.session.request(
-                method=method.upper(),
-                url=url,
-                params=params,
-                json=json,
-                headers=base_headers,
-                timeout=self._timeout,
-                verify=True,
-            )
-        except requests.RequestException as e:  # networking/timeouts
-            raise NetworkError(str(e)) from e
-
-        log_response(resp)
-
-        # Raise for non-2xx with detail
-        if not (200 <= resp.status_code < 300):
-            try:
-                detail = resp.json()
-            except Exception:
-                detail = resp.text[:500]
-            raise ApiError(
-                f"HTTP {resp.status_code}",
-                status_code=resp.status_code,
-                url=resp.url,
-                payload=detail,
-            )
-
-        # Expect JSON body
+            return store.fill(key, lambda: fetch(deadline_at), deadline=deadline_at)
+        except (NetworkError, ApiError) as e:
+            if state == STALE_IF_ERROR and (
+                    not isinstance(e, ApiError) or (e.status_code or 0) >= 500):
+                _LOG.debug("Serving stale %s after %s", endpoint, e)
+                store.served_stale()
+                return cached
+            raise
+
+    def hedge_delay(self, endpoint: str) -> float:
+        """Seconds before a hedged duplicate of ``endpoint`` is sent."""
+        cfg = self.config
+        delay = self.latency.quantile(endpoint, cfg.hedge_quantile,
+                                      min_samples=cfg.hedge_min_samples)
+        return delay or cfg.hedge_delay
+
+    def _hedged(
+        self,
+        endpoint: str,
+        attempt: Callable[[Optional[threading.Event]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Run ``attempt``; if it is still pending after :meth:`hedge_delay`,
+        start a duplicate and return whichever succeeds first. The loser's
+        result is discarded and it makes no further retries."""
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=self.config.pool_maxsize, thread_name_prefix="tabletkiua-hedge")
+        pool = self._hedge_pool
+        cancel = threading.Event()
+        primary = pool.submit(attempt, cancel)
         try:
-            return resp.json()
-        except ValueError as e:
-            # Non-JSON or invalid JSON
-            raise SerializationError(f"Invalid JSON from {resp.url}") from e
+            return primary.result(timeout=self.hedge_delay(endpoint))
+        except FutureTimeout:
+            pass
+        with self._hedge_lock:
+            self.hedge_stats["hedged"] += 1
+        secondary = pool.submit(attempt, cancel)
+        pending: List[Future[Dict[str, Any]]] = [primary, secondary]
+        try:
+            while True:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    pending.remove(fut)
+                    if fut.exception() is None or not pending:
+                        if fut is secondary and fut.exception() is None:
+                            with self._hedge_lock:
+                                self.hedge_stats["hedge_wins"] += 1
+                        return fut.result()
+        finally:
+            cancel.set()
+
+    def _read(
+        self,
+        resp: TransportResponse,
+        endpoint: str,
+        *,
+        stream: bool,
+        skip: Collection[str],
+    ) -> Dict[str, Any]:
+        """Check status, decode the JSON object body and account its size."""
+        with resp:
+            try:
+                log_response(resp, body=not stream or not (200 <= resp.status_code < 300))
+
+                # Raise for non-2xx with detail
+                if not (200 <= resp.status_code < 300):
+                    try:
+                        detail = resp.json()
+                    except Exception:
+                        detail = resp.text[:500]
+                    raise ApiError(
+                        f"HTTP {resp.status_code}",
+                        status_code=resp.status_code,
+                        url=resp.url,
+                        payload=detail,
+                    )
+
+                # Expect JSON body
+                if stream:
+                    try:
+                        data = decode_object(resp.iter_content(64 * 1024), skip=skip)
+                    except SerializationError as e:
+                        raise SerializationError(f"Invalid JSON from {resp.url}: {e}") from e
+                else:
+                    try:
+                        data = resp.json()
+                    except ValueError as e:
+                        # Non-JSON or invalid JSON
+                        raise SerializationError(f"Invalid JSON from {resp.url}") from e
+            finally:
+                self.traffic.record(
+                    endpoint,
+                    wire_bytes=resp.wire_bytes,
+                    decoded_bytes=resp.decoded_bytes,
+                    encoding=resp.headers.get("Content-Encoding"),
+                )
+        return data
 
     # ---- Public API methods ----
 
-    def location_by_ip(self, *, store: bool = True) -> Location:
+    def location_by_ip(
+        self,
+        *,
+        store: bool = True,
+        deadline: Optional[float] = None,
+        hedge: Optional[bool] = None,
+    ) -> Location:
         """GET /Locations/locationByIp — determine location by caller IP.
 
         If ``store=True`` (default), saves ``identity.location_header = loc.id``.
+        ``deadline``/``hedge`` default to ``config.deadline``/``config.hedge``.
         """
-        data = self._request("GET", "Locations/locationByIp")
+        data = self._request("GET", "Locations/locationByIp", deadline=deadline,
+                             hedge=self.config.hedge if hedge is None else hedge)
         loc = Location.from_dict(data)
         if store:
             self.identity.location_header = loc.id
@@ -159,6 +497,7 @@ class TabletkiUA:
         transliterate: int | bool = 0,
         type: str = "DEFAULT",
         location: Optional[str] = None,
+        deadline: Optional[float] = None,
     ) -> SearchHintsResponse:
         """POST /Search/searchHintsV2.
 
@@ -172,7 +511,7 @@ class TabletkiUA:
         }
         extra_headers = {"Location": location} if location else None
         data = self._request("POST", "Search/searchHintsV2",
-                             json=payload, headers=extra_headers)
+                             json=payload, headers=extra_headers, cache=True, deadline=deadline)
         return SearchHintsResponse.from_dict(data)
 
     def product_card(
@@ -181,12 +520,146 @@ class TabletkiUA:
         name: str,
         goods_int_code: str | int,
         with_content_plus: bool = True,
+        location: Optional[str] = None,
+        stream: bool = False,
+        skip: Collection[str] = (),
+        deadline: Optional[float] = None,
+        hedge: Optional[bool] = None,
     ) -> ProductCard:
-        """GET /ProductCard/card?name=...&id=...&withContentPlus=true"""
+        """GET /ProductCard/card?name=...&id=...&withContentPlus=true
+
+        If ``location`` provided, it's sent as the ``Location`` header for this
+        call only (``identity`` is left untouched).
+
+        ``stream=True`` decodes the body while it downloads; ``skip`` names
+        top-level fields (e.g. ``{"instructionByParts", "faqs"}``) that are
+        dropped unparsed and come back empty on the card.
+
+        ``deadline`` caps the total time in seconds across retries; ``hedge``
+        sends a duplicate request once this one is slower than the endpoint's
+        p95. Both default to ``config.deadline``/``config.hedge``.
+        """
+        return ProductCard.from_dict(self._card_payload(
+            name, goods_int_code, with_content_plus, location, stream=stream, skip=skip,
+            deadline=deadline, hedge=hedge))
+
+    def _card_payload(
+        self,
+        name: str,
+        goods_int_code: str | int,
+        with_content_plus: bool,
+        location: Optional[str],
+        *,
+        stream: bool = False,
+        skip: Collection[str] = (),
+        deadline: Optional[float] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        params, extra_headers = self._card_request(name, goods_int_code, with_content_plus,
+                                                   location)
+        return self._request("GET", "ProductCard/card", params=params,
+                             headers=extra_headers, cache=True, stream=stream, skip=skip,
+                             deadline=deadline,
+                             hedge=self.config.hedge if hedge is None else hedge)
+
+    @staticmethod
+    def _card_request(
+        name: str,
+        goods_int_code: str | int,
+        with_content_plus: bool,
+        location: Optional[str],
+    ) -> Tuple[Dict[str, str], Optional[Dict[str, str]]]:
         params = {
             "name": name,
             "id": str(goods_int_code),
             "withContentPlus": "true" if with_content_plus else "false",
         }
-        data = self._request("GET", "ProductCard/card", params=params)
-        return ProductCard.from_dict(data)
+        return params, {"Location": location} if location else None
+
+    def _card_key(
+        self,
+        name: str,
+        goods_int_code: str | int,
+        with_content_plus: bool,
+        location: Optional[str],
+        skip: Collection[str] = (),
+    ) -> str:
+        """Cache key :meth:`_card_payload` stores the same card under."""
+        params, extra_headers = self._card_request(name, goods_int_code, with_content_plus,
+                                                   location)
+        return self._cache_key("GET", self._url("ProductCard/card"), params, None,
+                               self._headers(extra_headers), skip)
+
+    def price_matrix(
+        self,
+        goods_codes: Sequence[str | int],
+        location_ids: Sequence[str],
+        *,
+        names: Optional[Mapping[str, str]] = None,
+        with_content_plus: bool = False,
+        max_workers: int = 8,
+    ) -> PriceMatrix:
+        """Fetch ``priceMin``/``priceMax``/``canBeDelivered`` for goods x locations.
+
+        Cells are fetched concurrently over the shared session, each with its
+        own ``Location`` header. ``names`` maps goods code -> card ``name``
+        parameter (empty if missing). Failed cells stay unknown and their
+        exception is kept in ``PriceMatrix.errors``.
+
+        Only the three fields are needed, so cards are requested without
+        content-plus by default and their bulky sections are streamed past
+        undecoded.
+        """
+        matrix = PriceMatrix.empty(goods_codes, location_ids)
+        names = names or {}
+        width = len(matrix.location_ids)
+        window = max_workers * 4
+
+        def fetch(i: int, j: int) -> Tuple[Any, Any, Any]:
+            code = matrix.goods_codes[i]
+            d = self._card_payload(names.get(code, ""), code, with_content_plus,
+                                   matrix.location_ids[j], skip=_MATRIX_SKIP)
+            return d.get("priceMin"), d.get("priceMax"), d.get("canBeDelivered")
+
+        def cell_key(offset: int) -> str:
+            code = matrix.goods_codes[offset // width]
+            return self._card_key(names.get(code, ""), code, with_content_plus,
+                                  matrix.location_ids[offset % width], _MATRIX_SKIP)
+
+        def batches() -> Iterator[Tuple[int, int]]:
+            total = len(matrix.goods_codes) * width
+            cache = self.cache
+            if cache is None or cache.backend is None:
+                yield from ((o // width, o % width) for o in range(total))
+                return
+            # Warm just ahead of the work in pipelined batches. Reads move
+            # entries to the LRU end, so the previous batch's unread cells
+            # survive warming the next one only if both batches, plus the
+            # older cells still in flight, fit the local tier
+            batch = max(1, min(500, (cache.max_entries - window) // 2))
+            for start in range(0, total, batch):
+                stop = min(total, start + batch)
+                cache.warm((cell_key(o) for o in range(start, stop)), batch_size=batch)
+                yield from ((o // width, o % width) for o in range(start, stop))
+
+        cells = batches()
+
+        # Bounded window of in-flight futures keeps memory flat for huge grids
+        pending: Dict[Future[Tuple[Any, Any, Any]], int] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                for i, j in cells:
+                    pending[pool.submit(fetch, i, j)] = i * width + j
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+                done: Set[Future[Tuple[Any, Any, Any]]]
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    offset = pending.pop(fut)
+                    try:
+                        matrix.set(offset, *fut.result())
+                    except Exception as e:  # e.g. a malformed payload; other cells go on
+                        matrix.errors[offset] = e
+        return matrix
@@ -0,0 +1,239 @@
+from __future__ import annotations
+import json
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .models import SearchHintsResponse
+
+Payload = Union[bytes, str, Dict[str, Any], SearchHintsResponse]
+
+# Dictionary-encoded string columns; code 0 is always None
+STRING_COLUMNS = ("group", "name", "code", "url", "screenViewType")
+_DELIVER = {True: 1, False: 0, None: 2}
+_DELIVER_VALUES = (False, True, None)
+
+
+class _Dictionary:
+    __slots__ = ("values", "index")
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = [None]
+        self.index: Dict[Optional[str], int] = {None: 0}
+
+    def copy(self) -> "_Dictionary":
+        out = _Dictionary()
+        out.values = list(self.values)
+        out.index = dict(self.index)
+        return out
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+Condition = Union[Any, Sequence[Any], Callable[[Any], bool]]
+
+
+class HintsTable:
+    """Columnar batch of ``search_hints_v2`` items, one row per search item.
+
+    Rows never become :class:`~tabletkiua.models.SearchItem` objects: items
+    are appended straight from the JSON into ``array`` columns. String
+    columns (:data:`STRING_COLUMNS`) store ``uint32`` codes into per-column
+    dictionaries, ``canBeDelivered`` is a byte column (0 / 1, 2 = unknown)
+    and ``response`` is the index of the source payload. Filters and
+    group-bys compare integer codes, so they run over the dictionary once
+    and over the rows at C speed.
+
+    Usage::
+
+        table = HintsTable.from_payloads(raw_responses)
+        rows = table.where(screenViewType="GOODS", canBeDelivered=True,
+                           name=lambda n: "вітамін" in n.casefold())
+        table.value_counts("group", rows)          # {'Товари': 812, ...}
+        table.take(rows).column("code")
+
+    ``to_numpy()`` and ``to_arrow()`` hand the same buffers to NumPy or
+    pyarrow when those are installed.
+    """
+
+    def __init__(self) -> None:
+        self.response = array("I")
+        self.deliver = bytearray()
+        self.codes: Dict[str, array] = {c: array("I") for c in STRING_COLUMNS}
+        self.dictionaries: Dict[str, _Dictionary] = {c: _Dictionary() for c in STRING_COLUMNS}
+        self._responses = 0
+
+    def __len__(self) -> int:
+        return len(self.response)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ("response", *STRING_COLUMNS, "canBeDelivered")
+
+    # ---- Building ----
+    @classmethod
+    def from_payloads(cls, payloads: Iterable[Payload]) -> "HintsTable":
+        table = cls()
+        for payload in payloads:
+            table.extend(payload)
+        return table
+
+    def extend(self, payload: Payload) -> int:
+        """Append the items of one response (raw JSON, dict or model) and
+        return its ``response`` index."""
+        if isinstance(payload, (bytes, bytearray, memoryview, str)):
+            payload = json.loads(bytes(payload) if isinstance(payload, memoryview) else payload)
+        resp = self._responses
+        self._responses += 1
+        if isinstance(payload, SearchHintsResponse):
+            groups: Iterable[Tuple[Any, Iterable[Any]]] = (
+                (g.name, [(it.name, it.code, it.url, it.screenViewType, it.canBeDelivered)
+                          for it in g.searchItems]) for g in payload.group)
+        else:
+            groups = (
+                (g.get("name"), [(it.get("name"), it.get("code"), it.get("url"),
+                                  it.get("screenViewType"), it.get("canBeDelivered"))
+                                 for it in g.get("searchItems") or ()])
+                for g in payload.get("group") or ())
+
+        d_name, d_code, d_url, d_type = (self.dictionaries[c] for c in STRING_COLUMNS[1:])
+        c_group, c_name, c_code, c_url, c_type = (self.codes[c] for c in STRING_COLUMNS)
+        for group, items in groups:
+            if not items:
+                continue
+            c_group.extend([self.dictionaries["group"].encode(group)] * len(items))
+            for name, code, url, typ, deliver in items:
+                c_name.append(d_name.encode(name))
+                c_code.append(d_code.encode(None if code is None else str(code)))
+                c_url.append(d_url.encode(url))
+                c_type.append(d_type.encode(typ))
+                self.deliver.append(_DELIVER.get(deliver, 2))
+            self.response.extend([resp] * len(items))
+        return resp
+
+    # ---- Access ----
+    def column(self, name: str, rows: Optional[Sequence[int]] = None) -> List[Any]:
+        """Decoded values of one column (all rows or ``rows``)."""
+        data, values = self._raw(name)
+        if rows is not None:
+            data = list(map(data.__getitem__, rows))
+        return list(map(values.__getitem__, data))
+
+    def row(self, i: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"response": self.response[i]}
+        for c in STRING_COLUMNS:
+            out[c] = self.dictionaries[c].values[self.codes[c][i]]
+        out["canBeDelivered"] = _DELIVER_VALUES[self.deliver[i]]
+        return out
+
+    def _raw(self, name: str) -> Tuple[Sequence[int], Sequence[Any]]:
+        if name == "canBeDelivered":
+            return self.deliver, _DELIVER_VALUES
+        if name == "response":
+            return self.response, range(self._responses)
+        if name not in self.codes:
+            raise KeyError(f"Unknown column: {name!r}")
+        return self.codes[name], self.dictionaries[name].values
+
+    # ---- Filtering / grouping ----
+    def where(self, rows: Optional[Sequence[int]] = None, **conditions: Condition) -> array:
+        """Row indices matching every condition (AND).
+
+        A condition is a value, a list/tuple/set of values (IN) or a
+        predicate over non-``None`` values; predicates and value matches are
+        evaluated once per distinct value, not per row.
+        """
+        out: Sequence[int] = range(len(self)) if rows is None else rows
+        scan = rows is None  # first condition over all rows runs in C
+        for name, cond in conditions.items():
+            data, values = self._raw(name)
+            if callable(cond):
+                wanted = {i for i, v in enumerate(values) if v is not None and cond(v)}
+            else:
+                targets = cond if isinstance(cond, (list, tuple, set, frozenset)) else (cond,)
+                if name == "canBeDelivered":
+                    wanted = {_DELIVER[t] for t in targets}
+                elif name == "response":
+                    wanted = set(targets)
+                else:
+                    index = self.dictionaries[name].index
+                    wanted = {index[t] for t in targets if t in index}
+            if not wanted:
+                return array("I")
+            if len(wanted) == 1:
+                test = next(iter(wanted)).__eq__
+            else:
+                test = wanted.__contains__
+            if scan:
+                out, scan = list(compress(out, map(test, data))), False
+            else:
+                out = [r for r in out if test(data[r])]
+        return array("I", out)
+
+    def value_counts(self, name: str, rows: Optional[Sequence[int]] = None) -> Dict[Any, int]:
+        """``{value: rows}``, most frequent first."""
+        data, values = self._raw(name)
+        counts = Counter(data if rows is None else map(data.__getitem__, rows))
+        return {values[k]: n for k, n in counts.most_common()}
+
+    def group_by(self, name: str, rows: Optional[Sequence[int]] = None) -> Dict[Any, array]:
+        """``{value: row indices}`` in first-seen order."""
+        data, values = self._raw(name)
+        groups: Dict[int, array] = {}
+        for r in (range(len(self)) if rows is None else rows):
+            g = groups.get(data[r])
+            if g is None:
+                g = groups[data[r]] = array("I")
+            g.append(r)
+        return {values[k]: g for k, g in groups.items()}
+
+    def take(self, rows: Sequence[int]) -> "HintsTable":
+        """New table with ``rows``; codes stay valid because the dictionaries
+        are copied, so extending either table leaves the other unchanged."""
+        out = HintsTable()
+        out.dictionaries = {c: d.copy() for c, d in self.dictionaries.items()}
+        out._responses = self._responses
+        out.response = array("I", map(self.response.__getitem__, rows))
+        out.deliver = bytearray(map(self.deliver.__getitem__, rows))
+        out.codes = {c: array("I", map(col.__getitem__, rows)) for c, col in self.codes.items()}
+        return out
+
+    # ---- Export ----
+    def to_numpy(self) -> Tuple[Any, Dict[str, List[Optional[str]]]]:
+        """Structured array of codes plus the string dictionaries."""
+        try:
+            import numpy as np
+        except ImportError as e:  # pragma: no cover
+            raise ImportError("HintsTable.to_numpy requires numpy: pip install numpy") from e
+        fields = [("response", np.uint32), *((c, np.uint32) for c in STRING_COLUMNS),
+                  ("canBeDelivered", np.uint8)]
+        out = np.empty(len(self), dtype=fields)
+        out["response"] = np.frombuffer(self.response, dtype=np.uint32)
+        for c in STRING_COLUMNS:
+            out[c] = np.frombuffer(self.codes[c], dtype=np.uint32)
+        out["canBeDelivered"] = np.frombuffer(self.deliver, dtype=np.uint8)
+        return out, {c: list(self.dictionaries[c].values) for c in STRING_COLUMNS}
+
+    def to_arrow(self) -> Any:
+        """``pyarrow.Table`` with dictionary-typed string columns (zero-copy codes)."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:  # pragma: no cover
+            raise ImportError("HintsTable.to_arrow requires pyarrow: pip install pyarrow") from e
+        n = len(self)
+
+        def u32(buf: array) -> Any:
+            return pa.Array.from_buffers(pa.uint32(), n, [None, pa.py_buffer(buf)])
+
+        cols: Dict[str, Any] = {"response": u32(self.response)}
+        for c in STRING_COLUMNS:
+            cols[c] = pa.DictionaryArray.from_arrays(
+                u32(self.codes[c]), pa.array(self.dictionaries[c].values, pa.string()))
+        cols["canBeDelivered"] = pa.array(self.column("canBeDelivered"), pa.bool_())
+        return pa.table(cols)
@@ -76,7 +76,7 @@ class DeviceProfile:
             # We'll inject it in client only when non-empty.
             "User-Agent": self.user_agent,
             "UserID": self.user_id,
-            # requests handles compression automatically; including it is harmless
+            # The client replaces this with the negotiated ClientConfig.encodings
             "Accept-Encoding": "gzip, deflate",
             "Accept": "application/json",
         }
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Literal, Mapping, Optional, Tuple, Union
+
+from .models import ProductCard
+
+ChangeKind = Literal[
+    "new",
+    "price",
+    "availability",
+    "waitlist",
+    "images_added",
+    "images_removed",
+    "instruction_edited",
+    "description_edited",
+    "faqs",
+    "characteristics",
+]
+
+# Sections hashed independently; everything else only feeds the whole-card digest
+_SECTIONS = ("price", "availability", "waitlist", "images", "instruction",
+             "description", "faqs", "characteristics")
+
+
+def _digest(value: Any) -> str:
+    blob = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _parts(parts: Optional[List[Dict[str, Any]]]) -> Tuple[Tuple[str, str, str], ...]:
+    """``(id, title, hash)`` per HTML section."""
+    return tuple((str(p.get("id", "")), p.get("title", ""), _digest(p)) for p in parts or ())
+
+
+def _image_key(img: Mapping[str, Any]) -> str:
+    return str(img.get("id") or img.get("Id") or img.get("url") or img.get("bigUrl") or "")
+
+
+@dataclass(slots=True, frozen=True)
+class CardSnapshot:
+    """Fingerprint of one card fetch: whole-payload digest plus per-section hashes.
+
+    Only the small values needed to describe a change are kept, never the payload.
+    """
+
+    goodsIntCode: str
+    digest: str
+    sections: Dict[str, str]
+    priceMin: Optional[float]
+    priceMax: Optional[float]
+    canBeDelivered: Optional[bool]
+    waitlist: Optional[Dict[str, Any]]
+    images: Tuple[str, ...]
+    instruction: Tuple[Tuple[str, str, str], ...]
+    description: Tuple[Tuple[str, str, str], ...]
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "CardSnapshot":
+        waitlist = (d.get("hintData") or {}).get("waitlistInfo")
+        images = d.get("images") or []
+        instruction = _parts(d.get("instructionByParts"))
+        description = _parts(d.get("descriptionByParts"))
+        sections = {
+            "price": _digest([d.get("priceMin"), d.get("priceMax")]),
+            "availability": _digest(d.get("canBeDelivered")),
+            "waitlist": _digest(waitlist),
+            "images": _digest(images),
+            "instruction": _digest([h for _, _, h in instruction]),
+            "description": _digest([h for _, _, h in description]),
+            "faqs": _digest(d.get("faqs")),
+            "characteristics": _digest(d.get("characteristics")),
+        }
+        return CardSnapshot(
+            goodsIntCode=str(d.get("goodsIntCode", "")),
+            digest=_digest(d),
+            sections=sections,
+            priceMin=d.get("priceMin"),
+            priceMax=d.get("priceMax"),
+            canBeDelivered=d.get("canBeDelivered"),
+            waitlist=waitlist,
+            images=tuple(_image_key(img) for img in images),
+            instruction=instruction,
+            description=description,
+        )
+
+    @staticmethod
+    def from_card(card: ProductCard) -> "CardSnapshot":
+        return CardSnapshot.from_dict(card.raw)
+
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent:
+    goodsIntCode: str
+    kind: ChangeKind
+    old: Any
+    new: Any
+
+
+def _edited_parts(old: Tuple[Tuple[str, str, str], ...], new: Tuple[Tuple[str, str, str], ...]
+                  ) -> List[str]:
+    before = {pid: h for pid, _, h in old}
+    return [title or pid for pid, title, h in new if before.get(pid) != h]
+
+
+def diff_snapshots(old: CardSnapshot, new: CardSnapshot) -> List[ChangeEvent]:
+    """Typed change events between two snapshots of the same card.
+
+    Equal digests short-circuit in O(1); otherwise only sections whose hash
+    changed are inspected.
+    """
+    if old.digest == new.digest:
+        return []
+    code = new.goodsIntCode
+    events: List[ChangeEvent] = []
+    for section in _SECTIONS:
+        if old.sections.get(section) == new.sections.get(section):
+            continue
+        if section == "price":
+            events.append(ChangeEvent(code, "price", (old.priceMin, old.priceMax),
+                                      (new.priceMin, new.priceMax)))
+        elif section == "availability":
+            events.append(ChangeEvent(code, "availability", old.canBeDelivered,
+                                      new.canBeDelivered))
+        elif section == "waitlist":
+            events.append(ChangeEvent(code, "waitlist", old.waitlist, new.waitlist))
+        elif section == "images":
+            old_keys, new_keys = set(old.images), set(new.images)
+            added = [k for k in new.images if k not in old_keys]
+            removed = [k for k in old.images if k not in new_keys]
+            if added:
+                events.append(ChangeEvent(code, "images_added", None, added))
+            if removed:
+                events.append(ChangeEvent(code, "images_removed", removed, None))
+        elif section == "instruction":
+            events.append(ChangeEvent(code, "instruction_edited", None,
+                                      _edited_parts(old.instruction, new.instruction)))
+        elif section == "description":
+            events.append(ChangeEvent(code, "description_edited", None,
+                                      _edited_parts(old.description, new.description)))
+        elif section == "faqs":
+            events.append(ChangeEvent(code, "faqs", None, None))
+        else:
+            events.append(ChangeEvent(code, "characteristics", None, None))
+    return events
+
+
+class CardDiffer:
+    """Keeps the latest snapshot per ``goodsIntCode`` and reports changes.
+
+    Usage::
+
+        differ = CardDiffer()
+        for card in refreshed_cards:
+            for event in differ.update(card):
+                alert(event)
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: Dict[str, CardSnapshot] = {}
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get(self, goods_int_code: str | int) -> Optional[CardSnapshot]:
+        return self._snapshots.get(str(goods_int_code))
+
+    def update(self, card: Union[ProductCard, CardSnapshot, Dict[str, Any]]) -> List[ChangeEvent]:
+        if isinstance(card, ProductCard):
+            snap = CardSnapshot.from_card(card)
+        elif isinstance(card, CardSnapshot):
+            snap = card
+        else:
+            snap = CardSnapshot.from_dict(card)
+        old = self._snapshots.get(snap.goodsIntCode)
+        self._snapshots[snap.goodsIntCode] = snap
+        if old is None:
+            return [ChangeEvent(snap.goodsIntCode, "new", None, None)]
+        return diff_snapshots(old, snap)
+
+    def refresh(self, cards: Iterable[Union[ProductCard, CardSnapshot, Dict[str, Any]]]
+                ) -> List[ChangeEvent]:
+        events: List[ChangeEvent] = []
+        for card in cards:
+            events.extend(self.update(card))
+        return events
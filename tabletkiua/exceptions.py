@@ -41,3 +41,33 @@ class NetworkError(Exception):
 class SerializationError(Exception):
 
     """Invalid or unexpected response format (e.g., non-JSON)."""
+
+
+class CircuitOpenError(NetworkError):
+
+    """Call rejected without I/O: the endpoint's circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {endpoint}; retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class BulkheadFullError(NetworkError):
+
+    """Call rejected without I/O: the endpoint's concurrency limit is reached."""
+
+    def __init__(self, endpoint: str, limit: int) -> None:
+        super().__init__(f"Bulkhead full for {endpoint} ({limit} in flight)")
+        self.endpoint = endpoint
+        self.limit = limit
+
+
+class DeadlineExceededError(NetworkError):
+
+    """The call's total time budget ran out (across all retries)."""
+
+
+class BackendError(Exception):
+
+    """Cache backend unreachable or returned an error; callers treat it as a miss."""
@@ -0,0 +1,185 @@
+from __future__ import annotations
+import math
+import re
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .models import ProductCard
+
+_NONZERO = re.compile(rb"[^\x00]")
+
+_Key = Tuple[str, str]  # (facet, value)
+
+
+def _ids_to_bitmap(ids: Iterable[int], size: int) -> int:
+    buf = bytearray((size >> 3) + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _bitmap_ids(bitmap: int) -> Iterator[int]:
+    """Set bit positions, skipping zero bytes at C speed."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    for m in _NONZERO.finditer(data):
+        base, byte = m.start() << 3, data[m.start()]
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield base + bit
+
+
+def _atc_code(value: str) -> str:
+    return value.split()[0].upper() if value.strip() else ""
+
+
+class FacetIndex:
+    """Inverted index over ``DFP`` metadata and characteristics of collected cards.
+
+    Facets: ATC code prefixes (``ATC``/``ATCFull``; ``"N02BE"`` matches
+    ``"N02BE01"``), ``CATEGORIES``, ``CLASSGOODS``/``CLASSGOODS2`` and
+    characteristic ``name=value`` pairs. Posting lists are kept as id sets
+    (re-adding a card costs O(its keys)) and materialized on first query as
+    int bitmaps, so intersections are single C-level ``&`` operations.
+    ``priceMin`` and ``canBeDelivered`` are stored as columns for
+    range/flag filtering.
+
+    Usage::
+
+        index = FacetIndex()
+        index.extend(cards)
+        index.query(atc="N02BE", max_price=100, deliverable=True)
+    """
+
+    def __init__(self) -> None:
+        self._codes: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._price = array("d")
+        self._deliver = bytearray()  # 0 / 1, 2 = unknown
+        self._postings: Dict[_Key, Set[int]] = {}
+        self._doc_keys: List[Tuple[_Key, ...]] = []
+        self._bitmaps: Dict[_Key, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    # ---- Building ----
+    @staticmethod
+    def _keys(card: ProductCard) -> Tuple[_Key, ...]:
+        keys: Dict[_Key, None] = {}
+        if card.dfp is not None:
+            for value in list(card.dfp.ATC) + list(card.dfp.ATCFull):
+                code = _atc_code(str(value))
+                for n in range(1, len(code) + 1):
+                    keys.setdefault(("atc", code[:n]))
+            for cat in card.dfp.CATEGORIES:
+                keys.setdefault(("category", cat))
+            for cls in (card.dfp.CLASSGOODS, card.dfp.CLASSGOODS2):
+                if cls:
+                    keys.setdefault(("class", cls))
+        for ch in card.characteristics:
+            for val in ch.values:
+                if val.name:
+                    keys.setdefault(("char", f"{ch.name.casefold()}={val.name.casefold()}"))
+        return tuple(keys)
+
+    def add_card(self, card: ProductCard) -> None:
+        if not card.goodsIntCode:
+            return
+        keys = self._keys(card)
+        price = math.nan if card.priceMin is None else float(card.priceMin)
+        deliver = 2 if card.canBeDelivered is None else int(bool(card.canBeDelivered))
+        doc = self._ids.get(card.goodsIntCode)
+        if doc is None:
+            doc = len(self._codes)
+            self._ids[card.goodsIntCode] = doc
+            self._codes.append(card.goodsIntCode)
+            self._price.append(price)
+            self._deliver.append(deliver)
+            self._doc_keys.append(keys)
+        else:
+            for key in self._doc_keys[doc]:
+                self._postings[key].discard(doc)
+                self._bitmaps.pop(key, None)
+            self._price[doc] = price
+            self._deliver[doc] = deliver
+            self._doc_keys[doc] = keys
+        for key in keys:
+            self._postings.setdefault(key, set()).add(doc)
+            self._bitmaps.pop(key, None)
+
+    def extend(self, cards: Iterable[ProductCard]) -> None:
+        for card in cards:
+            self.add_card(card)
+
+    # ---- Querying ----
+    def _bitmap(self, key: _Key) -> int:
+        bm = self._bitmaps.get(key)
+        if bm is None:
+            bm = _ids_to_bitmap(self._postings.get(key, ()), len(self._codes))
+            self._bitmaps[key] = bm
+        return bm
+
+    def values(self, facet: str) -> Dict[str, int]:
+        """``{value: document count}`` for one facet (``"atc"``, ``"category"``, ...)."""
+        return {v: len(ids) for (f, v), ids in self._postings.items() if f == facet and ids}
+
+    def query(
+        self,
+        *,
+        atc: Optional[str] = None,
+        categories: Sequence[str] = (),
+        classes: Sequence[str] = (),
+        characteristics: Mapping[str, str] | None = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        deliverable: Optional[bool] = None,
+    ) -> List[str]:
+        """Goods codes matching every given facet (AND), then price/delivery filters."""
+        keys: List[_Key] = []
+        if atc:
+            keys.append(("atc", _atc_code(atc)))
+        keys += [("category", c) for c in categories]
+        keys += [("class", c) for c in classes]
+        keys += [("char", f"{k.casefold()}={v.casefold()}")
+                 for k, v in (characteristics or {}).items()]
+
+        if keys:
+            # Smallest posting list first lets empty results short-circuit
+            keys.sort(key=lambda k: len(self._postings.get(k, ())))
+            bm = self._bitmap(keys[0])
+            for key in keys[1:]:
+                if not bm:
+                    break
+                bm &= self._bitmap(key)
+            ids: Iterable[int] = _bitmap_ids(bm)
+        else:
+            ids = range(len(self._codes))
+
+        out: List[str] = []
+        want = None if deliverable is None else int(deliverable)
+        for i in ids:
+            if want is not None and self._deliver[i] != want:
+                continue
+            if min_price is not None or max_price is not None:
+                p = self._price[i]
+                if math.isnan(p) or (min_price is not None and p < min_price) \
+                        or (max_price is not None and p > max_price):
+                    continue
+            out.append(self._codes[i])
+        return out
+
+    def count(
+        self,
+        *,
+        atc: Optional[str] = None,
+        categories: Sequence[str] = (),
+        classes: Sequence[str] = (),
+        characteristics: Mapping[str, str] | None = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        deliverable: Optional[bool] = None,
+    ) -> int:
+        """Number of goods :meth:`query` would return for the same filters."""
+        return len(self.query(atc=atc, categories=categories, classes=classes,
+                              characteristics=characteristics, min_price=min_price,
+                              max_price=max_price, deliverable=deliverable))
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+from .exceptions import ApiError, NetworkError, SerializationError
+from .models import ProductCard
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import TabletkiUA
+
+_LOG = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class FamilyMember:
+    goodsIntCode: str
+    goodsName: Optional[str]
+    tradeName: Optional[str]
+    tradeNameIntCode: Optional[str]
+    topTradeNameIntCode: Optional[str]
+    priceMin: Optional[float]
+    priceMax: Optional[float]
+    canBeDelivered: Optional[bool]
+    canonicalUrl: Optional[str]
+
+    @staticmethod
+    def from_card(card: ProductCard) -> "FamilyMember":
+        return FamilyMember(
+            goodsIntCode=str(card.goodsIntCode),
+            goodsName=card.goodsName,
+            tradeName=card.tradeName,
+            tradeNameIntCode=card.tradeNameIntCode,
+            topTradeNameIntCode=card.topTradeNameIntCode,
+            priceMin=card.priceMin,
+            priceMax=card.priceMax,
+            canBeDelivered=card.canBeDelivered,
+            canonicalUrl=card.canonicalUrl,
+        )
+
+
+class TradeNameGraph:
+    """topTradeName -> tradeName -> SKU graph built from fetched cards.
+
+    :meth:`expand` discovers a family once (search by trade name, then fetch
+    the unknown candidate cards concurrently); afterwards :meth:`variants`
+    answers from the local graph.
+
+    Usage::
+
+        graph = TradeNameGraph.load("families.json")
+        for m in graph.expand(client, card):
+            print(m.goodsName, m.priceMin)
+        graph.save("families.json")
+    """
+
+    def __init__(self) -> None:
+        self._members: Dict[str, FamilyMember] = {}
+        self._families: Dict[str, Set[str]] = {}
+        self._tops: Dict[str, Set[str]] = {}
+        self._expanded: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, goods_int_code: object) -> bool:
+        return str(goods_int_code) in self._members
+
+    # ---- Building ----
+    def add_card(self, card: ProductCard) -> Optional[FamilyMember]:
+        if not card.goodsIntCode:
+            return None
+        member = FamilyMember.from_card(card)
+        with self._lock:
+            old = self._members.get(member.goodsIntCode)
+            if old is not None and old.tradeNameIntCode != member.tradeNameIntCode:
+                self._families.get(old.tradeNameIntCode or "", set()).discard(old.goodsIntCode)
+            self._members[member.goodsIntCode] = member
+            if member.tradeNameIntCode:
+                self._families.setdefault(member.tradeNameIntCode, set()).add(member.goodsIntCode)
+                if member.topTradeNameIntCode:
+                    self._tops.setdefault(member.topTradeNameIntCode, set()).add(
+                        member.tradeNameIntCode)
+        return member
+
+    # ---- Queries ----
+    def member(self, goods_int_code: str | int) -> Optional[FamilyMember]:
+        return self._members.get(str(goods_int_code))
+
+    def variants(self, trade_name_int_code: str) -> List[FamilyMember]:
+        """Known SKUs of a trade name, cheapest first (unpriced last)."""
+        codes = self._families.get(trade_name_int_code, ())
+        members = [self._members[c] for c in codes]
+        members.sort(key=lambda m: (m.priceMin is None, m.priceMin or 0.0, m.goodsIntCode))
+        return members
+
+    def top_family(self, top_trade_name_int_code: str) -> Dict[str, List[FamilyMember]]:
+        """``{tradeNameIntCode: variants}`` under a top-level trade name."""
+        return {t: self.variants(t) for t in sorted(self._tops.get(top_trade_name_int_code, ()))}
+
+    def is_expanded(self, trade_name_int_code: str) -> bool:
+        return trade_name_int_code in self._expanded
+
+    # ---- Expansion ----
+    def expand(
+        self,
+        client: "TabletkiUA",
+        card: Union[ProductCard, str, int],
+        *,
+        max_workers: int = 8,
+        refresh: bool = False,
+    ) -> List[FamilyMember]:
+        """All variants of ``card``'s trade name, discovering it once.
+
+        ``card`` may be a :class:`ProductCard` or a goods code already in the
+        graph. Candidates come from ``search_hints_v2(tradeName)``; only
+        candidate cards not yet in the graph are fetched.
+        """
+        if isinstance(card, ProductCard):
+            seed = self.add_card(card)
+        else:
+            seed = self._members.get(str(card))
+        if seed is None or not seed.tradeNameIntCode:
+            raise KeyError(f"Unknown goods or no trade name: {card!r}")
+        trade = seed.tradeNameIntCode
+        if trade in self._expanded and not refresh:
+            return self.variants(trade)
+
+        hints = client.search_hints_v2(seed.tradeName or seed.goodsName or "")
+        todo: Dict[str, str] = {}
+        for grp in hints.group:
+            for item in grp.searchItems:
+                code = item.code or ""
+                if code.isdigit() and (refresh or code not in self._members):
+                    todo.setdefault(code, item.name or "")
+
+        def fetch(entry: Tuple[str, str]) -> None:
+            code, name = entry
+            try:
+                self.add_card(client.product_card(name=name, goods_int_code=code))
+            except (ApiError, NetworkError, SerializationError) as e:
+                _LOG.debug("Family candidate %s skipped: %s", code, e)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(fetch, todo.items()))
+        self._expanded.add(trade)
+        return self.variants(trade)
+
+    # ---- Persistence ----
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "members": [asdict(m) for m in self._members.values()],
+            "expanded": sorted(self._expanded),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TradeNameGraph":
+        graph = cls()
+        for d in data.get("members", []):
+            m = FamilyMember(**d)
+            graph._members[m.goodsIntCode] = m
+            if m.tradeNameIntCode:
+                graph._families.setdefault(m.tradeNameIntCode, set()).add(m.goodsIntCode)
+                if m.topTradeNameIntCode:
+                    graph._tops.setdefault(m.topTradeNameIntCode, set()).add(m.tradeNameIntCode)
+        graph._expanded.update(data.get("expanded", []))
+        return graph
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "TradeNameGraph":
+        """Load a saved graph; a missing file yields an empty graph."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls.from_dict(json.load(fh))
+        except FileNotFoundError:
+            return cls()
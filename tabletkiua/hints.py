@@ -0,0 +1,205 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from .models import SearchGroup, SearchHintsResponse
+from .search_index import _tokens, normalize
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import TabletkiUA
+
+_Key = Tuple[str, int, str, str]
+
+
+@dataclass(slots=True)
+class _Cached:
+    resp: SearchHintsResponse
+    complete: bool
+    stored_at: float
+
+
+def _name_matches(name: Optional[str], tokens: list[str]) -> bool:
+    if not name:
+        return False
+    words = _tokens(name)
+    return all(any(w.startswith(t) for w in words) for t in tokens)
+
+
+def _filter(resp: SearchHintsResponse, term: str) -> SearchHintsResponse:
+    tokens = _tokens(term)
+    groups = []
+    for grp in resp.group:
+        items = [it for it in grp.searchItems if _name_matches(it.name, tokens)]
+        if items:
+            groups.append(SearchGroup(name=grp.name, searchItems=items))
+    return SearchHintsResponse(
+        tagGroup=resp.tagGroup,
+        group=groups,
+        canBeDelivered=resp.canBeDelivered,
+        code=resp.code,
+        description=resp.description,
+    )
+
+
+class HintsCache:
+    """Prefix-aware ``search_hints_v2`` cache for incremental typing.
+
+    Results are cached per ``(Location, transliterate, type, term)``. When a
+    shorter prefix of the term was answered *completely* (no group hit
+    ``max_group_items``), a longer term is answered locally by filtering that
+    result by item name instead of calling the API. Filtering only narrows
+    by name, so it is disabled for ``transliterate`` queries and for
+    digit-only terms (barcodes and codes match on fields the hints lack).
+
+    Usage::
+
+        hints = HintsCache(client)
+        hints.search("акв")
+        hints.search("аквар")   # filtered locally if "акв" was complete
+    """
+
+    def __init__(
+        self,
+        client: "TabletkiUA",
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 2048,
+        max_group_items: int = 10,
+        min_prefix: int = 2,
+        debounce: float = 0.15,
+    ) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_group_items = max_group_items
+        self.min_prefix = min_prefix
+        self.debounce = debounce
+        self.stats: Dict[str, int] = {"hits": 0, "filtered": 0, "remote": 0}
+        self._entries: "OrderedDict[_Key, _Cached]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, "asyncio.Task[Optional[SearchHintsResponse]]"] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ---- Cache internals ----
+    def _key(self, term: str, transliterate: int, type: str, location: Optional[str]) -> _Key:
+        loc = location or self.client.identity.location_header
+        return (loc, transliterate, type, normalize(term).strip())
+
+    def _get(self, key: _Key) -> Optional[_Cached]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: _Key, resp: SearchHintsResponse, complete: bool) -> None:
+        self._entries[key] = _Cached(resp, complete, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _is_complete(self, resp: SearchHintsResponse) -> bool:
+        return all(len(g.searchItems) < self.max_group_items for g in resp.group)
+
+    def peek(
+        self,
+        term: str,
+        *,
+        transliterate: int | bool = 0,
+        type: str = "DEFAULT",
+        location: Optional[str] = None,
+    ) -> Optional[SearchHintsResponse]:
+        """Answer from cache (exact or filtered prefix) without any network I/O."""
+        translit = 1 if str(transliterate) in {"1", "True", "true"} else 0
+        key = self._key(term, translit, type, location)
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None:
+                self.stats["hits"] += 1
+                return entry.resp
+            norm = key[3]
+            if translit or norm.replace(" ", "").isdigit():
+                return None
+            for k in range(len(norm) - 1, self.min_prefix - 1, -1):
+                shorter = self._get(key[:3] + (norm[:k].rstrip(),))
+                if shorter is not None and shorter.complete:
+                    resp = _filter(shorter.resp, norm)
+                    self._put(key, resp, True)
+                    self.stats["filtered"] += 1
+                    return resp
+        return None
+
+    # ---- Public API ----
+    def search(
+        self,
+        term: str,
+        *,
+        transliterate: int | bool = 0,
+        type: str = "DEFAULT",
+        location: Optional[str] = None,
+    ) -> SearchHintsResponse:
+        """Cached equivalent of :meth:`TabletkiUA.search_hints_v2`."""
+        resp = self.peek(term, transliterate=transliterate, type=type, location=location)
+        if resp is not None:
+            return resp
+
+        resp = self.client.search_hints_v2(
+            term, transliterate=transliterate, type=type, location=location)
+        translit = 1 if str(transliterate) in {"1", "True", "true"} else 0
+        with self._lock:
+            self.stats["remote"] += 1
+            self._put(self._key(term, translit, type, location), resp, self._is_complete(resp))
+        return resp
+
+    async def asearch(
+        self,
+        term: str,
+        *,
+        transliterate: int | bool = 0,
+        type: str = "DEFAULT",
+        location: Optional[str] = None,
+        channel: str = "default",
+    ) -> Optional[SearchHintsResponse]:
+        """Debounced async search for keystroke streams.
+
+        Cached/filtered answers return immediately. Otherwise the request waits
+        ``debounce`` seconds; a newer call on the same ``channel`` cancels it and
+        the superseded call returns ``None``. A request already on the wire
+        cannot be aborted, but its result is still cached for later prefixes.
+        """
+        resp = self.peek(term, transliterate=transliterate, type=type, location=location)
+        if resp is not None:
+            return resp
+
+        prev = self._tasks.get(channel)
+        if prev is not None and not prev.done():
+            prev.cancel()
+
+        async def run() -> Optional[SearchHintsResponse]:
+            await asyncio.sleep(self.debounce)
+            return await asyncio.to_thread(
+                self.search, term, transliterate=transliterate, type=type, location=location)
+
+        task = asyncio.ensure_future(run())
+        self._tasks[channel] = task
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            if self._tasks.get(channel) is task:
+                del self._tasks[channel]
+        if task.cancelled():
+            return None
+        return task.result()
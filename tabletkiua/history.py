@@ -0,0 +1,232 @@
+from __future__ import annotations
+import json
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .models import ProductCard
+
+# Column views: writable arrays, or read-only memoryviews over a mapped file
+_Dates = Union[array, memoryview]
+_Prices = Union[array, memoryview]
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m")
+
+
+def parse_date(key: str) -> Optional[int]:
+    """Date ordinal for a ``priceHistory`` key, or ``None`` if unparseable."""
+    key = key.strip()
+    try:
+        return datetime.fromisoformat(key).date().toordinal()
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(key, fmt).date().toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def _ordinal(d: date | int) -> int:
+    return d if isinstance(d, int) else d.toordinal()
+
+
+class PriceHistoryStore:
+    """Columnar store of ``ProductCard.priceHistory`` keyed by ``goodsIntCode``.
+
+    Each series is a pair of parallel columns: sorted date ordinals
+    (``int32``) and prices (``float64``). :meth:`save` writes all series as
+    two flat binary files plus a JSON offset index; :meth:`load` maps them
+    back with ``mmap`` so series are zero-copy views until appended to.
+    Files use native byte order.
+
+    Usage::
+
+        store = PriceHistoryStore.load("history/")
+        for card in cards:
+            store.add_card(card)
+        store.percent_drop(date(2025, 1, 1), date(2025, 2, 1), threshold=20)
+        store.save("history/")
+    """
+
+    def __init__(self) -> None:
+        self._series: Dict[str, Tuple[_Dates, _Prices]] = {}
+        self._maps: List[mmap.mmap] = []
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, code: object) -> bool:
+        return str(code) in self._series
+
+    def codes(self) -> Iterator[str]:
+        return iter(self._series)
+
+    # ---- Building ----
+    def add(self, goods_int_code: str | int, history: Mapping[str, float]) -> None:
+        """Merge a ``priceHistory`` mapping; newer values win on equal dates."""
+        points: Dict[int, float] = {}
+        for key, value in history.items():
+            ordinal = parse_date(key)
+            if ordinal is not None and value is not None:
+                points[ordinal] = float(value)
+        if not points:
+            return
+
+        code = str(goods_int_code)
+        old = self._series.get(code)
+        if old is not None:
+            dates, prices = old
+            if dates[len(dates) - 1] < min(points):
+                # Fast path: pure append of newer points
+                new_dates, new_prices = array("i", dates), array("d", prices)
+                for ordinal in sorted(points):
+                    new_dates.append(ordinal)
+                    new_prices.append(points[ordinal])
+                self._series[code] = (new_dates, new_prices)
+                return
+            merged = dict(zip(dates, prices))
+            merged.update(points)
+            points = merged
+        ordered = sorted(points)
+        self._series[code] = (array("i", ordered), array("d", (points[o] for o in ordered)))
+
+    def add_card(self, card: ProductCard) -> None:
+        if card.goodsIntCode and card.priceHistory:
+            self.add(card.goodsIntCode, card.priceHistory)
+
+    def extend(self, cards: Iterable[ProductCard]) -> None:
+        for card in cards:
+            self.add_card(card)
+
+    # ---- Per-series access ----
+    def series(self, goods_int_code: str | int) -> List[Tuple[date, float]]:
+        dates, prices = self._series[str(goods_int_code)]
+        return [(date.fromordinal(d), p) for d, p in zip(dates, prices)]
+
+    def columns(self, goods_int_code: str | int) -> Tuple[_Dates, _Prices]:
+        """Raw ``(ordinals, prices)`` columns; views when loaded from disk."""
+        return self._series[str(goods_int_code)]
+
+    # ---- Catalog-wide queries ----
+    def _windows(self, start: date | int, end: date | int
+                 ) -> Iterator[Tuple[str, _Prices, int, int]]:
+        lo, hi = _ordinal(start), _ordinal(end)
+        for code, (dates, prices) in self._series.items():
+            i, j = bisect_left(dates, lo), bisect_right(dates, hi)
+            if i < j:
+                yield code, prices, i, j
+
+    def window_min(self, start: date | int, end: date | int) -> Dict[str, float]:
+        """Lowest price per goods within ``[start, end]``."""
+        return {code: min(p[i:j]) for code, p, i, j in self._windows(start, end)}
+
+    def window_max(self, start: date | int, end: date | int) -> Dict[str, float]:
+        """Highest price per goods within ``[start, end]``."""
+        return {code: max(p[i:j]) for code, p, i, j in self._windows(start, end)}
+
+    def latest(self) -> Dict[str, Tuple[date, float]]:
+        return {
+            code: (date.fromordinal(dates[len(dates) - 1]), prices[len(prices) - 1])
+            for code, (dates, prices) in self._series.items()
+        }
+
+    def changes(self, since: date | int) -> Dict[str, Tuple[float, float]]:
+        """Goods whose latest price differs from the last price before ``since``.
+
+        Returns ``{code: (price_before, latest_price)}``.
+        """
+        cut = _ordinal(since)
+        out: Dict[str, Tuple[float, float]] = {}
+        for code, (dates, prices) in self._series.items():
+            i = bisect_left(dates, cut)
+            if 0 < i < len(dates):
+                before, now = prices[i - 1], prices[len(prices) - 1]
+                if before != now:
+                    out[code] = (before, now)
+        return out
+
+    def percent_drop(
+        self,
+        start: date | int,
+        end: date | int,
+        *,
+        threshold: float = 0.0,
+    ) -> Dict[str, float]:
+        """Drop (in %) from the window's peak to its last price, for drops >= threshold."""
+        out: Dict[str, float] = {}
+        for code, p, i, j in self._windows(start, end):
+            peak = max(p[i:j])
+            if peak > 0:
+                drop = (peak - p[j - 1]) / peak * 100.0
+                if drop > 0 and drop >= threshold:
+                    out[code] = drop
+        return out
+
+    # ---- Persistence ----
+    def save(self, directory: str | os.PathLike[str]) -> None:
+        """Write ``dates.bin``, ``prices.bin`` and ``index.json`` into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        index: Dict[str, List[int]] = {}
+        offset = 0
+        paths = {name: os.path.join(directory, name)
+                 for name in ("dates.bin", "prices.bin", "index.json")}
+        with open(paths["dates.bin"] + ".tmp", "wb") as fd, \
+                open(paths["prices.bin"] + ".tmp", "wb") as fp:
+            for code, (dates, prices) in self._series.items():
+                fd.write(dates)
+                fp.write(prices)
+                index[code] = [offset, len(dates)]
+                offset += len(dates)
+        with open(paths["index.json"] + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump({"version": 1, "series": index}, fh)
+        # Release our own mappings before replacing the files underneath them
+        if self._maps:
+            self._series = {c: (array("i", d), array("d", p))
+                            for c, (d, p) in self._series.items()}
+            self.close()
+        for path in paths.values():
+            os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, directory: str | os.PathLike[str], *, use_mmap: bool = True
+             ) -> "PriceHistoryStore":
+        """Open a saved store; a missing directory yields an empty store."""
+        store = cls()
+        try:
+            with open(os.path.join(directory, "index.json"), encoding="utf-8") as fh:
+                index = json.load(fh)["series"]
+        except FileNotFoundError:
+            return store
+
+        columns = []
+        for name, typecode in (("dates.bin", "i"), ("prices.bin", "d")):
+            with open(os.path.join(directory, name), "rb") as fh:
+                if not use_mmap or os.fstat(fh.fileno()).st_size == 0:
+                    col = array(typecode)
+                    col.frombytes(fh.read())
+                    columns.append(memoryview(col))
+                    continue
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                store._maps.append(mm)
+                columns.append(memoryview(mm).cast(typecode))
+        dates, prices = columns
+        for code, (offset, length) in index.items():
+            store._series[code] = (dates[offset:offset + length], prices[offset:offset + length])
+        return store
+
+    def close(self) -> None:
+        """Drop mapped series and unmap files."""
+        if not self._maps:
+            return
+        self._series = {c: s for c, s in self._series.items() if isinstance(s[0], array)}
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:  # a caller still holds a view
+                pass
+        self._maps.clear()
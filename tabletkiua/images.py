@@ -0,0 +1,233 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import posixpath
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from .exceptions import ApiError, NetworkError
+from .models import ImageAsset, ProductCard
+from ._http import build_session
+
+_LOG = logging.getLogger(__name__)
+
+_MANIFEST = "manifest.json"
+
+
+@dataclass(slots=True)
+class MirroredImage:
+    url: str
+    path: str  # relative to the mirror root
+    sha256: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MirrorResult:
+    fetched: List[str] = field(default_factory=list)
+    deduped: List[str] = field(default_factory=list)  # new URL, content already on disk
+    not_modified: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # already mirrored, not revalidated
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+
+class ImageMirror:
+    """Mirrors ``ImageAsset`` files into a local directory.
+
+    Files are stored once per content hash (``ab/abcdef....jpg``) and a
+    ``manifest.json`` maps every URL to its file plus validators, so reruns
+    skip known URLs, or revalidate them with ``If-None-Match`` /
+    ``If-Modified-Since`` when ``revalidate=True``. Downloads run concurrently
+    over one pooled session and stream to disk in chunks.
+
+    Usage::
+
+        mirror = ImageMirror("images/")
+        result = mirror.mirror(cards)
+        mirror.path_for(card.images[0].bigUrl)
+    """
+
+    def __init__(
+        self,
+        root: Union[str, os.PathLike[str]],
+        *,
+        session: Optional[requests.Session] = None,
+        max_workers: int = 8,
+        sizes: Sequence[str] = ("bigUrl", "url", "previewUrl"),
+        timeout: float | tuple[float, float] = 30.0,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        self.root = os.fspath(root)
+        self.max_workers = max_workers
+        self.sizes = tuple(sizes)
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = session or build_session(pool_maxsize=max_workers)
+        self._images: Dict[str, MirroredImage] = {}
+        self._blobs: Dict[str, str] = {}  # sha256 -> relative path
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self._load_manifest()
+
+    def __enter__(self) -> "ImageMirror":  # pragma: no cover
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # pragma: no cover
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+    # ---- Manifest ----
+    def _load_manifest(self) -> None:
+        try:
+            with open(os.path.join(self.root, _MANIFEST), encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return
+        for d in data.get("images", []):
+            img = MirroredImage(**d)
+            self._images[img.url] = img
+            self._blobs.setdefault(img.sha256, img.path)
+
+    def save_manifest(self) -> None:
+        with self._lock:
+            data = {"version": 1, "images": [asdict(i) for i in self._images.values()]}
+        path = os.path.join(self.root, _MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def get(self, url: str) -> Optional[MirroredImage]:
+        return self._images.get(url)
+
+    def path_for(self, url: str) -> Optional[str]:
+        img = self._images.get(url)
+        return os.path.join(self.root, img.path) if img else None
+
+    # ---- Collecting ----
+    def urls(self, items: Iterable[Union[ProductCard, ImageAsset, str]]) -> List[str]:
+        """Distinct image URLs (in first-seen order) for the configured sizes."""
+        seen: Dict[str, None] = {}
+        for item in items:
+            if isinstance(item, str):
+                seen.setdefault(item)
+                continue
+            assets = item.images if isinstance(item, ProductCard) else [item]
+            for asset in assets:
+                for size in self.sizes:
+                    url = getattr(asset, size, None)
+                    if url:
+                        seen.setdefault(url)
+        return list(seen)
+
+    # ---- Downloading ----
+    def mirror(
+        self,
+        items: Iterable[Union[ProductCard, ImageAsset, str]],
+        *,
+        revalidate: bool = False,
+    ) -> MirrorResult:
+        result = MirrorResult()
+        todo: List[str] = []
+        for url in self.urls(items):
+            known = self._images.get(url)
+            if known and not revalidate and os.path.exists(os.path.join(self.root, known.path)):
+                result.skipped.append(url)
+            else:
+                todo.append(url)
+
+        def run(url: str) -> None:
+            try:
+                status = self._fetch(url)
+            except (ApiError, NetworkError, OSError) as e:
+                _LOG.warning("Image %s failed: %s", url, e)
+                with self._lock:
+                    result.failed[url] = e
+                return
+            with self._lock:
+                getattr(result, status).append(url)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(run, todo))
+        self.save_manifest()
+        return result
+
+    def _fetch(self, url: str) -> str:
+        known = self._images.get(url)
+        headers: Dict[str, str] = {}
+        if known and os.path.exists(os.path.join(self.root, known.path)):
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+
+        try:
+            resp = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        except requests.RequestException as e:
+            raise NetworkError(str(e)) from e
+        with resp:
+            if resp.status_code == 304 and known:
+                return "not_modified"
+            if not (200 <= resp.status_code < 300):
+                raise ApiError(f"HTTP {resp.status_code}", status_code=resp.status_code, url=url)
+
+            digest = hashlib.sha256()
+            size = 0
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                        fh.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+            except requests.RequestException as e:
+                os.unlink(tmp)
+                raise NetworkError(str(e)) from e
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+            sha = digest.hexdigest()
+            with self._lock:
+                rel = self._blobs.get(sha)
+                deduped = rel is not None and os.path.exists(os.path.join(self.root, rel))
+                if deduped:
+                    os.unlink(tmp)
+                else:
+                    rel = posixpath.join(sha[:2], sha + self._extension(url, resp))
+                    os.makedirs(os.path.join(self.root, sha[:2]), exist_ok=True)
+                    os.replace(tmp, os.path.join(self.root, rel))
+                    self._blobs[sha] = rel
+                assert rel is not None
+                self._images[url] = MirroredImage(
+                    url=url,
+                    path=rel,
+                    sha256=sha,
+                    size=size,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+            return "deduped" if deduped else "fetched"
+
+    @staticmethod
+    def _extension(url: str, resp: requests.Response) -> str:
+        ext = posixpath.splitext(urlsplit(url).path)[1].lower()
+        if ext in {".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg", ".avif"}:
+            return ext
+        ctype = (resp.headers.get("Content-Type") or "").split(";")[0].strip()
+        return mimetypes.guess_extension(ctype) or ""
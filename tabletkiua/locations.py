@@ -0,0 +1,194 @@
+from __future__ import annotations
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .models import Location
+from .search_index import normalize
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import TabletkiUA
+
+_Cell = Tuple[int, int]
+
+
+class LocationRegistry:
+    """Cache of known :class:`Location` objects with a lat/lng grid index.
+
+    Locations are looked up by id, by any URL variant and by any name variant
+    (``name``, ``nameRu``, ``nameUk``, ``name2..4``). Bounding boxes are
+    bucketed into a regular grid of ``cell_size`` degrees, so :meth:`locate`
+    only tests the few boxes overlapping the point's cell.
+
+    Usage::
+
+        registry = LocationRegistry.load("locations.json")
+        ident.location_header = registry.header_for(50.45, 30.52)
+        registry.save("locations.json")
+    """
+
+    def __init__(self, *, cell_size: float = 0.25) -> None:
+        self.cell_size = cell_size
+        self._by_id: Dict[str, Location] = {}
+        self._by_url: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+        self._cells: Dict[_Cell, List[str]] = {}
+        self._by_ip: Optional[Tuple[str, float]] = None  # (id, unix time)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Location]:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, loc_id: object) -> bool:
+        return loc_id in self._by_id
+
+    # ---- Building ----
+    def _cell(self, lat: float, lng: float) -> _Cell:
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def add(self, loc: Location) -> None:
+        if not loc.id:
+            return
+        with self._lock:
+            if loc.id in self._by_id:
+                self._unindex(self._by_id[loc.id])
+            self._by_id[loc.id] = loc
+            for url in self._urls(loc):
+                self._by_url[url] = loc.id
+            for name in self._names(loc):
+                # Another location already owning the name keeps it
+                self._by_name.setdefault(name, loc.id)
+            if self._has_bounds(loc):
+                for cell in self._cover(loc):
+                    self._cells.setdefault(cell, []).append(loc.id)
+
+    @staticmethod
+    def _urls(loc: Location) -> Iterator[str]:
+        return (url.strip("/") for url in (loc.url, loc.urlRu, loc.urlUk) if url)
+
+    @staticmethod
+    def _names(loc: Location) -> Iterator[str]:
+        return (normalize(name).strip() for name in (
+            loc.name, loc.nameRu, loc.nameUk, loc.name2, loc.name3, loc.name4) if name)
+
+    def _unindex(self, loc: Location) -> None:
+        for url in self._urls(loc):
+            if self._by_url.get(url) == loc.id:
+                del self._by_url[url]
+        for name in self._names(loc):
+            if self._by_name.get(name) == loc.id:
+                del self._by_name[name]
+        if self._has_bounds(loc):
+            for cell in self._cover(loc):
+                ids = self._cells.get(cell)
+                if ids and loc.id in ids:
+                    ids.remove(loc.id)
+
+    @staticmethod
+    def _has_bounds(loc: Location) -> bool:
+        return loc.northEastLat > loc.southWestLat and loc.northEastLng > loc.southWestLng
+
+    def _cover(self, loc: Location) -> Iterator[_Cell]:
+        lat0, lng0 = self._cell(loc.southWestLat, loc.southWestLng)
+        lat1, lng1 = self._cell(loc.northEastLat, loc.northEastLng)
+        for i in range(lat0, lat1 + 1):
+            for j in range(lng0, lng1 + 1):
+                yield (i, j)
+
+    # ---- Lookups ----
+    def get(self, loc_id: str) -> Optional[Location]:
+        return self._by_id.get(loc_id)
+
+    def by_url(self, url: str) -> Optional[Location]:
+        loc_id = self._by_url.get(url.strip("/"))
+        return self._by_id.get(loc_id) if loc_id else None
+
+    def by_name(self, name: str) -> Optional[Location]:
+        loc_id = self._by_name.get(normalize(name).strip())
+        return self._by_id.get(loc_id) if loc_id else None
+
+    def locate(self, lat: float, lng: float) -> Optional[Location]:
+        """Return the smallest known location whose bounds contain the point.
+
+        Ties (equal areas) are broken by the higher ``priority``.
+        """
+        best: Optional[Location] = None
+        best_key: Tuple[float, int] = (math.inf, 0)
+        for loc_id in self._cells.get(self._cell(lat, lng), ()):
+            loc = self._by_id[loc_id]
+            if not (loc.southWestLat <= lat <= loc.northEastLat
+                    and loc.southWestLng <= lng <= loc.northEastLng):
+                continue
+            area = (loc.northEastLat - loc.southWestLat) * (loc.northEastLng - loc.southWestLng)
+            key = (area, -loc.priority)
+            if key < best_key:
+                best, best_key = loc, key
+        return best
+
+    def header_for(self, lat: float, lng: float) -> str:
+        """Location id suitable for ``DeviceProfile.location_header`` ("" if unknown)."""
+        loc = self.locate(lat, lng)
+        return loc.id if loc else ""
+
+    def current(
+        self,
+        client: "TabletkiUA",
+        *,
+        max_age: float = 24 * 3600.0,
+        store: bool = True,
+    ) -> Location:
+        """Cached :meth:`TabletkiUA.location_by_ip`.
+
+        The IP-derived location is reused for ``max_age`` seconds; with
+        ``store=True`` it is written to ``client.identity.location_header``
+        just like the client method does.
+        """
+        cached = self._by_ip
+        loc = self._by_id.get(cached[0]) if cached else None
+        if loc is None or cached is None or time.time() - cached[1] > max_age:
+            loc = client.location_by_ip(store=False)
+            self.add(loc)
+            self._by_ip = (loc.id, time.time())
+        if store:
+            client.identity.location_header = loc.id
+        return loc
+
+    # ---- Persistence ----
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "locations": [asdict(loc) for loc in self._by_id.values()],
+            "byIp": list(self._by_ip) if self._by_ip else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], *, cell_size: float = 0.25) -> "LocationRegistry":
+        reg = cls(cell_size=cell_size)
+        for d in data.get("locations", []):
+            reg.add(Location.from_dict(d))
+        if data.get("byIp"):
+            loc_id, at = data["byIp"]
+            reg._by_ip = (str(loc_id), float(at))
+        return reg
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], *, cell_size: float = 0.25) -> "LocationRegistry":
+        """Load a saved registry; a missing file yields an empty registry."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return cls(cell_size=cell_size)
+        return cls.from_dict(data, cell_size=cell_size)
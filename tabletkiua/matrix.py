@@ -0,0 +1,74 @@
+from __future__ import annotations
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Cell = Tuple[Optional[float], Optional[float], Optional[bool]]
+
+
+@dataclass(slots=True)
+class PriceMatrix:
+    """Goods x locations grid of ``priceMin`` / ``priceMax`` / ``canBeDelivered``.
+
+    Stored row-major (one row per goods code) in flat typed arrays: prices
+    are ``NaN`` when unknown and ``deliverable`` is ``1``/``0``/``-1``
+    (unknown). A 10k x 50 grid takes ~8.5 MB.
+    """
+
+    goods_codes: List[str]
+    location_ids: List[str]
+    price_min: array
+    price_max: array
+    deliverable: array
+    # flat cell index -> error for cells whose fetch failed
+    errors: Dict[int, Exception] = field(default_factory=dict)
+    _rows: Dict[str, int] = field(default_factory=dict, repr=False)
+    _cols: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def empty(cls, goods_codes: Sequence[str | int], location_ids: Sequence[str]) -> "PriceMatrix":
+        codes = [str(c) for c in goods_codes]
+        locs = list(location_ids)
+        n = len(codes) * len(locs)
+        return cls(
+            goods_codes=codes,
+            location_ids=locs,
+            price_min=array("d", [math.nan]) * n,
+            price_max=array("d", [math.nan]) * n,
+            deliverable=array("b", [-1]) * n,
+            _rows={c: i for i, c in enumerate(codes)},
+            _cols={loc: j for j, loc in enumerate(locs)},
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.goods_codes), len(self.location_ids))
+
+    def offset(self, goods_code: str | int, location_id: str) -> int:
+        return self._rows[str(goods_code)] * len(self.location_ids) + self._cols[location_id]
+
+    def set(self, offset: int, price_min: Optional[float], price_max: Optional[float],
+            can_be_delivered: Optional[bool]) -> None:
+        self.price_min[offset] = math.nan if price_min is None else float(price_min)
+        self.price_max[offset] = math.nan if price_max is None else float(price_max)
+        self.deliverable[offset] = -1 if can_be_delivered is None else int(bool(can_be_delivered))
+
+    def _cell(self, offset: int) -> Cell:
+        lo, hi, dv = self.price_min[offset], self.price_max[offset], self.deliverable[offset]
+        return (
+            None if math.isnan(lo) else lo,
+            None if math.isnan(hi) else hi,
+            None if dv < 0 else bool(dv),
+        )
+
+    def get(self, goods_code: str | int, location_id: str) -> Cell:
+        return self._cell(self.offset(goods_code, location_id))
+
+    def row(self, goods_code: str | int) -> Dict[str, Cell]:
+        base = self._rows[str(goods_code)] * len(self.location_ids)
+        return {loc: self._cell(base + j) for j, loc in enumerate(self.location_ids)}
+
+    def column(self, location_id: str) -> Dict[str, Cell]:
+        j, width = self._cols[location_id], len(self.location_ids)
+        return {code: self._cell(i * width + j) for i, code in enumerate(self.goods_codes)}
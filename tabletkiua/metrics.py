@@ -0,0 +1,386 @@
+from __future__ import annotations
+import math
+import threading
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+
+@dataclass(slots=True)
+class EndpointTraffic:
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    # Content-Encoding ("identity" when absent) -> responses
+    encodings: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ratio(self) -> float:
+        """Decoded / wire bytes (``1.0`` = no compression gain)."""
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "wire_bytes": self.wire_bytes,
+            "decoded_bytes": self.decoded_bytes,
+            "ratio": round(self.ratio, 3),
+            "encodings": dict(self.encodings),
+        }
+
+
+class TrafficStats:
+    """Per-endpoint response size accounting: bytes on the wire vs decoded.
+
+    Usage::
+
+        client.product_card(name="...", goods_int_code=1025098)
+        client.traffic.snapshot()
+        # {'ProductCard/card': {'requests': 1, 'wire_bytes': 9120,
+        #                       'decoded_bytes': 61873, 'ratio': 6.784,
+        #                       'encodings': {'br': 1}}}
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: Dict[str, EndpointTraffic] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        endpoint: str,
+        *,
+        wire_bytes: Optional[int],
+        decoded_bytes: int,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """Account one response body; unknown ``wire_bytes`` counts as decoded
+        size when the body was not encoded."""
+        encoding = (encoding or "identity").lower()
+        if wire_bytes is None:
+            wire_bytes = decoded_bytes if encoding == "identity" else 0
+        with self._lock:
+            t = self._endpoints.get(endpoint)
+            if t is None:
+                t = self._endpoints[endpoint] = EndpointTraffic()
+            t.requests += 1
+            t.wire_bytes += wire_bytes
+            t.decoded_bytes += decoded_bytes
+            t.encodings[encoding] = t.encodings.get(encoding, 0) + 1
+
+    def get(self, endpoint: str) -> EndpointTraffic:
+        return self._endpoints.get(endpoint) or EndpointTraffic()
+
+    def total(self) -> EndpointTraffic:
+        out = EndpointTraffic()
+        with self._lock:
+            for t in self._endpoints.values():
+                out.requests += t.requests
+                out.wire_bytes += t.wire_bytes
+                out.decoded_bytes += t.decoded_bytes
+                for enc, n in t.encodings.items():
+                    out.encodings[enc] = out.encodings.get(enc, 0) + n
+        return out
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {name: t.to_dict() for name, t in sorted(self._endpoints.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+# Log-linear buckets: exact below 2**_SUB_BITS microseconds, then 2**(_SUB_BITS - 1)
+# buckets per power of two (worst-case relative error 1/64)
+_SUB_BITS = 7
+_HALF = 1 << (_SUB_BITS - 1)
+_MAX_US = 3_600_000_000  # longer latencies are clamped to one hour
+
+
+def _bucket(us: int) -> int:
+    if us < 2 * _HALF:
+        return us
+    shift = us.bit_length() - _SUB_BITS
+    return shift * _HALF + (us >> shift)
+
+
+def _bucket_range(b: int) -> Tuple[int, int]:
+    """Lowest and highest microsecond value of bucket ``b``."""
+    if b < 2 * _HALF:
+        return b, b
+    shift = b // _HALF - 1
+    low = (b - shift * _HALF) << shift
+    return low, low + (1 << shift) - 1
+
+
+_BUCKETS = _bucket(_MAX_US) + 1
+
+
+class LatencyHistogram:
+    """HDR-style latency histogram: fixed memory (about 14 kB), O(1)
+    ``record`` and about 1.6% value precision from microseconds to an hour.
+
+    Histograms with the same layout merge by adding counts, so per-process
+    exports (:meth:`to_dict` with ``buckets=True``) can be combined.
+    """
+
+    def __init__(self) -> None:
+        self._counts = array("Q", bytes(8 * _BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, seconds: float) -> None:
+        us = min(_MAX_US, max(0, int(seconds * 1e6)))
+        with self._lock:
+            self._counts[_bucket(us)] += 1
+            self.count += 1
+            self.total += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if self.max is None or seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile ``q`` (bucket midpoint, clamped to min/max)."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = min(self.count, max(1, math.ceil(q * self.count)))
+            seen = 0
+            for b, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank:
+                    break
+            low, high = _bucket_range(b)
+            value = (low + high) / 2e6
+            return min(max(value, self.min or 0.0), self.max or value)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        with other._lock:
+            counts = other._counts.tolist()
+            count, total, lo, hi = other.count, other.total, other.min, other.max
+        with self._lock:
+            for b, n in enumerate(counts):
+                if n:
+                    self._counts[b] += n
+            self.count += count
+            self.total += total
+            if lo is not None and (self.min is None or lo < self.min):
+                self.min = lo
+            if hi is not None and (self.max is None or hi > self.max):
+                self.max = hi
+
+    def buckets(self) -> List[Tuple[float, float, int]]:
+        """Non-empty buckets as ``(low seconds, high seconds, count)``."""
+        with self._lock:
+            counts = [(b, n) for b, n in enumerate(self._counts) if n]
+        return [(low / 1e6, (high + 1) / 1e6, n)
+                for b, n in counts for low, high in (_bucket_range(b),)]
+
+    def to_dict(self, *, buckets: bool = False) -> Dict[str, object]:
+        """Summary in milliseconds; ``buckets`` adds ``{bucket: count}`` for merging."""
+        def ms(v: Optional[float]) -> Optional[float]:
+            return None if v is None else round(v * 1e3, 3)
+
+        out: Dict[str, object] = {
+            "count": self.count,
+            "min_ms": ms(self.min),
+            "mean_ms": ms(self.mean),
+            "p50_ms": ms(self.quantile(0.5)),
+            "p90_ms": ms(self.quantile(0.9)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "p999_ms": ms(self.quantile(0.999)),
+            "max_ms": ms(self.max),
+        }
+        if buckets:
+            with self._lock:
+                out["buckets"] = {b: n for b, n in enumerate(self._counts) if n}
+                out["total_s"] = self.total
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LatencyHistogram":
+        """Rebuild from ``to_dict(buckets=True)`` output (JSON keys may be strings)."""
+        hist = cls()
+        for b, n in dict(data["buckets"]).items():  # type: ignore[call-overload]
+            hist._counts[int(b)] = int(n)
+        hist.count = int(data["count"])
+        hist.total = float(data.get("total_s", 0.0))
+        hist.min = None if data.get("min_ms") is None else data["min_ms"] / 1e3
+        hist.max = None if data.get("max_ms") is None else data["max_ms"] / 1e3
+        return hist
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = array("Q", bytes(8 * _BUCKETS))
+            self.count, self.total, self.min, self.max = 0, 0.0, None, None
+
+
+@dataclass(slots=True)
+class RequestSample:
+    """Full detail of one slow or failed request."""
+
+    endpoint: str
+    method: str
+    url: str
+    seconds: float
+    status: Optional[int]  # None: no response (network error)
+    reason: str  # "slow" or "error"
+    at: float  # wall-clock time.time()
+    request_headers: Dict[str, str] = field(default_factory=dict)
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Any] = None
+    response_headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {f: getattr(self, f) for f in self.__slots__}  # type: ignore[attr-defined]
+
+
+class LatencyRecorder:
+    """Latency histograms per ``(endpoint, status)`` plus a slow-request sampler.
+
+    Every attempt is recorded in O(1). Full request/response detail is kept
+    only for errors (network failures, non-2xx statuses) and for requests
+    slower than the endpoint's ``sample_quantile`` latency once it has
+    ``min_samples`` successful responses, in a ring of the last
+    ``sample_size`` samples. Detail is built lazily, so unsampled requests
+    cost nothing beyond the histogram update.
+
+    Usage::
+
+        client.latency.slowest(5)          # [('ProductCard/card', 0.84), ...]
+        client.latency.snapshot()          # {'ProductCard/card': {'200': {...}}}
+        client.latency.samples()           # slow/failed requests in full
+    """
+
+    # Recompute an endpoint's sampling threshold every this many records
+    _REFRESH = 64
+
+    def __init__(
+        self,
+        *,
+        sample_quantile: float = 0.99,
+        sample_size: int = 100,
+        min_samples: int = 100,
+    ) -> None:
+        self.sample_quantile = sample_quantile
+        self.min_samples = min_samples
+        self._histograms: Dict[Tuple[str, Optional[int]], LatencyHistogram] = {}
+        self._ok: Dict[str, LatencyHistogram] = {}
+        self._thresholds: Dict[str, Tuple[int, Optional[float]]] = {}
+        self._samples: Deque[RequestSample] = deque(maxlen=max(0, sample_size))
+        self._lock = threading.Lock()
+
+    def _histogram(self, key: Tuple[str, Optional[int]]) -> LatencyHistogram:
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, LatencyHistogram())
+        return hist
+
+    def threshold(self, endpoint: str) -> Optional[float]:
+        """Current slow-sample cut-off in seconds (``None`` while warming up)."""
+        ok = self._ok.get(endpoint)
+        if ok is None or ok.count < self.min_samples:
+            return None
+        at, value = self._thresholds.get(endpoint, (0, None))
+        if value is None or ok.count - at >= self._REFRESH:
+            value = ok.quantile(self.sample_quantile)
+            self._thresholds[endpoint] = (ok.count, value)
+        return value
+
+    def record(
+        self,
+        endpoint: str,
+        status: Optional[int],
+        seconds: float,
+        detail: Optional[Callable[[str], RequestSample]] = None,
+    ) -> Optional[RequestSample]:
+        """Account one attempt; ``detail(reason)`` builds the sample if it is kept."""
+        self._histogram((endpoint, status)).record(seconds)
+        failed = status is None or not 200 <= status < 300
+        if not failed:
+            ok = self._ok.get(endpoint)
+            if ok is None:
+                with self._lock:
+                    ok = self._ok.setdefault(endpoint, LatencyHistogram())
+            ok.record(seconds)
+        if detail is None or self._samples.maxlen == 0:
+            return None
+        if failed:
+            reason = "error"
+        else:
+            limit = self.threshold(endpoint)
+            if limit is None or seconds <= limit:
+                return None
+            reason = "slow"
+        sample = detail(reason)
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def quantile(self, endpoint: str, q: float, *, min_samples: int = 1) -> Optional[float]:
+        """``q`` latency of ``endpoint``'s successful responses (``None`` with
+        fewer than ``min_samples``)."""
+        ok = self._ok.get(endpoint)
+        if ok is None or ok.count < max(1, min_samples):
+            return None
+        return ok.quantile(q)
+
+    def histogram(self, endpoint: str, status: Optional[int] = None) -> LatencyHistogram:
+        """Histogram for one status, or all statuses of ``endpoint`` merged."""
+        if status is not None:
+            return self._histograms.get((endpoint, status)) or LatencyHistogram()
+        merged = LatencyHistogram()
+        for (ep, _), hist in list(self._histograms.items()):
+            if ep == endpoint:
+                merged.merge(hist)
+        return merged
+
+    def endpoints(self) -> List[str]:
+        return sorted({ep for ep, _ in list(self._histograms)})
+
+    def slowest(self, n: int = 10, *, quantile: float = 0.99) -> List[Tuple[str, float]]:
+        """Endpoints by ``quantile`` latency of successful responses, slowest first."""
+        ranked = [(ep, hist.quantile(quantile)) for ep, hist in list(self._ok.items())]
+        return sorted(((ep, v) for ep, v in ranked if v is not None),
+                      key=lambda x: x[1], reverse=True)[:n]
+
+    def samples(self) -> List[RequestSample]:
+        with self._lock:
+            return list(self._samples)
+
+    def snapshot(self, *, buckets: bool = False) -> Dict[str, Dict[str, Dict[str, object]]]:
+        """``{endpoint: {status: summary}}``; network errors use status ``"error"``."""
+        out: Dict[str, Dict[str, Dict[str, object]]] = {}
+        items = sorted(list(self._histograms.items()),
+                       key=lambda kv: (kv[0][0], kv[0][1] is None, kv[0][1] or 0))
+        for (ep, status), hist in items:
+            key = "error" if status is None else str(status)
+            out.setdefault(ep, {})[key] = hist.to_dict(buckets=buckets)
+        return out
+
+    def export(self) -> Dict[str, object]:
+        """JSON-serializable histograms (with buckets) and samples."""
+        return {"histograms": self.snapshot(buckets=True),
+                "samples": [s.to_dict() for s in self.samples()]}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._ok.clear()
+            self._thresholds.clear()
+            self._samples.clear()
@@ -1,12 +1,31 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+_M = TypeVar("_M", bound="_Model")
+
+
+class _Model:
+    """Compact binary form shared by all models (see :mod:`tabletkiua.serialization`)."""
+
+    __slots__ = ()
+
+    def to_bytes(self, *, raw: bool = True) -> bytes:
+        from .serialization import dumps
+
+        return dumps(self, raw=raw)
+
+    @classmethod
+    def from_bytes(cls: Type[_M], data: bytes | memoryview) -> _M:
+        from .serialization import loads
+
+        return loads(data, cls)
 
 # --------- Simple models ---------
 
 
 @dataclass(slots=True)
-class Location:
+class Location(_Model):
     areaId: str
     id: str
     name: str
@@ -51,7 +70,7 @@ class Location:
 
 
 @dataclass(slots=True)
-class SearchItem:
+class SearchItem(_Model):
     image: Optional[str]
     icon: Optional[str]
     description: Optional[str]
@@ -80,7 +99,7 @@ class SearchItem:
 
 
 @dataclass(slots=True)
-class SearchGroup:
+class SearchGroup(_Model):
     name: str
     searchItems: List[SearchItem]
 
@@ -94,7 +113,7 @@ class SearchGroup:
 
 
 @dataclass(slots=True)
-class SearchHintsResponse:
+class SearchHintsResponse(_Model):
     tagGroup: Optional[Any]
     group: List[SearchGroup]
     canBeDelivered: Optional[bool]
@@ -115,7 +134,7 @@ class SearchHintsResponse:
 
 
 @dataclass(slots=True)
-class ImageAsset:
+class ImageAsset(_Model):
     id: Optional[str]
     type: Optional[str]
     url: Optional[str]
@@ -138,7 +157,7 @@ class ImageAsset:
 
 
 @dataclass(slots=True)
-class CharacteristicValue:
+class CharacteristicValue(_Model):
     id: Optional[str]
     name: Optional[str]
     code: Optional[str]
@@ -159,7 +178,7 @@ class CharacteristicValue:
 
 
 @dataclass(slots=True)
-class Characteristic:
+class Characteristic(_Model):
     id: str
     name: str
     values: List[CharacteristicValue]
@@ -177,7 +196,7 @@ class Characteristic:
 
 
 @dataclass(slots=True)
-class HtmlSection:
+class HtmlSection(_Model):
     id: str
     title: str
     anchor: Optional[str]
@@ -196,7 +215,7 @@ class HtmlSection:
 
 
 @dataclass(slots=True)
-class FaqItem:
+class FaqItem(_Model):
     title: str
     text: str
     priority: Optional[int]
@@ -213,7 +232,7 @@ class FaqItem:
 
 
 @dataclass(slots=True)
-class FaqGroup:
+class FaqGroup(_Model):
     title: str
     priority: Optional[int]
     items: List[FaqItem]
@@ -228,7 +247,7 @@ class FaqGroup:
 
 
 @dataclass(slots=True)
-class DosageInfo:
+class DosageInfo(_Model):
     inputType: Optional[int]
     count: Optional[float]
     nameRu: Optional[str]
@@ -249,7 +268,7 @@ class DosageInfo:
 
 
 @dataclass(slots=True)
-class AboutProduction:
+class AboutProduction(_Model):
     producersName: Optional[str]
     code: Optional[str]
     logo: Optional[str]
@@ -268,7 +287,7 @@ class AboutProduction:
 
 
 @dataclass(slots=True)
-class WaitlistInfo:
+class WaitlistInfo(_Model):
     goodsIntCode: Optional[int]
     showButton: Optional[bool]
     canAdd: Optional[bool]
@@ -285,7 +304,7 @@ class WaitlistInfo:
 
 
 @dataclass(slots=True)
-class DeliveryDataInfo:
+class DeliveryDataInfo(_Model):
     priceMin: Optional[float]
 
     @staticmethod
@@ -294,7 +313,7 @@ class DeliveryDataInfo:
 
 
 @dataclass(slots=True)
-class HintData:
+class HintData(_Model):
     waitlistInfo: Optional[WaitlistInfo]
     deliveryDataInfo: Optional[DeliveryDataInfo]
 
@@ -314,7 +333,7 @@ class HintData:
 
 
 @dataclass(slots=True)
-class DFP:
+class DFP(_Model):
     GOODS: Optional[str]
     CLASSGOODS: Optional[str]
     CLASSGOODS2: Optional[str]
@@ -339,7 +358,7 @@ class DFP:
 
 
 @dataclass(slots=True)
-class ProductCard:
+class ProductCard(_Model):
     # core ids/names
     goodsName: Optional[str]
     goodsId: Optional[str]
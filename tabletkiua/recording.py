@@ -0,0 +1,273 @@
+"""Record live traffic to a compressed JSONL archive and replay it offline.
+
+Usage::
+
+    with client.record("traffic.jsonl.gz"):
+        client.search_hints_v2("аквар")
+        client.product_card(name="...", goods_int_code=1025098)
+
+    replay = ReplayTransport("traffic.jsonl.gz", latency_scale=0.01)  # 100x real speed
+    client = TabletkiUA("token", transport=replay)
+
+Archives are one JSON object per line; ``.gz`` and ``.xz`` paths are
+compressed. Headers in ``_http._SENSITIVE`` (plus ``Set-Cookie``) are
+redacted before anything is written.
+"""
+from __future__ import annotations
+import base64
+import gzip
+import json as _json
+import lzma
+import os
+import threading
+import time
+from collections import deque
+from typing import IO, TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from .exceptions import NetworkError, SerializationError
+from .transport import Timeout, Transport, TransportResponse
+from ._http import _SENSITIVE
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import TabletkiUA
+
+FORMAT = "tabletkiua-traffic"
+VERSION = 1
+
+_REDACT = frozenset(h.lower() for h in _SENSITIVE | {"Set-Cookie"})
+
+_Key = Tuple[str, str, str, str]  # (METHOD, path?query, json body, loc/lang)
+
+
+def _open(path: str | os.PathLike[str], mode: str) -> IO[str]:
+    p = os.fspath(path)
+    if p.endswith(".gz"):
+        return gzip.open(p, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    if p.endswith(".xz"):
+        return lzma.open(p, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(p, mode, encoding="utf-8")
+
+
+def _redact(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    return {k: "<redacted>" if k.lower() in _REDACT and v else v
+            for k, v in (headers or {}).items()}
+
+
+def _key(method: str, url: str, params: Optional[Dict[str, Any]],
+         json: Optional[Dict[str, Any]], headers: Optional[Mapping[str, str]]) -> _Key:
+    parts = urlsplit(url)
+    query = sorted((params or {}).items())
+    target = f"{parts.path}?{urlencode(query)}" if query else parts.path
+    body = _json.dumps(json, sort_keys=True, ensure_ascii=False) if json is not None else ""
+    # Same answer-changing headers as cache.cache_key
+    headers = headers or {}
+    return (method.upper(), target, body,
+            f"loc={headers.get('Location', '')};lang={headers.get('Lang', '')}")
+
+
+def _encode_body(content: bytes) -> Dict[str, Any]:
+    try:
+        return {"body": _json.loads(content)}
+    except ValueError:
+        pass
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(entry: Mapping[str, Any]) -> bytes:
+    if "body" in entry:
+        return _json.dumps(entry["body"], ensure_ascii=False).encode("utf-8")
+    if "text" in entry:
+        return entry["text"].encode("utf-8")
+    return base64.b64decode(entry.get("b64", ""))
+
+
+class RecordingTransport:
+    """Wraps a transport and appends every exchange to an archive.
+
+    Each attempt is recorded (retries included) with its wall-clock latency.
+    Streamed responses are buffered while recording. :meth:`close` finishes
+    the archive; the wrapped transport is left open unless ``close_inner``.
+    """
+
+    def __init__(
+        self,
+        inner: Transport,
+        path: str | os.PathLike[str],
+        *,
+        close_inner: bool = False,
+    ) -> None:
+        self.inner = inner
+        self.path = os.fspath(path)
+        self.close_inner = close_inner
+        self.recorded = 0
+        self._fh: Optional[IO[str]] = _open(path, "w")
+        self._lock = threading.Lock()
+        self._write({"format": FORMAT, "version": VERSION})
+
+    @property
+    def session(self) -> Any:
+        return getattr(self.inner, "session", None)
+
+    @property
+    def content_encodings(self) -> Any:
+        return getattr(self.inner, "content_encodings", None)
+
+    def _write(self, obj: Dict[str, Any]) -> None:
+        line = _json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(line)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        entry: Dict[str, Any] = {
+            "ts": time.time(),
+            "method": method.upper(),
+            "url": url,
+            "params": params,
+            "json": json,
+            "headers": _redact(headers),
+        }
+        t0 = time.perf_counter()
+        try:
+            resp = self.inner.request(method, url, params=params, json=json, headers=headers,
+                                      timeout=timeout, stream=stream)
+            with resp:
+                content = resp.content
+                wire = resp.wire_bytes
+        except NetworkError as e:
+            entry.update(latency=time.perf_counter() - t0, error=str(e))
+            self._write(entry)
+            self.recorded += 1
+            raise
+        entry.update(
+            latency=time.perf_counter() - t0,
+            status=resp.status_code,
+            response_url=resp.url,
+            response_headers=_redact(resp.headers),
+            wire=wire,
+            **_encode_body(content),
+        )
+        self._write(entry)
+        self.recorded += 1
+        return TransportResponse(resp.status_code, resp.url, resp.headers, content,
+                                 wire_bytes=lambda: wire)
+
+    def close(self) -> None:
+        with self._lock:
+            fh, self._fh = self._fh, None
+        if fh is not None:
+            fh.close()
+        if self.close_inner:
+            self.inner.close()
+
+
+class _Recording:
+    """Context returned by :meth:`TabletkiUA.record`; restores the transport on exit."""
+
+    def __init__(self, client: "TabletkiUA", recorder: RecordingTransport) -> None:
+        self.client = client
+        self.recorder = recorder
+        self._previous = recorder.inner
+
+    def __enter__(self) -> RecordingTransport:
+        return self.recorder
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def stop(self) -> None:
+        if self.client.transport is self.recorder:
+            self.client.transport = self._previous
+        self.recorder.close()
+
+
+def iter_archive(path: str | os.PathLike[str]) -> Iterator[Dict[str, Any]]:
+    """Recorded exchanges in order (the header line is validated and skipped)."""
+    with _open(path, "r") as fh:
+        header = _json.loads(fh.readline() or "{}")
+        if header.get("format") != FORMAT:
+            raise SerializationError(f"{os.fspath(path)}: not a {FORMAT} archive")
+        if header.get("version", 0) > VERSION:
+            raise SerializationError(
+                f"{os.fspath(path)}: archive version {header['version']} is newer than {VERSION}")
+        for line in fh:
+            if line.strip():
+                yield _json.loads(line)
+
+
+class ReplayTransport:
+    """Serves recorded responses without network access.
+
+    Requests are matched on method, path, query parameters, JSON body and
+    the ``Location``/``Lang`` headers (host and other headers are ignored).
+    Several recordings of one request are served in order, the last one
+    repeating; unmatched requests get a 404.
+    Each reply waits ``latency * latency_scale`` seconds (``0`` = as fast as
+    possible). Thread-safe, so threaded (``price_matrix``, CLI batches) and
+    ``asyncio.to_thread`` based callers can drive it concurrently.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, latency_scale: float = 1.0) -> None:
+        self.latency_scale = latency_scale
+        self.served = 0
+        self.missed: List[_Key] = []
+        self._routes: Dict[_Key, Deque[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        for entry in iter_archive(path):
+            key = _key(entry["method"], entry["url"], entry.get("params"), entry.get("json"),
+                       entry.get("headers"))
+            self._routes.setdefault(key, deque()).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._routes.values())
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        key = _key(method, url, params, json, headers)
+        with self._lock:
+            queue = self._routes.get(key)
+            if not queue:
+                self.missed.append(key)
+                entry = None
+            else:
+                entry = queue.popleft() if len(queue) > 1 else queue[0]
+                self.served += 1
+        if entry is None:
+            full_url = f"{url}?{urlencode(params)}" if params else url
+            return TransportResponse(404, full_url, {}, b'{"message":"not recorded"}')
+        delay = entry.get("latency", 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        if "error" in entry:
+            raise NetworkError(entry["error"])
+        wire = entry.get("wire")
+        return TransportResponse(entry["status"], entry.get("response_url", url),
+                                 entry.get("response_headers", {}), _decode_body(entry),
+                                 wire_bytes=lambda: wire)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,208 @@
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Mapping, Optional
+
+from .exceptions import BulkheadFullError, CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over the last ``window`` attempts.
+
+    Closed: calls pass; once at least ``min_calls`` outcomes are in the
+    window and the failure share reaches ``failure_rate``, the breaker opens.
+    Open: calls fail fast with :class:`CircuitOpenError` for
+    ``reset_timeout`` seconds. Half-open: up to ``half_open_calls`` trial
+    calls pass; all succeeding closes the breaker, any failure reopens it.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "",
+        *,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+    ) -> None:
+        self.endpoint = endpoint
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+        self._failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0  # half-open calls admitted
+        self._trial_ok = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trials = self._trial_ok = 0
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = 0
+
+    def allow(self) -> None:
+        """Admit one call or raise :class:`CircuitOpenError`."""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return
+            retry_in = max(0.0, self.reset_timeout - (now - self._opened_at))
+        raise CircuitOpenError(self.endpoint, retry_in)
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                if failed:
+                    self._open(now)
+                else:
+                    self._trial_ok += 1
+                    if self._trial_ok >= self.half_open_calls:
+                        self._state = CLOSED
+                return
+            if self._state == OPEN:  # late result of a call admitted before opening
+                return
+            if len(self._outcomes) == self._outcomes.maxlen:
+                self._failures -= self._outcomes[0]
+            self._outcomes.append(failed)
+            self._failures += failed
+            n = len(self._outcomes)
+            if n >= self.min_calls and self._failures / n >= self.failure_rate:
+                self._open(now)
+
+    def release(self) -> None:
+        """End a call admitted by :meth:`allow` without an outcome (it raised
+        something other than a network error), freeing its half-open slot."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > self._trial_ok:
+                self._trials -= 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._failures = 0
+
+
+class Bulkhead:
+    """Concurrency limit for one endpoint.
+
+    :meth:`acquire` waits up to ``max_wait`` seconds for a slot and then
+    raises :class:`BulkheadFullError`, so a slow endpoint cannot take every
+    worker thread.
+    """
+
+    def __init__(self, endpoint: str, limit: int, *, max_wait: float = 0.0) -> None:
+        self.endpoint = endpoint
+        self.limit = limit
+        self.max_wait = max_wait
+        self._sem = threading.BoundedSemaphore(limit)
+
+    def acquire(self) -> None:
+        if self.max_wait > 0:
+            ok = self._sem.acquire(timeout=self.max_wait)
+        else:
+            ok = self._sem.acquire(blocking=False)
+        if not ok:
+            raise BulkheadFullError(self.endpoint, self.limit)
+
+    def release(self) -> None:
+        self._sem.release()
+
+    def __enter__(self) -> "Bulkhead":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class Resilience:
+    """Per-endpoint circuit breakers and bulkheads for :class:`TabletkiUA`.
+
+    Endpoints are API paths such as ``"ProductCard/card"``. Every endpoint
+    gets its own breaker; bulkheads apply to endpoints listed in ``limits``
+    (or all, with ``default_limit``).
+
+    Usage::
+
+        client = TabletkiUA(token, resilience=Resilience(
+            limits={"ProductCard/card": 16, "Search/searchHintsV2": 8},
+            reset_timeout=15,
+        ))
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        limits: Optional[Mapping[str, int]] = None,
+        default_limit: Optional[int] = None,
+        max_wait: float = 0.0,
+    ) -> None:
+        self._breaker_args = dict(
+            failure_rate=failure_rate,
+            window=window,
+            min_calls=min_calls,
+            reset_timeout=reset_timeout,
+            half_open_calls=half_open_calls,
+        )
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.max_wait = max_wait
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._bulkheads: Dict[str, Optional[Bulkhead]] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        b = self._breakers.get(endpoint)
+        if b is None:
+            with self._lock:
+                b = self._breakers.get(endpoint)
+                if b is None:
+                    b = self._breakers[endpoint] = CircuitBreaker(
+                        endpoint, **self._breaker_args)  # type: ignore[arg-type]
+        return b
+
+    def bulkhead(self, endpoint: str) -> Optional[Bulkhead]:
+        if endpoint in self._bulkheads:
+            return self._bulkheads[endpoint]
+        with self._lock:
+            if endpoint not in self._bulkheads:
+                limit = self.limits.get(endpoint, self.default_limit)
+                self._bulkheads[endpoint] = (
+                    Bulkhead(endpoint, limit, max_wait=self.max_wait) if limit else None)
+            return self._bulkheads[endpoint]
+
+    def states(self) -> Dict[str, str]:
+        """``{endpoint: breaker state}`` for endpoints seen so far."""
+        return {e: b.state for e, b in sorted(self._breakers.items())}
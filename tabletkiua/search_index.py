@@ -0,0 +1,267 @@
+from __future__ import annotations
+import heapq
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import ProductCard, SearchHintsResponse, SearchItem
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import TabletkiUA
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Ukrainian + Russian -> Latin (close to the Ukrainian national scheme)
+_TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e",
+    "є": "ie", "ж": "zh", "з": "z", "и": "y", "і": "i", "ї": "i", "й": "i",
+    "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r",
+    "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch",
+    "ш": "sh", "щ": "shch", "ь": "", "ю": "iu", "я": "ia", "ё": "e",
+    "ъ": "", "ы": "y", "э": "e", "'": "", "’": "",
+})
+
+# Collapse spelling variants so Latin input typed "by ear" still matches
+_LATIN_FOLD = (("shch", "sch"), ("kh", "h"), ("ts", "c"), ("ie", "e"),
+               ("iu", "u"), ("ia", "a"), ("yu", "u"), ("ya", "a"),
+               ("ye", "e"), ("j", "i"), ("w", "v"), ("x", "ks"), ("g", "h"),
+               ("y", "i"))
+
+_WEIGHTS = {"item": 1.0, "card": 1.0, "characteristic": 0.5}
+
+
+def normalize(text: str) -> str:
+    """Case-fold and unify apostrophes/``ё`` for matching."""
+    return text.casefold().replace("ё", "е").replace("’", "'")
+
+
+def to_latin(text: str) -> str:
+    """Map Cyrillic text to a folded Latin form used for cross-script matching."""
+    out = normalize(text).translate(_TRANSLIT)
+    for src, dst in _LATIN_FOLD:
+        out = out.replace(src, dst)
+    return out
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+
+@dataclass(slots=True)
+class _Entry:
+    item: SearchItem
+    norm: str
+    norm_latin: str
+    first: str
+    first_latin: str
+    kind: str
+    hits: int
+
+
+class _PrefixIndex:
+    """Token -> entry ids, with prefix lookups over a lazily sorted key list."""
+
+    __slots__ = ("postings", "_keys")
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[int]] = {}
+        self._keys: Optional[List[str]] = None
+
+    def add(self, token: str, entry_id: int) -> None:
+        ids = self.postings.get(token)
+        if ids is None:
+            self.postings[token] = {entry_id}
+            self._keys = None
+        else:
+            ids.add(entry_id)
+
+    def discard(self, token: str, entry_id: int) -> None:
+        ids = self.postings.get(token)
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del self.postings[token]
+                self._keys = None
+
+    def prefix(self, prefix: str) -> Set[int]:
+        if self._keys is None:
+            self._keys = sorted(self.postings)
+        keys = self._keys
+        out: Set[int] = set()
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            out.update(self.postings[keys[i]])
+            i += 1
+        return out
+
+
+class SearchIndex:
+    """Local typeahead over collected search items and product cards.
+
+    Entries come from :class:`SearchHintsResponse` items, :class:`ProductCard`
+    names/trade names and characteristic values. Every word is indexed both
+    as-is and in a folded Latin transliteration, so ``transliterate=True``
+    queries match across Cyrillic and Latin spellings the way the remote
+    ``searchHintsV2`` ``transliterate`` flag does.
+
+    Usage::
+
+        index = SearchIndex()
+        index.add_response(client.search_hints_v2("аква"))
+        index.query("аквар")                      # local only
+        index.lookup("nurofen", client=client, transliterate=True)
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[_Entry] = []
+        self._by_key: Dict[Tuple[str, str], int] = {}
+        self._direct = _PrefixIndex()
+        self._latin = _PrefixIndex()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---- Building ----
+    def add_item(self, item: SearchItem, *, kind: str = "item") -> None:
+        if not item.name:
+            return
+        key = (kind, item.code or normalize(item.name))
+        existing = self._by_key.get(key)
+        if existing is not None:
+            entry = self._entries[existing]
+            entry.hits += 1
+            entry.item = item
+            if entry.norm != normalize(item.name):  # renamed: reindex its words
+                for tok in _tokens(entry.norm):
+                    self._direct.discard(tok, existing)
+                    self._latin.discard(to_latin(tok), existing)
+                self._index(existing, entry)
+            return
+
+        entry_id = len(self._entries)
+        self._by_key[key] = entry_id
+        entry = _Entry(item=item, norm="", norm_latin="", first="", first_latin="",
+                       kind=kind, hits=1)
+        self._entries.append(entry)
+        self._index(entry_id, entry)
+
+    def _index(self, entry_id: int, entry: _Entry) -> None:
+        """Set the entry's match forms from its item name and index its words."""
+        toks = _tokens(entry.item.name or "")
+        entry.norm = normalize(entry.item.name or "")
+        entry.norm_latin = to_latin(entry.norm)
+        entry.first = toks[0] if toks else ""
+        entry.first_latin = to_latin(entry.first)
+        for tok in toks:
+            self._direct.add(tok, entry_id)
+            self._latin.add(to_latin(tok), entry_id)
+
+    def add_response(self, resp: SearchHintsResponse) -> None:
+        for grp in resp.group:
+            for item in grp.searchItems:
+                self.add_item(item)
+
+    def add_card(self, card: ProductCard) -> None:
+        if card.goodsName:
+            self.add_item(SearchItem(
+                image=card.images[0].previewUrl if card.images else None,
+                icon=None,
+                description=card.tradeName,
+                url=card.canonicalUrl,
+                canBeDelivered=card.canBeDelivered,
+                utmData=None,
+                highlight=None,
+                name=card.goodsName,
+                screenViewType="GOODS",
+                code=card.goodsIntCode,
+            ), kind="card")
+        if card.tradeName:
+            self.add_item(SearchItem(
+                image=None, icon=None, description=None, url=card.tradenameLink,
+                canBeDelivered=None, utmData=None, highlight=None,
+                name=card.tradeName, screenViewType="TRADENAME",
+                code=card.tradeNameIntCode,
+            ), kind="card")
+        for ch in card.characteristics:
+            for val in ch.values:
+                if val.name:
+                    self.add_item(SearchItem(
+                        image=val.image, icon=None, description=ch.name, url=val.urlName,
+                        canBeDelivered=None, utmData=None, highlight=None,
+                        name=val.name, screenViewType=val.screenViewType, code=val.code,
+                    ), kind="characteristic")
+
+    def extend(self, cards: Iterable[ProductCard]) -> None:
+        for card in cards:
+            self.add_card(card)
+
+    # ---- Querying ----
+    def query(
+        self,
+        term: str,
+        *,
+        limit: int = 10,
+        transliterate: int | bool = 0,
+    ) -> List[SearchItem]:
+        """Return up to ``limit`` ranked local matches for ``term``.
+
+        Every word of ``term`` is treated as a prefix; all of them must match.
+        """
+        tokens = _tokens(term)
+        if not tokens:
+            return []
+        latin = str(transliterate) in {"1", "True", "true"}
+        if latin:
+            tokens = [to_latin(t) for t in tokens]
+        index = self._latin if latin else self._direct
+
+        # Longest (most selective) prefix first keeps intermediate sets small
+        candidates: Optional[Set[int]] = None
+        for tok in sorted(tokens, key=len, reverse=True):
+            ids = index.prefix(tok)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        phrase = (to_latin(term) if latin else normalize(term)).strip()
+        first = tokens[0]
+
+        def score(entry_id: int) -> float:
+            e = self._entries[entry_id]
+            s = _WEIGHTS.get(e.kind, 1.0) + min(e.hits, 10) * 0.05
+            if (e.norm_latin if latin else e.norm).startswith(phrase):
+                s += 2.0
+            elif (e.first_latin if latin else e.first).startswith(first):
+                s += 1.0
+            return s - len(e.norm) * 0.001
+
+        best = heapq.nlargest(limit, candidates or (), key=score)
+        return [self._entries[i].item for i in best]
+
+    def lookup(
+        self,
+        term: str,
+        *,
+        client: "TabletkiUA",
+        limit: int = 10,
+        min_results: int = 1,
+        transliterate: int | bool = 0,
+        location: Optional[str] = None,
+    ) -> List[SearchItem]:
+        """Answer locally, calling ``search_hints_v2`` only if fewer than
+        ``min_results`` local matches exist. Remote results are indexed."""
+        local = self.query(term, limit=limit, transliterate=transliterate)
+        if len(local) >= min_results:
+            return local
+
+        resp = client.search_hints_v2(term, transliterate=transliterate, location=location)
+        self.add_response(resp)
+        merged: List[SearchItem] = []
+        seen: Set[Tuple[Optional[str], Optional[str]]] = set()
+        for item in [it for grp in resp.group for it in grp.searchItems] + local:
+            key = (item.code, item.name)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+        return merged[:limit]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import HtmlSection, ProductCard
+
+_SPACES = re.compile(r"\s+")
+
+_BLOCK_TAGS = {"p", "div", "section", "article", "blockquote", "ul", "ol", "table", "tbody",
+               "thead"}
+_HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_SKIP_TAGS = {"script", "style"}
+
+# Title keywords (uk/ru, lowercase) -> normalized section kind
+_KINDS = (
+    ("contraindications", ("протипоказ", "противопоказ")),
+    ("dosage", ("спосіб застосування", "способ применения", "дозуван", "дозиров")),
+    ("composition", ("склад", "состав")),
+    ("indications", ("показання", "показания")),
+    ("side_effects", ("побічн", "побочн")),
+    ("interactions", ("взаємод", "взаимодейств")),
+    ("overdose", ("передозув", "передозир")),
+    ("storage", ("умови зберігання", "условия хранения", "термін придатності",
+                 "срок годности")),
+    ("pharmacology", ("фармаколог", "фармакокінет", "фармакокинет")),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class Block:
+    kind: str  # "heading" | "paragraph" | "list_item" | "table_row"
+    text: str
+
+
+@dataclass(slots=True, frozen=True)
+class ProcessedSection:
+    id: str
+    title: str
+    kind: Optional[str]
+    text: str
+    blocks: Tuple[Block, ...]
+
+
+class _Extractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[Block] = []
+        self._buf: List[str] = []
+        self._kind = "paragraph"
+        self._cells: Optional[List[str]] = None
+        self._skip = 0
+
+    def _flush(self) -> None:
+        # Source whitespace collapses; only <br> (recorded as "\n") breaks lines
+        lines = (_SPACES.sub(" ", line).strip() for line in "".join(self._buf).split("\n"))
+        text = "\n".join(line for line in lines if line)
+        self._buf.clear()
+        if not text:
+            return
+        if self._cells is not None:
+            self._cells.append(text)
+        else:
+            self.blocks.append(Block(self._kind, text))
+        self._kind = "paragraph"
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:  # type: ignore[type-arg]
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "br":
+            self._buf.append("\n")
+        elif tag in _HEADINGS:
+            self._flush()
+            self._kind = "heading"
+        elif tag == "li":
+            self._flush()
+            self._kind = "list_item"
+        elif tag == "tr":
+            self._flush()
+            self._cells = []
+        elif tag in ("td", "th") or tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "tr":
+            self._flush()
+            if self._cells:
+                self.blocks.append(Block("table_row", " | ".join(self._cells)))
+            self._cells = None
+        elif tag in _HEADINGS or tag == "li" or tag in ("td", "th") or tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self._buf.append(data.replace("\n", " "))
+
+    def result(self) -> Tuple[Block, ...]:
+        self.close()
+        self._flush()
+        return tuple(self.blocks)
+
+
+def html_digest(html: str) -> str:
+    return hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def extract_blocks(html: str) -> Tuple[Block, ...]:
+    """Parse HTML into text blocks (uncached)."""
+    parser = _Extractor()
+    parser.feed(html)
+    return parser.result()
+
+
+def classify(title: str) -> Optional[str]:
+    """Normalized kind for a section title, e.g. ``"dosage"``, or ``None``."""
+    low = title.casefold()
+    for kind, needles in _KINDS:
+        if any(n in low for n in needles):
+            return kind
+    return None
+
+
+class SectionProcessor:
+    """Converts :class:`HtmlSection` HTML to plain text and structured blocks.
+
+    Parsed blocks are memoized by a hash of the HTML, so instruction texts
+    shared by all SKUs of a trade name are parsed once. :meth:`process_batch`
+    parses the distinct uncached texts in a process pool.
+
+    Usage::
+
+        processor = SectionProcessor()
+        parts = processor.process_card(card)["instruction"]
+        dosage = [p.text for p in parts if p.kind == "dosage"]
+    """
+
+    def __init__(self, *, max_entries: int = 20_000) -> None:
+        self.max_entries = max_entries
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._memo: "OrderedDict[str, Tuple[Block, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, digest: str) -> Optional[Tuple[Block, ...]]:
+        with self._lock:
+            blocks = self._memo.get(digest)
+            if blocks is not None:
+                self._memo.move_to_end(digest)
+                self.stats["hits"] += 1
+            return blocks
+
+    def _store(self, digest: str, blocks: Tuple[Block, ...]) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
+            self._memo[digest] = blocks
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    def blocks(self, html: str) -> Tuple[Block, ...]:
+        digest = html_digest(html)
+        blocks = self._lookup(digest)
+        if blocks is None:
+            blocks = extract_blocks(html)
+            self._store(digest, blocks)
+        return blocks
+
+    @staticmethod
+    def _build(section: HtmlSection, blocks: Tuple[Block, ...]) -> ProcessedSection:
+        return ProcessedSection(
+            id=section.id,
+            title=section.title,
+            kind=classify(section.title),
+            text="\n".join(b.text for b in blocks),
+            blocks=blocks,
+        )
+
+    def process(self, section: HtmlSection) -> ProcessedSection:
+        return self._build(section, self.blocks(section.html))
+
+    def process_card(self, card: ProductCard) -> Dict[str, List[ProcessedSection]]:
+        """``{"description": [...], "instruction": [...]}`` for one card."""
+        return {
+            "description": [self.process(s) for s in card.descriptionByParts],
+            "instruction": [self.process(s) for s in card.instructionByParts],
+        }
+
+    def process_batch(
+        self,
+        sections: Iterable[HtmlSection],
+        *,
+        max_workers: Optional[int] = None,
+        chunksize: int = 16,
+    ) -> List[ProcessedSection]:
+        """Process many sections; distinct uncached HTML is parsed in a process pool."""
+        items = list(sections)
+        digests = [html_digest(s.html) for s in items]
+        known: Dict[str, Tuple[Block, ...]] = {}
+        todo: Dict[str, str] = {}
+        for section, digest in zip(items, digests):
+            if digest in known or digest in todo:
+                continue
+            blocks = self._lookup(digest)
+            if blocks is None:
+                todo[digest] = section.html
+            else:
+                known[digest] = blocks
+
+        if len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                parsed = pool.map(extract_blocks, todo.values(), chunksize=chunksize)
+                for digest, blocks in zip(todo, parsed):
+                    known[digest] = blocks
+                    self._store(digest, blocks)
+        else:
+            for digest, html in todo.items():
+                known[digest] = extract_blocks(html)
+                self._store(digest, known[digest])
+
+        return [self._build(s, known[d]) for s, d in zip(items, digests)]
@@ -0,0 +1,161 @@
+"""Compact binary encoding of the dataclasses in :mod:`tabletkiua.models`.
+
+Each model is flattened to a positional tuple (no field names) by codecs
+generated once from the dataclass fields, then written with :mod:`marshal`,
+the interpreter's own C-level serializer for builtin types. An 8-byte header
+carries a magic, the format version, the model tag and a fingerprint of all
+model field layouts::
+
+    b"TU" | version:u8 | tag:u8 | schema:u32
+
+Schema evolution: a payload whose fingerprint differs from the current
+models is passed to the upgrader registered for its fingerprint in
+:data:`UPGRADERS`, which must return a payload for the current layout.
+When a model's fields change, register an upgrader for the old
+fingerprint (printed by ``python -m tabletkiua.serialization``) or treat
+older payloads as cache misses (they raise :class:`SerializationError`).
+
+``marshal`` data is only meant for trusted peers (own caches and worker
+processes) on the same Python minor version; it is not an interchange format.
+"""
+from __future__ import annotations
+import dataclasses
+import marshal
+import re
+import struct
+import zlib
+from typing import Any, Callable, Dict, Tuple, Type, TypeVar
+
+from . import models
+from .exceptions import SerializationError
+
+T = TypeVar("T")
+
+FORMAT_VERSION = 1
+_MAGIC = b"TU"
+_HEADER = struct.Struct(">2sBBI")
+_MARSHAL_VERSION = 4
+
+# Stable wire tags: append new models, never renumber
+TAGS: Dict[str, int] = {
+    "Location": 1,
+    "SearchItem": 2,
+    "SearchGroup": 3,
+    "SearchHintsResponse": 4,
+    "ImageAsset": 5,
+    "CharacteristicValue": 6,
+    "Characteristic": 7,
+    "HtmlSection": 8,
+    "FaqItem": 9,
+    "FaqGroup": 10,
+    "DosageInfo": 11,
+    "AboutProduction": 12,
+    "WaitlistInfo": 13,
+    "DeliveryDataInfo": 14,
+    "HintData": 15,
+    "DFP": 16,
+    "ProductCard": 17,
+}
+
+# schema fingerprint -> fn(model class, old payload) -> current payload
+UPGRADERS: Dict[int, Callable[[type, Any], Any]] = {}
+
+_OPTIONAL = re.compile(r"^Optional\[(\w+)\]$")
+_LIST = re.compile(r"^List\[(\w+)\]$")
+
+
+def _models() -> Dict[str, type]:
+    return {name: getattr(models, name) for name in TAGS}
+
+
+def _fingerprint() -> int:
+    layout = ";".join(
+        f"{name}:" + ",".join(f"{f.name}={f.type}" for f in dataclasses.fields(cls))
+        for name, cls in _models().items()
+    )
+    return zlib.crc32(layout.encode("utf-8"))
+
+
+def _build() -> Tuple[Dict[type, Callable[[Any], Any]], Dict[type, Callable[[Any], Any]]]:
+    """Generate one encoder and one decoder function per model.
+
+    Nested models are handled inline (``None`` checks, list comprehensions);
+    everything else is passed through to marshal as-is. A ``raw`` field is
+    only written when the encoder is called with ``raw=True``.
+    """
+    classes = _models()
+    src = []
+    for name, cls in classes.items():
+        enc, dec = [], []
+        for i, f in enumerate(dataclasses.fields(cls)):
+            attr, typ = f"o.{f.name}", str(f.type)
+            if typ in classes:
+                enc.append(f"_e_{typ}({attr})")
+                dec.append(f"_d_{typ}(t[{i}])")
+            elif (m := _OPTIONAL.match(typ)) and m.group(1) in classes:
+                sub = m.group(1)
+                enc.append(f"None if {attr} is None else _e_{sub}({attr})")
+                dec.append(f"None if t[{i}] is None else _d_{sub}(t[{i}])")
+            elif (m := _LIST.match(typ)) and m.group(1) in classes:
+                sub = m.group(1)
+                enc.append(f"[_e_{sub}(x) for x in {attr}]")
+                dec.append(f"[_d_{sub}(x) for x in t[{i}]]")
+            elif f.name == "raw":  # the source payload duplicates everything else
+                enc.append(f"{attr} if raw else None")
+                dec.append(f"{{}} if t[{i}] is None else t[{i}]")
+            else:
+                enc.append(attr)
+                dec.append(f"t[{i}]")
+        src.append(f"def _e_{name}(o, raw=True):\n    return ({', '.join(enc)},)\n")
+        src.append(f"def _d_{name}(t):\n    return {name}({', '.join(dec)})\n")
+    ns: Dict[str, Any] = dict(classes)
+    exec("\n".join(src), ns)  # generated from our own dataclass fields
+    return ({cls: ns[f"_e_{name}"] for name, cls in classes.items()},
+            {cls: ns[f"_d_{name}"] for name, cls in classes.items()})
+
+
+_ENCODERS, _DECODERS = _build()
+SCHEMA = _fingerprint()
+_BY_TAG = {tag: getattr(models, name) for name, tag in TAGS.items()}
+
+
+def dumps(obj: Any, *, raw: bool = True) -> bytes:
+    """Encode a model instance; ``raw=False`` leaves out ``ProductCard.raw``
+    (decoded as ``{}``), which roughly halves a card."""
+    cls = type(obj)
+    encode = _ENCODERS.get(cls)
+    if encode is None:
+        raise TypeError(f"Not a tabletkiua model: {cls.__name__}")
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, TAGS[cls.__name__], SCHEMA)
+    return header + marshal.dumps(encode(obj, raw), _MARSHAL_VERSION)
+
+
+def loads(data: bytes | memoryview, cls: Type[T] | None = None) -> T:
+    """Decode bytes from :func:`dumps`; ``cls`` (optional) must match the payload."""
+    if len(data) < _HEADER.size:
+        raise SerializationError("Truncated model payload")
+    magic, version, tag, schema = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        raise SerializationError(f"Unsupported model payload (format {version})")
+    model = _BY_TAG.get(tag)
+    if model is None or (cls is not None and model is not cls):
+        expected = cls.__name__ if cls is not None else "a known model"
+        raise SerializationError(f"Payload tag {tag} is not {expected}")
+    try:
+        payload = marshal.loads(memoryview(data)[_HEADER.size:])
+    except (EOFError, ValueError, TypeError) as e:
+        raise SerializationError(f"Corrupt model payload: {e}") from e
+    if schema != SCHEMA:
+        upgrade = UPGRADERS.get(schema)
+        if upgrade is None:
+            raise SerializationError(
+                f"Payload schema {schema:#010x} does not match {SCHEMA:#010x} and has no upgrader")
+        payload = upgrade(model, payload)
+    try:
+        return _DECODERS[model](payload)  # type: ignore[no-any-return]
+    except (TypeError, IndexError) as e:
+        raise SerializationError(f"Payload does not fit {model.__name__}: {e}") from e
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(f"format {FORMAT_VERSION}, schema fingerprint {SCHEMA:#010x}")
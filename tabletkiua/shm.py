@@ -0,0 +1,327 @@
+"""Shared-memory result rings for multiprocess card parsing.
+
+Worker processes parse ``ProductCard/card`` payloads and write one
+fixed-size record per card (code, prices, flags) plus variable bytes
+(name, optional :meth:`ProductCard.to_bytes` blob) into a single-producer /
+single-consumer ring in :mod:`multiprocessing.shared_memory`. The parent
+reads records as views over that memory, so nothing is pickled on the way
+back; full cards are decoded only when :meth:`CardView.card` is called.
+
+Usage::
+
+    for rec in parse_cards_shared(payloads, workers=8):
+        if rec.ok and rec.price_min < best.get(rec.goods_int_code, math.inf):
+            best[rec.goods_int_code] = rec.price_min
+
+Views are only valid until the iteration advances (the slot is then
+reused); copy the fields or call :meth:`CardView.card` to keep data.
+
+Memory ordering: there are no explicit barriers (Python has none). A record
+is published by storing the record head *after* its heap bytes and slot, and
+consumed by storing the tail after reading them, which relies on each
+process's stores to the segment becoming visible to the other in program
+order. That holds on x86-64 (TSO); weakly ordered CPUs (e.g. ARM) give no
+such guarantee, so there use ordinary multiprocessing queues instead.
+"""
+from __future__ import annotations
+import json
+import math
+import multiprocessing as mp
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+from .models import ProductCard
+
+# Header: producer and consumer counters on separate cache lines
+_REC_HEAD, _HEAP_HEAD, _REC_TAIL, _HEAP_TAIL, _FINISHED, _SLOTS, _HEAP_SIZE = (
+    0, 64, 128, 192, 256, 264, 272)
+_HEADER_SIZE = 320
+_U64 = struct.Struct("<Q")
+
+# goodsIntCode, priceMin, priceMax, flags, input index, heap start, name len, blob len
+_RECORD = struct.Struct("<qddB3xIQII")
+
+_DELIVER_KNOWN = 1
+_DELIVERABLE = 2
+_IS_DRUGS = 4
+_HAS_INSTRUCTION = 8
+_ERROR = 128  # name holds the error message
+
+Payload = Union[bytes, str, dict]
+
+
+class CardRing:
+    """SPSC ring of card records over one shared memory segment.
+
+    Layout: a 320-byte header, ``slots`` fixed records, then a byte heap of
+    ``heap_size``. Counters only grow; the producer publishes a record by
+    bumping the record head after writing its heap bytes and slot.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        self.slots = self._get(_SLOTS)
+        self.heap_size = self._get(_HEAP_SIZE)
+        self._heap_base = _HEADER_SIZE + self.slots * _RECORD.size
+
+    @classmethod
+    def create(cls, *, slots: int = 1024, heap_size: int = 8 << 20) -> "CardRing":
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + slots * _RECORD.size
+                                         + heap_size)
+        shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        _U64.pack_into(shm.buf, _SLOTS, slots)
+        _U64.pack_into(shm.buf, _HEAP_SIZE, heap_size)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "CardRing":
+        """Open an existing ring. Before Python 3.13 this registers the segment
+        with the resource tracker again, which is harmless for child
+        processes (they share the parent's tracker) but means an unrelated
+        process should outlive the creator's use of the ring."""
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _get(self, offset: int) -> int:
+        return _U64.unpack_from(self.buf, offset)[0]
+
+    def _set(self, offset: int, value: int) -> None:
+        _U64.pack_into(self.buf, offset, value)
+
+    def __len__(self) -> int:
+        """Records written and not yet consumed."""
+        return self._get(_REC_HEAD) - self._get(_REC_TAIL)
+
+    # ---- Producer ----
+    def put(
+        self,
+        card: Optional[ProductCard],
+        index: int,
+        *,
+        blob: bool = True,
+        error: Optional[str] = None,
+        poll: float = 0.0005,
+    ) -> None:
+        """Append one record, waiting while the ring is full."""
+        if card is None:
+            name, data, flags = (error or "error").encode("utf-8"), b"", _ERROR
+            code, pmin, pmax = -1, math.nan, math.nan
+        else:
+            name = (card.goodsName or "").encode("utf-8")
+            data = card.to_bytes(raw=False) if blob else b""
+            code = int(card.goodsIntCode) if (card.goodsIntCode or "").isdigit() else -1
+            pmin = math.nan if card.priceMin is None else float(card.priceMin)
+            pmax = math.nan if card.priceMax is None else float(card.priceMax)
+            flags = 0
+            if card.canBeDelivered is not None:
+                flags |= _DELIVER_KNOWN | (_DELIVERABLE if card.canBeDelivered else 0)
+            flags |= _IS_DRUGS if card.isDrugs else 0
+            flags |= _HAS_INSTRUCTION if card.hasInstruction else 0
+        n = len(name) + len(data)
+        size = self.heap_size
+        if n > size:
+            raise ValueError(f"Record of {n} bytes exceeds heap of {size}")
+
+        head = self._get(_REC_HEAD)
+        while head - self._get(_REC_TAIL) >= self.slots:
+            time.sleep(poll)
+        heap_head = self._get(_HEAP_HEAD)
+        pos = heap_head % size
+        start = heap_head + (size - pos) if pos + n > size else heap_head  # no wrapping
+        while start + n - self._get(_HEAP_TAIL) > size:
+            time.sleep(poll)
+
+        at = self._heap_base + start % size
+        self.buf[at:at + len(name)] = name
+        self.buf[at + len(name):at + n] = data
+        _RECORD.pack_into(self.buf, _HEADER_SIZE + (head % self.slots) * _RECORD.size,
+                          code, pmin, pmax, flags, index, start, len(name), len(data))
+        self._set(_HEAP_HEAD, start + n)
+        self._set(_REC_HEAD, head + 1)  # publish
+
+    def finish(self) -> None:
+        """Mark end of stream (after the last :meth:`put`)."""
+        self.buf[_FINISHED] = 1
+
+    # ---- Consumer ----
+    @property
+    def finished(self) -> bool:
+        return bool(self.buf[_FINISHED])
+
+    def drain(self, *, block: bool = True, poll: float = 0.0005) -> Iterator["CardView"]:
+        """Yield views of published records; each is released when the next
+        one is requested. With ``block=False`` stops when the ring is empty."""
+        view = CardView(self)
+        while True:
+            tail = self._get(_REC_TAIL)
+            if tail < self._get(_REC_HEAD):
+                view._load(_HEADER_SIZE + (tail % self.slots) * _RECORD.size)
+                yield view
+                self._set(_HEAP_TAIL, view._heap_end)
+                self._set(_REC_TAIL, tail + 1)
+                continue
+            if self.finished:
+                if tail < self._get(_REC_HEAD):  # published just before finishing
+                    continue
+                return
+            if not block:
+                return
+            time.sleep(poll)
+
+    def close(self) -> None:
+        """Unmap the segment (and unlink it if this side created it).
+
+        Raises :class:`BufferError` while a memoryview into the segment (from
+        :attr:`CardView.name_bytes`) is alive; release it and call again.
+        """
+        if self.owner and self.buf is not None:
+            self.shm.unlink()  # the name goes even if unmapping fails below
+        self.buf = None  # type: ignore[assignment]
+        try:
+            self.shm.close()
+        except BufferError as e:
+            raise BufferError(f"Ring {self.name} still has exported views "
+                              "(CardView.name_bytes); release them before close()") from e
+
+
+class CardView:
+    """Read-only view of one ring record (see module notes on lifetime)."""
+
+    __slots__ = ("_ring", "goods_int_code", "price_min", "price_max", "_flags", "index",
+                 "_start", "_name_len", "_blob_len", "_heap_end")
+
+    def __init__(self, ring: CardRing) -> None:
+        self._ring = ring
+
+    def _load(self, offset: int) -> None:
+        (self.goods_int_code, self.price_min, self.price_max, self._flags, self.index,
+         self._start, self._name_len, self._blob_len) = _RECORD.unpack_from(self._ring.buf, offset)
+        self._heap_end = self._start + self._name_len + self._blob_len
+
+    def _heap(self, skip: int, length: int) -> memoryview:
+        ring = self._ring
+        at = ring._heap_base + self._start % ring.heap_size + skip
+        return ring.buf[at:at + length]
+
+    @property
+    def ok(self) -> bool:
+        return not self._flags & _ERROR
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.name if self._flags & _ERROR else None
+
+    @property
+    def can_be_delivered(self) -> Optional[bool]:
+        if not self._flags & _DELIVER_KNOWN:
+            return None
+        return bool(self._flags & _DELIVERABLE)
+
+    @property
+    def is_drugs(self) -> bool:
+        return bool(self._flags & _IS_DRUGS)
+
+    @property
+    def has_instruction(self) -> bool:
+        return bool(self._flags & _HAS_INSTRUCTION)
+
+    @property
+    def name_bytes(self) -> memoryview:
+        """UTF-8 goods name, zero-copy; release it (or use ``with``) before
+        the ring is closed."""
+        return self._heap(0, self._name_len)
+
+    @property
+    def name(self) -> str:
+        with self.name_bytes as data:
+            return str(data, "utf-8")
+
+    def card(self) -> ProductCard:
+        """Materialize the full card (``raw`` is empty); needs ``blob=True``."""
+        if not self._blob_len:
+            raise ValueError("Record has no card blob (parsed with blob=False or failed)")
+        with self._heap(self._name_len, self._blob_len) as data:
+            return ProductCard.from_bytes(data)
+
+
+def _parse_into(ring_name: str, payloads: Sequence[Payload], indices: Sequence[int],
+                blob: bool) -> None:
+    """Worker process body: parse payloads and publish them to the ring."""
+    ring = CardRing.attach(ring_name)
+    try:
+        for i, payload in zip(indices, payloads):
+            try:
+                data: Any = payload if isinstance(payload, dict) else json.loads(payload)
+                ring.put(ProductCard.from_dict(data), i, blob=blob)
+            except Exception as e:  # report per payload, keep going
+                ring.put(None, i, error=f"{type(e).__name__}: {e}")
+    finally:
+        ring.finish()
+        ring.close()
+
+
+def parse_cards_shared(
+    payloads: Sequence[Payload],
+    *,
+    workers: Optional[int] = None,
+    slots: int = 1024,
+    heap_size: int = 8 << 20,
+    blob: bool = True,
+) -> Iterator[CardView]:
+    """Parse raw card payloads in ``workers`` processes and yield record views
+    as they arrive (input order is not kept; use :attr:`CardView.index`).
+
+    ``blob=False`` skips the binary card copy when only prices/flags are needed.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(payloads) or 1))
+    rings: List[CardRing] = []
+    live: List[CardRing] = []
+    procs: List[mp.process.BaseProcess] = []
+    try:
+        for w in range(workers):
+            ring = CardRing.create(slots=slots, heap_size=heap_size)
+            rings.append(ring)
+            indices = range(w, len(payloads), workers)
+            proc = mp.Process(target=_parse_into, daemon=True, args=(
+                ring.name, [payloads[i] for i in indices], list(indices), blob))
+            proc.start()
+            procs.append(proc)
+
+        live = list(rings)
+        while live:
+            progressed = False
+            for ring in list(live):
+                for view in ring.drain(block=False):
+                    progressed = True
+                    yield view
+                if ring.finished and not len(ring):
+                    live.remove(ring)
+            if not progressed:
+                if any(not p.is_alive() and p.exitcode for p in procs):
+                    raise RuntimeError("Card parser process died")
+                time.sleep(0.0005)
+    finally:
+        for proc in procs:
+            if live:  # consumer stopped early; producers may be blocked on a full ring
+                proc.terminate()
+            proc.join()
+        held: List[BufferError] = []
+        for ring in rings:
+            try:
+                ring.close()
+            except BufferError as e:  # close (and unlink) the other rings first
+                held.append(e)
+        if held:
+            raise held[0]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import codecs
+import json
+import re
+from typing import Any, Collection, Dict, Iterable, Iterator, Tuple
+
+from .exceptions import SerializationError
+
+_WS = re.compile(r"\s*")
+_STR_STOP = re.compile(r'["\\]')
+_STRUCT = re.compile(r'["{}\[\]]')
+_SCALAR_END = re.compile(r"[,}\]\s]")
+
+
+class _Reader:
+    """Text buffer over a byte-chunk stream.
+
+    ``mark`` is the oldest index still needed; everything before it is
+    dropped on the next refill, which is how skipped subtrees are discarded
+    while they stream past.
+    """
+
+    __slots__ = ("_chunks", "_decoder", "buf", "i", "mark", "eof")
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.i = 0
+        self.mark = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        while not self.eof:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self.eof = True
+                text = self._decoder.decode(b"", final=True)
+            else:
+                text = self._decoder.decode(chunk)
+            if text or self.eof:
+                self.buf = self.buf[self.mark:] + text
+                self.i -= self.mark
+                self.mark = 0
+                if text:
+                    return True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed)."""
+        while True:
+            self.i = _WS.match(self.buf, self.i).end()
+            if self.i < len(self.buf):
+                return self.buf[self.i]
+            self.mark = self.i
+            if not self.fill():
+                raise SerializationError("Unexpected end of JSON stream")
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise SerializationError(f"Expected {ch!r} at offset {self.i} of JSON stream")
+        self.i += 1
+
+    def _need(self, keep: bool) -> None:
+        if not keep:
+            self.mark = self.i
+        if not self.fill():
+            raise SerializationError("Unexpected end of JSON stream")
+
+    def _scan_string(self, keep: bool) -> None:
+        """Advance ``i`` past the closing quote of a string already opened."""
+        while True:
+            m = _STR_STOP.search(self.buf, self.i)
+            if m is None:
+                self.i = len(self.buf)
+                self._need(keep)
+                continue
+            if m.group() == '"':
+                self.i = m.end()
+                return
+            # backslash escape: skip it and the escaped character
+            while m.end() + 1 > len(self.buf):
+                self.i = m.start()
+                self._need(True)
+                m = _STR_STOP.search(self.buf, self.i)
+                assert m is not None
+            self.i = m.end() + 1
+
+    def scan_value(self, keep: bool) -> str:
+        """Consume one JSON value; return its text if ``keep`` else ``""``."""
+        ch = self.peek()
+        self.mark = self.i
+        if ch == '"':
+            self.i += 1
+            self._scan_string(keep)
+        elif ch in "{[":
+            depth = 0
+            while True:
+                m = _STRUCT.search(self.buf, self.i)
+                if m is None:
+                    self.i = len(self.buf)
+                    self._need(keep)
+                    continue
+                self.i = m.end()
+                tok = m.group()
+                if tok == '"':
+                    self._scan_string(keep)
+                elif tok in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        break
+        else:
+            while True:
+                m = _SCALAR_END.search(self.buf, self.i)
+                if m is not None:
+                    self.i = m.start()
+                    break
+                self.i = len(self.buf)
+                if not self.fill():
+                    break
+        if not keep:
+            self.mark = self.i
+            return ""
+        # ``fill`` may have shifted the buffer, but the value still starts at ``mark``
+        return self.buf[self.mark:self.i]
+
+
+def iter_members(
+    chunks: Iterable[bytes],
+    *,
+    skip: Collection[str] = (),
+) -> Iterator[Tuple[str, Any]]:
+    """Incrementally decode a top-level JSON object from UTF-8 byte chunks.
+
+    Yields ``(key, value)`` as soon as each member has fully arrived. Values
+    of keys in ``skip`` are scanned past without being decoded or kept in
+    memory. Each kept member is decoded with the C ``json`` decoder.
+    """
+    r = _Reader(chunks)
+    if not r.fill():
+        raise SerializationError("Empty JSON stream")
+    r.expect("{")
+    if r.peek() == "}":
+        return
+    while True:
+        text = r.scan_value(True)
+        try:
+            key = json.loads(text)
+        except ValueError as e:
+            raise SerializationError(f"Invalid JSON key {text[:50]!r}") from e
+        if not isinstance(key, str):
+            raise SerializationError("Expected object key in JSON stream")
+        r.expect(":")
+        keep = key not in skip
+        text = r.scan_value(keep)
+        if keep:
+            try:
+                value = json.loads(text)
+            except ValueError as e:
+                raise SerializationError(f"Invalid JSON value for {key!r}") from e
+            yield key, value
+        sep = r.peek()
+        r.i += 1
+        r.mark = r.i
+        if sep == "}":
+            return
+        if sep != ",":
+            raise SerializationError(f"Expected ',' or '}}' at offset {r.i - 1} of JSON stream")
+
+
+def decode_object(chunks: Iterable[bytes], *, skip: Collection[str] = ()) -> Dict[str, Any]:
+    """Like ``json.loads`` for an object, but streaming and with ``skip``."""
+    return dict(iter_members(chunks, skip=skip))
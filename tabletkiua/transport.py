@@ -0,0 +1,336 @@
+from __future__ import annotations
+import json as _json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (TYPE_CHECKING, Any, Callable, Deque, Dict, FrozenSet, Iterator, List, Mapping,
+                    Optional, Protocol, Tuple, Union)
+from urllib.parse import urlencode, urlsplit
+
+from ._http import available_encodings
+from .exceptions import NetworkError
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TransportResponse:
+    """Transport-neutral HTTP response.
+
+    Buffered responses carry ``content``; streamed ones (``stream=True``)
+    are read once through :meth:`iter_content` and must be closed.
+    """
+
+    __slots__ = ("status_code", "url", "headers", "_content", "_iter", "_close", "_wire",
+                 "_decoded")
+
+    def __init__(
+        self,
+        status_code: int,
+        url: str,
+        headers: Mapping[str, str],
+        content: Optional[bytes] = None,
+        *,
+        iter_content: Optional[Callable[[int], Iterator[bytes]]] = None,
+        close: Optional[Callable[[], None]] = None,
+        wire_bytes: Optional[Callable[[], Optional[int]]] = None,
+    ) -> None:
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self._content = content
+        self._iter = iter_content
+        self._close = close
+        self._wire = wire_bytes
+        self._decoded = 0 if content is None else len(content)
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = b"".join(self.iter_content(64 * 1024))
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return _json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        if self._content is not None:
+            for i in range(0, len(self._content), chunk_size):
+                yield self._content[i:i + chunk_size]
+            return
+        if self._iter is None:
+            return
+        it, self._iter = self._iter, None
+        for chunk in it(chunk_size):
+            self._decoded += len(chunk)
+            yield chunk
+
+    @property
+    def decoded_bytes(self) -> int:
+        """Body bytes after content decoding, read so far."""
+        return self._decoded
+
+    @property
+    def wire_bytes(self) -> Optional[int]:
+        """Body bytes as received (before ``Content-Encoding`` decoding), if known."""
+        if self._wire is not None:
+            return self._wire()
+        length = self.headers.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+
+    def close(self) -> None:
+        if self._close is not None:
+            close, self._close = self._close, None
+            close()
+
+    def __enter__(self) -> "TransportResponse":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class Transport(Protocol):
+    """Sends one HTTP request; raises :class:`NetworkError` on I/O failures.
+
+    Transports do not retry: the client applies one retry policy to all of them.
+    """
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False,
+    ) -> TransportResponse: ...
+
+    def close(self) -> None: ...
+
+
+class RequestsTransport:
+    """``requests.Session`` transport (HTTP/1.1, pooled keep-alive)."""
+
+    def __init__(self, session: "requests.Session") -> None:
+        self.session = session
+
+    @property
+    def content_encodings(self) -> FrozenSet[str]:
+        """Encodings urllib3 can decode (no zstd before urllib3 2)."""
+        return available_encodings("urllib3")
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        import requests
+
+        try:
+            resp = self.session.request(
+                method=method,
+                url=url,
+                params=params,
+                json=json,
+                headers=headers,
+                timeout=timeout,
+                verify=True,
+                stream=stream,
+            )
+            content = None if stream else resp.content
+        except requests.RequestException as e:  # networking/timeouts
+            raise NetworkError(str(e)) from e
+
+        def iter_content(chunk_size: int) -> Iterator[bytes]:
+            try:
+                yield from resp.iter_content(chunk_size=chunk_size)
+            except requests.RequestException as e:
+                raise NetworkError(str(e)) from e
+
+        return TransportResponse(
+            resp.status_code, resp.url, resp.headers, content,
+            iter_content=iter_content if stream else None,
+            close=resp.close,
+            wire_bytes=resp.raw.tell if hasattr(resp.raw, "tell") else None,
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HttpxTransport:
+    """``httpx`` transport with HTTP/2: many concurrent requests share one
+    TCP/TLS connection per host. Requires ``pip install 'tabletkiua[http2]'``.
+    """
+
+    def __init__(
+        self,
+        *,
+        http2: bool = True,
+        max_connections: int = 10,
+        proxy: Optional[str] = None,
+        client: Any = None,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "HttpxTransport requires httpx: pip install 'tabletkiua[http2]'") from e
+        self._httpx = httpx
+        self.client = client or httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections),
+            proxy=proxy,
+            verify=True,
+        )
+
+    @property
+    def content_encodings(self) -> FrozenSet[str]:
+        return available_encodings("httpx")
+
+    def _timeout(self, timeout: Optional[Timeout]) -> Any:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        httpx = self._httpx
+        try:
+            req = self.client.build_request(
+                method, url, params=params, json=json, headers=headers,
+                timeout=self._timeout(timeout))
+            resp = self.client.send(req, stream=stream)
+            content = None if stream else resp.content
+        except httpx.TransportError as e:
+            raise NetworkError(str(e)) from e
+
+        def iter_content(chunk_size: int) -> Iterator[bytes]:
+            try:
+                yield from resp.iter_bytes(chunk_size=chunk_size)
+            except httpx.TransportError as e:
+                raise NetworkError(str(e)) from e
+
+        return TransportResponse(
+            resp.status_code, str(resp.url), resp.headers, content,
+            iter_content=iter_content if stream else None,
+            close=resp.close,
+            wire_bytes=lambda: resp.num_bytes_downloaded,
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+@dataclass(slots=True)
+class FakeCall:
+    method: str
+    url: str
+    params: Optional[Dict[str, Any]]
+    json: Optional[Dict[str, Any]]
+    headers: Dict[str, str]
+
+
+@dataclass(slots=True)
+class FakeReply:
+    status_code: int = 200
+    body: Any = None  # JSON-serializable, or raw bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    error: Optional[Exception] = None  # raised instead of replying
+
+
+Handler = Callable[[FakeCall], FakeReply]
+
+
+class FakeTransport:
+    """In-memory transport for tests.
+
+    Replies are registered per ``(METHOD, path)`` where ``path`` is matched
+    against the end of the URL path. Several replies for one route are
+    served in order, the last one repeating; a callable builds replies
+    dynamically. Every call is recorded in :attr:`calls`.
+
+    Usage::
+
+        fake = FakeTransport()
+        fake.add("GET", "Locations/locationByIp", {"id": "kyiv", "name": "Київ"})
+        fake.add("GET", "ProductCard/card", FakeReply(503), FakeReply(body={...}))
+        client = TabletkiUA("token", transport=fake)
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[FakeCall] = []
+        self._routes: Dict[Tuple[str, str], Deque[Union[FakeReply, Handler]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, method: str, path: str, *replies: Union[FakeReply, Handler, Any]) -> None:
+        queue = self._routes.setdefault((method.upper(), path.strip("/")), deque())
+        for reply in replies:
+            if not isinstance(reply, FakeReply) and not callable(reply):
+                reply = FakeReply(body=reply)
+            queue.append(reply)
+
+    def _route(self, method: str, url: str) -> Optional[Union[FakeReply, Handler]]:
+        path = urlsplit(url).path.strip("/")
+        with self._lock:
+            for (m, p), queue in self._routes.items():
+                if m == method and (path == p or path.endswith("/" + p)) and queue:
+                    return queue.popleft() if len(queue) > 1 else queue[0]
+        return None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        call = FakeCall(method.upper(), url, params, json, dict(headers or {}))
+        with self._lock:
+            self.calls.append(call)
+        route = self._route(call.method, url)
+        reply = route(call) if callable(route) else route
+        if reply is None:
+            reply = FakeReply(404, {"message": "no fake route"})
+        if reply.latency:
+            time.sleep(reply.latency)
+        if reply.error is not None:
+            raise reply.error
+        body = reply.body
+        content = body if isinstance(body, bytes) else _json.dumps(body).encode("utf-8")
+        full_url = f"{url}?{urlencode(params)}" if params else url
+        return TransportResponse(reply.status_code, full_url, reply.headers, content)
+
+    def close(self) -> None:
+        pass
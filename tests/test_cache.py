@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from tabletkiua import FakeTransport, MemoryBackend, ResponseCache, TabletkiUA
+from tabletkiua.client import _MATRIX_SKIP
+from tabletkiua.exceptions import DeadlineExceededError
+from tabletkiua.transport import FakeCall, FakeReply
+
+
+def _card(call: FakeCall) -> FakeReply:
+    price = int(call.params["id"]) * 1000 + int(call.headers.get("Location") or 0)
+    return FakeReply(body={"priceMin": price, "priceMax": price, "canBeDelivered": True})
+
+
+def _client(backend: MemoryBackend, max_entries: int):
+    fake = FakeTransport()
+    fake.add("GET", "ProductCard/card", _card)
+    cache = ResponseCache(ttl=300, max_entries=max_entries, backend=backend)
+    return TabletkiUA("token", transport=fake, cache=cache), fake, cache
+
+
+def test_price_matrix_warms_grids_larger_than_local_cache():
+    backend = MemoryBackend()
+    goods, locations = [str(i) for i in range(12)], [str(i) for i in range(1, 101)]
+    first, _, _ = _client(backend, max_entries=5000)
+    expected = first.price_matrix(goods, locations)
+
+    client, fake, cache = _client(backend, max_entries=300)
+    matrix = client.price_matrix(goods, locations)
+
+    assert not fake.calls  # every cell came from the shared backend
+    assert matrix.price_min == expected.price_min
+    assert cache.stats["backend_hits"] == len(goods) * len(locations)
+
+
+def test_price_matrix_requests_minimal_cards_under_shared_keys():
+    fake = FakeTransport()
+    fake.add("GET", "ProductCard/card", FakeReply(body={
+        "priceMin": 10, "priceMax": 12, "canBeDelivered": False,
+        "instructionByParts": [{"title": "x" * 1000}], "faqs": [], "priceHistory": {},
+    }))
+    cache = ResponseCache(ttl=300)
+    client = TabletkiUA("token", transport=fake, cache=cache)
+
+    matrix = client.price_matrix(["5"], ["7"], names={"5": "aspirin"})
+
+    (call,) = fake.calls
+    assert call.params["withContentPlus"] == "false"
+    assert matrix.price_min[0] == 10
+    key = client._card_key("aspirin", "5", False, "7", _MATRIX_SKIP)
+    cached = cache.lookup(key)[0]
+    assert cached["priceMax"] == 12 and "instructionByParts" not in cached
+
+
+def test_lock_wait_is_bounded_by_call_deadline():
+    backend = MemoryBackend()
+    fake = FakeTransport()
+    fake.add("POST", "Search/searchHintsV2", {"group": [], "code": 0})
+    cache = ResponseCache(ttl=60, backend=backend, lock_timeout=10)
+    client = TabletkiUA("token", transport=fake, cache=cache)
+    payload = {"term": "a", "transliterate": 0, "type": "DEFAULT"}
+    key = client._cache_key("POST", client._url("Search/searchHintsV2"), None, payload,
+                            client._headers(None))
+    assert backend.acquire_lock(cache._backend_key(key), 30)  # another host is refreshing
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        client.search_hints_v2("a", deadline=0.2)
+    assert time.monotonic() - started < 1.0
+    assert cache.stats["lock_waits"] == 1 and not fake.calls
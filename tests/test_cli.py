@@ -0,0 +1,84 @@
+import io
+import json
+import sys
+
+import pytest
+
+from tabletkiua import FakeTransport, TabletkiUA, cli
+from tabletkiua.transport import FakeCall, FakeReply
+
+
+def _card(call: FakeCall) -> FakeReply:
+    code = int(call.params["id"])
+    return FakeReply(body={"goodsIntCode": code, "goodsName": f"Goods {code}",
+                           "priceMin": code / 10, "priceMax": code / 5})
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    transport = FakeTransport()
+    monkeypatch.setattr(cli, "TabletkiUA",
+                        lambda *a, **kw: TabletkiUA(*a, **{**kw, "transport": transport}))
+    return transport
+
+
+def test_documented_cards_command(fake, monkeypatch, capsys):
+    fake.add("GET", "ProductCard/card", _card)
+    monkeypatch.setattr("sys.stdin", io.StringIO("1025098\n# comment\n2000\n"))
+
+    code = cli.main("cards -j 16 --rate 20 --fields priceMin,priceMax --ordered".split())
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert lines == [
+        {"input": "1025098", "ok": True, "result": {"priceMin": 102509.8, "priceMax": 205019.6}},
+        {"input": "2000", "ok": True, "result": {"priceMin": 200.0, "priceMax": 400.0}},
+    ]
+
+
+def test_run_options_before_or_after_subcommand():
+    parser = cli.build_parser()
+    assert parser.parse_args(["-j", "4", "--hedge", "cards"]).jobs == 4
+    after = parser.parse_args(["cards", "-j", "4", "--hedge"])
+    assert (after.jobs, after.hedge, after.rate) == (4, True, 0.0)
+
+
+def test_barcodes_fetch_goods_hits_only(fake, monkeypatch, capsys):
+    def hints(call: FakeCall) -> FakeReply:
+        trade = {"name": "Brand", "code": "77", "screenViewType": "TRADENAME"}
+        goods = {"name": "Goods 1025098", "code": "1025098", "screenViewType": "GOODS"}
+        items = [trade, goods] if call.json["term"] == "4820000000001" else [trade]
+        return FakeReply(body={"group": [{"name": "Товари", "searchItems": items}], "code": 0})
+
+    fake.add("POST", "Search/searchHintsV2", hints)
+    fake.add("GET", "ProductCard/card", _card)
+    monkeypatch.setattr("sys.stdin", io.StringIO("4820000000001\n4820000000002\n"))
+
+    code = cli.main("barcodes --ordered --fields goodsIntCode".split())
+
+    found, missing = (json.loads(line) for line in capsys.readouterr().out.splitlines())
+    assert code == 1
+    assert found["result"] == {"goodsIntCode": 1025098}
+    assert not missing["ok"] and missing["error"].startswith("LookupError")
+    assert [c.params["id"] for c in fake.calls if c.method == "GET"] == ["1025098"]
+
+
+class _ClosedPipe(io.StringIO):
+    """stdout of ``tabletkiua ... | head -n 2``."""
+
+    def write(self, s: str) -> int:
+        if self.getvalue().count("\n") >= 2:
+            raise BrokenPipeError(32, "Broken pipe")
+        return super().write(s)
+
+
+def test_broken_pipe_stops_batch(fake, monkeypatch, capsys):
+    fake.add("GET", "ProductCard/card", _card)
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(f"{i}\n" for i in range(1, 501))))
+    monkeypatch.setattr("sys.stdout", _ClosedPipe())
+
+    code = cli.main("cards -j 2 --ordered --fields priceMin".split())
+
+    assert code == 141
+    assert len(fake.calls) < 20  # queued inputs were cancelled
+    assert not sys.stderr.closed
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from tabletkiua import ClientConfig, DeadlineExceededError, NetworkError, TabletkiUA
+from tabletkiua.transport import FakeReply, FakeTransport, TransportResponse
+
+
+class SlowTransport:
+    """Times out like a real socket: after the (capped) per-attempt timeout."""
+
+    def __init__(self) -> None:
+        self.timeouts = []
+
+    def request(self, method, url, *, params=None, json=None, headers=None, timeout=None,
+                stream=False) -> TransportResponse:
+        self.timeouts.append(timeout)
+        time.sleep(timeout)
+        raise NetworkError("Read timed out")
+
+    def close(self) -> None:
+        pass
+
+
+def test_exhausted_deadline_raises_deadline_exceeded():
+    transport = SlowTransport()
+    client = TabletkiUA("token", transport=transport, config=ClientConfig(timeout=5.0))
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError) as info:
+        client.location_by_ip(store=False, deadline=0.2)
+    assert time.monotonic() - started < 1.0
+    assert isinstance(info.value.__cause__, NetworkError)
+    assert transport.timeouts == [pytest.approx(0.2, abs=0.05)]
+
+
+def test_network_error_without_deadline_is_not_a_deadline_error():
+    transport = SlowTransport()
+    client = TabletkiUA("token", transport=transport,
+                        config=ClientConfig(timeout=0.01, retries=1, backoff_factor=0))
+    with pytest.raises(NetworkError) as info:
+        client.location_by_ip(store=False)
+    assert not isinstance(info.value, DeadlineExceededError)
+    assert len(transport.timeouts) == 2
+
+
+def test_hedge_delay_follows_latency_histogram():
+    transport = FakeTransport()
+    transport.add("GET", "Locations/locationByIp", *[FakeReply(body={}, latency=0.001 * i)
+                                        for i in range(1, 21)])
+    client = TabletkiUA("token", transport=transport,
+                        config=ClientConfig(hedge_min_samples=20, hedge_quantile=0.5))
+    endpoint = "Locations/locationByIp"
+    assert client.hedge_delay(endpoint) == client.config.hedge_delay
+    for _ in range(20):
+        client.location_by_ip(store=False)
+
+    assert client.latency.histogram(endpoint).count == 20  # one record per attempt
+    delay = client.hedge_delay(endpoint)
+    assert delay == client.latency.quantile(endpoint, 0.5)
+    assert 0.005 < delay < 0.02
+
+
+def test_price_matrix_keeps_unexpected_cell_errors():
+    def card(call):
+        if call.headers.get("Location") == "2":
+            raise RuntimeError("decoder bug")
+        return FakeReply(body={"priceMin": 10, "priceMax": 12, "canBeDelivered": True})
+
+    transport = FakeTransport()
+    transport.add("GET", "ProductCard/card", card)
+    client = TabletkiUA("token", transport=transport, config=ClientConfig(retries=0))
+    matrix = client.price_matrix(["1", "2"], ["1", "2", "3"], max_workers=2)
+
+    assert sorted(matrix.errors) == [1, 4]
+    assert all(isinstance(e, RuntimeError) for e in matrix.errors.values())
+    assert matrix.get("2", "3") == (10, 12, True)
@@ -0,0 +1,71 @@
+import json
+
+from tabletkiua.columnar import HintsTable
+from tabletkiua.models import SearchHintsResponse
+
+PAYLOADS = [
+    {"group": [
+        {"name": "Товари", "searchItems": [
+            {"name": "Вітамін C", "code": "1", "url": "/c", "screenViewType": "GOODS",
+             "canBeDelivered": True},
+            {"name": "Вітамін D", "code": 2, "url": "/d", "screenViewType": "GOODS",
+             "canBeDelivered": False},
+        ]},
+        {"name": "Бренди", "searchItems": [
+            {"name": "Vitamax", "code": None, "url": "/v", "screenViewType": "TRADENAME"},
+        ]},
+        {"name": "Порожня", "searchItems": []},
+    ]},
+    {"group": [{"name": "Товари", "searchItems": [
+        {"name": "Вітамін C", "code": "1", "url": "/c", "screenViewType": "GOODS",
+         "canBeDelivered": True},
+    ]}]},
+]
+
+
+def _table():
+    table = HintsTable()
+    table.extend(json.dumps(PAYLOADS[0]).encode())  # raw bytes
+    table.extend(SearchHintsResponse.from_dict(PAYLOADS[1]))  # model
+    return table
+
+
+def test_extend_builds_rows_from_any_payload_form():
+    table = _table()
+    assert len(table) == 4
+    assert table.row(1) == {"response": 0, "group": "Товари", "name": "Вітамін D", "code": "2",
+                            "url": "/d", "screenViewType": "GOODS", "canBeDelivered": False}
+    assert table.column("canBeDelivered") == [True, False, None, True]
+    assert table.column("response") == [0, 0, 0, 1]
+    assert table.column("code", [2, 3]) == [None, "1"]
+
+
+def test_where_values_lists_and_predicates():
+    table = _table()
+    assert list(table.where(screenViewType="GOODS", canBeDelivered=True)) == [0, 3]
+    assert list(table.where(code=["2", None])) == [1, 2]
+    assert list(table.where(name=lambda n: n.endswith("D") or n.startswith("Vita"))) == [1, 2]
+    assert list(table.where(response=1, name="Вітамін C")) == [3]
+    assert list(table.where(rows=[1, 2, 3], screenViewType="GOODS")) == [1, 3]
+    assert list(table.where(name="unknown")) == []
+
+
+def test_value_counts_and_group_by():
+    table = _table()
+    assert table.value_counts("name") == {"Вітамін C": 2, "Вітамін D": 1, "Vitamax": 1}
+    assert table.value_counts("group", [2, 3]) == {"Бренди": 1, "Товари": 1}
+    groups = table.group_by("screenViewType")
+    assert {k: list(v) for k, v in groups.items()} == {"GOODS": [0, 1, 3], "TRADENAME": [2]}
+
+
+def test_take_is_independent_of_its_parent():
+    table = _table()
+    part = table.take(table.where(screenViewType="GOODS"))
+    assert part.column("name") == ["Вітамін C", "Вітамін D", "Вітамін C"]
+
+    part.extend({"group": [{"name": "Нове", "searchItems": [{"name": "Новий"}]}]})
+    table.extend({"group": [{"name": "Інше", "searchItems": [{"name": "Інший"}]}]})
+    assert part.column("name")[-1] == "Новий" and part.column("group")[-1] == "Нове"
+    assert table.column("name")[-1] == "Інший" and table.column("group")[-1] == "Інше"
+    assert "Новий" not in table.dictionaries["name"].index
+    assert table.value_counts("name")["Вітамін C"] == 2
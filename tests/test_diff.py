@@ -0,0 +1,54 @@
+import copy
+
+from tabletkiua.diff import CardDiffer, ChangeEvent
+from tabletkiua.models import ProductCard
+
+CARD = {
+    "goodsIntCode": 1025098, "goodsName": "Парацетамол", "priceMin": 18.45, "priceMax": 31.2,
+    "canBeDelivered": True,
+    "images": [{"id": "1", "url": "https://img/1.jpg"}, {"id": "2", "url": "https://img/2.jpg"}],
+    "instructionByParts": [{"id": 1, "title": "Склад", "text": "парацетамол 500 мг"},
+                           {"id": 2, "title": "Показання", "text": "біль"}],
+    "descriptionByParts": [{"id": 1, "title": "Опис", "text": "..."}],
+    "faqs": [{"q": "?", "a": "!"}],
+    "hintData": {"waitlistInfo": None},
+}
+
+
+def test_first_sight_and_no_change():
+    differ = CardDiffer()
+    assert differ.update(CARD) == [ChangeEvent("1025098", "new", None, None)]
+    assert differ.update(ProductCard.from_dict(copy.deepcopy(CARD))) == []
+    assert len(differ) == 1
+
+
+def test_typed_change_events():
+    differ = CardDiffer()
+    differ.update(CARD)
+    card = copy.deepcopy(CARD)
+    card["priceMin"] = 15.0
+    card["canBeDelivered"] = False
+    card["images"] = card["images"][1:] + [{"id": "3", "url": "https://img/3.jpg"}]
+    card["instructionByParts"][1]["text"] = "головний біль"
+    card["hintData"] = {"waitlistInfo": {"available": True}}
+    card["faqs"] = []
+
+    events = {e.kind: e for e in differ.update(card)}
+
+    assert set(events) == {"price", "availability", "waitlist", "images_added",
+                           "images_removed", "instruction_edited", "faqs"}
+    assert (events["price"].old, events["price"].new) == ((18.45, 31.2), (15.0, 31.2))
+    assert (events["availability"].old, events["availability"].new) == (True, False)
+    assert events["waitlist"].new == {"available": True}
+    assert events["images_added"].new == ["3"]
+    assert events["images_removed"].old == ["1"]
+    assert events["instruction_edited"].new == ["Показання"]
+    assert differ.get(1025098).priceMin == 15.0
+
+
+def test_refresh_over_many_cards():
+    differ = CardDiffer()
+    other = dict(CARD, goodsIntCode=7)
+    assert [e.kind for e in differ.refresh([CARD, other])] == ["new", "new"]
+    changed = dict(other, characteristics=[{"name": "Форма", "values": []}])
+    assert differ.refresh([CARD, changed]) == [ChangeEvent("7", "characteristics", None, None)]
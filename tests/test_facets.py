@@ -0,0 +1,29 @@
+from tabletkiua.facets import FacetIndex
+from tabletkiua.models import ProductCard
+
+
+def card(code, atc, price=10.0, categories=("1",)):
+    return ProductCard.from_dict({"goodsIntCode": code, "priceMin": price,
+                                  "dfp": {"ATC": [atc], "CATEGORIES": list(categories)}})
+
+
+def test_readding_a_card_replaces_its_postings():
+    index = FacetIndex()
+    index.extend(card(str(i), "N02BE01") for i in range(1000))
+    index.query(atc="N02BE")  # materialize bitmaps
+    for i in range(0, 1000, 2):
+        index.add_card(card(str(i), "A01AA01", price=50.0, categories=("2",)))
+
+    assert len(index) == 1000
+    assert index.query(atc="N02BE") == [str(i) for i in range(1, 1000, 2)]
+    assert index.query(atc="A01", max_price=60) == [str(i) for i in range(0, 1000, 2)]
+    assert index.values("category") == {"1": 500, "2": 500}
+
+
+def test_count_matches_query_for_the_same_filters():
+    index = FacetIndex()
+    index.extend(card(str(i), "N02BE01", price=float(i)) for i in range(20))
+
+    assert index.count(atc="N02", min_price=5, max_price=9) == 5
+    assert index.count(categories=["1"]) == len(index.query(categories=["1"])) == 20
+    assert index.count(atc="A01") == 0
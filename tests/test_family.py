@@ -0,0 +1,65 @@
+from tabletkiua import ClientConfig, FakeTransport, TabletkiUA
+from tabletkiua.family import TradeNameGraph
+from tabletkiua.models import ProductCard
+from tabletkiua.transport import FakeCall, FakeReply
+
+CARDS = {
+    "1": ("Нурофен 200 мг №12", "50", 95.0),
+    "2": ("Нурофен 400 мг №12", "50", 140.0),
+    "3": ("Нурофен форте №24", "51", 210.0),
+    "4": ("Нурофен дитячий", "50", None),
+}
+
+
+def _card_dict(code):
+    name, trade, price = CARDS[code]
+    return {"goodsIntCode": code, "goodsName": name, "tradeName": "Нурофен",
+            "tradeNameIntCode": trade, "topTradeNameIntCode": "5", "priceMin": price}
+
+
+def _client():
+    def card(call: FakeCall) -> FakeReply:
+        if call.params["id"] == "4":
+            return FakeReply(status_code=404, body={"message": "gone"})
+        return FakeReply(body=_card_dict(call.params["id"]))
+
+    transport = FakeTransport()
+    transport.add("POST", "Search/searchHintsV2", {"group": [{"name": "Товари", "searchItems": [
+        {"name": CARDS[c][0], "code": c, "screenViewType": "GOODS"} for c in CARDS
+    ] + [{"name": "Нурофен", "code": "brand", "screenViewType": "TRADENAME"}]}], "code": 0})
+    transport.add("GET", "ProductCard/card", card)
+    client = TabletkiUA("token", transport=transport, config=ClientConfig(retries=0))
+    return client, transport
+
+
+def test_expand_discovers_family_once():
+    client, transport = _client()
+    graph = TradeNameGraph()
+    seed = ProductCard.from_dict(_card_dict("1"))
+
+    variants = graph.expand(client, seed, max_workers=2)
+
+    assert [m.goodsIntCode for m in variants] == ["1", "2"]  # cheapest first
+    assert graph.is_expanded("50")
+    fetched = sorted(c.params["id"] for c in transport.calls if c.method == "GET")
+    assert fetched == ["2", "3", "4"]  # the seed is known; "4" fails and is skipped
+    assert {t: [m.goodsIntCode for m in v] for t, v in graph.top_family("5").items()} == \
+        {"50": ["1", "2"], "51": ["3"]}
+
+    calls = len(transport.calls)
+    assert graph.expand(client, "2") == variants  # answered locally
+    assert len(transport.calls) == calls
+
+
+def test_readding_moves_member_between_trade_names(tmp_path):
+    graph = TradeNameGraph()
+    graph.add_card(ProductCard.from_dict(_card_dict("2")))
+    graph.add_card(ProductCard.from_dict(dict(_card_dict("2"), tradeNameIntCode="51")))
+    assert graph.variants("50") == []
+    assert [m.goodsIntCode for m in graph.variants("51")] == ["2"]
+
+    path = tmp_path / "families.json"
+    graph.save(path)
+    loaded = TradeNameGraph.load(path)
+    assert loaded.member(2) == graph.member(2)
+    assert len(TradeNameGraph.load(tmp_path / "missing.json")) == 0
@@ -0,0 +1,31 @@
+from tabletkiua import FakeTransport, HintsCache, TabletkiUA
+
+
+def _hints(*responses):
+    fake = FakeTransport()
+    fake.add("POST", "Search/searchHintsV2", *responses)
+    return HintsCache(TabletkiUA("token", transport=fake)), fake
+
+
+def _response(*items):
+    return {"code": 0, "group": [{"name": "Товари", "searchItems": [
+        {"name": name, "code": code} for name, code in items]}]}
+
+
+def test_longer_prefix_is_filtered_locally_by_name():
+    hints, fake = _hints(_response(("Аквадетрим", "1"), ("Аквамарис", "2")))
+    hints.search("акв")
+    resp = hints.search("аквам")
+    assert [it.name for it in resp.group[0].searchItems] == ["Аквамарис"]
+    assert len(fake.calls) == 1 and hints.stats["filtered"] == 1
+
+
+def test_digit_terms_are_not_narrowed_by_name():
+    # A barcode matches on fields the hints do not carry, so "4820" -> "48201"
+    # must ask the API instead of filtering the names down to nothing
+    hints, fake = _hints(_response(("Парацетамол", "1025098")),
+                         _response(("Парацетамол", "1025098")))
+    hints.search("4820")
+    resp = hints.search("48201")
+    assert [it.name for it in resp.group[0].searchItems] == ["Парацетамол"]
+    assert len(fake.calls) == 2 and hints.stats["filtered"] == 0
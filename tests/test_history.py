@@ -0,0 +1,65 @@
+from array import array
+from datetime import date
+
+import pytest
+
+from tabletkiua.history import PriceHistoryStore, parse_date
+
+HISTORY = {
+    "1": {"2025-01-01": 100.0, "2025-01-10": 120.0, "2025-01-20": 90.0},
+    "2": {"05.01.2025": 50.0, "2025-01-15T00:00:00": 55.0, "garbage": 1.0},
+}
+
+
+def _store():
+    store = PriceHistoryStore()
+    for code, history in HISTORY.items():
+        store.add(code, history)
+    return store
+
+
+def test_parse_date_formats():
+    expected = date(2025, 1, 5).toordinal()
+    assert parse_date("2025-01-05") == parse_date("05.01.2025") == expected
+    assert parse_date("2025-01-05T10:30:00") == expected
+    assert parse_date("soon") is None
+
+
+def test_add_merges_and_queries():
+    store = _store()
+    store.add(1, {"2025-01-10": 110.0, "2025-02-01": 80.0})  # overwrite + append
+    assert store.series(1)[1:] == [(date(2025, 1, 10), 110.0), (date(2025, 1, 20), 90.0),
+                                   (date(2025, 2, 1), 80.0)]
+    assert store.series("2") == [(date(2025, 1, 5), 50.0), (date(2025, 1, 15), 55.0)]
+    assert store.window_min(date(2025, 1, 2), date(2025, 1, 31)) == {"1": 90.0, "2": 50.0}
+    assert store.window_max(date(2025, 1, 1), date(2025, 1, 12)) == {"1": 110.0, "2": 50.0}
+    assert store.changes(date(2025, 1, 16)) == {"1": (110.0, 80.0)}
+    assert store.percent_drop(date(2025, 1, 1), date(2025, 1, 31), threshold=10) == \
+        pytest.approx({"1": (110 - 90) / 110 * 100})
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_load_round_trip(tmp_path, use_mmap):
+    store = _store()
+    store.save(tmp_path)
+    loaded = PriceHistoryStore.load(tmp_path, use_mmap=use_mmap)
+    try:
+        assert sorted(loaded.codes()) == ["1", "2"]
+        for code in HISTORY:
+            assert loaded.series(code) == store.series(code)
+        dates, prices = loaded.columns("1")
+        assert isinstance(dates, memoryview) and list(prices) == [100.0, 120.0, 90.0]
+
+        # Appending copies the mapped series; saving over the mapped files works
+        loaded.add("1", {"2025-03-01": 70.0})
+        assert isinstance(loaded.columns("1")[0], array)
+        loaded.save(tmp_path)
+    finally:
+        loaded.close()
+    reloaded = PriceHistoryStore.load(tmp_path)
+    assert reloaded.latest() == {"1": (date(2025, 3, 1), 70.0), "2": (date(2025, 1, 15), 55.0)}
+    reloaded.close()
+
+
+def test_load_missing_directory(tmp_path):
+    assert len(PriceHistoryStore.load(tmp_path / "none")) == 0
@@ -0,0 +1,31 @@
+import pytest
+import requests
+
+from tabletkiua import ClientConfig, TabletkiUA
+from tabletkiua import _http
+from tabletkiua.transport import RequestsTransport
+
+
+@pytest.fixture
+def zstd_installed(monkeypatch):
+    real = _http.find_spec
+    monkeypatch.setattr(_http, "find_spec",
+                        lambda name: object() if name == "zstandard" else real(name))
+    _http.available_encodings.cache_clear()
+    yield
+    _http.available_encodings.cache_clear()
+
+
+@pytest.mark.parametrize("major, advertised", [(1, False), (2, True)])
+def test_requests_transport_advertises_zstd_only_with_urllib3_2(
+        monkeypatch, zstd_installed, major, advertised):
+    monkeypatch.setattr(_http, "_urllib3_major", lambda: major)
+    client = TabletkiUA("token", transport=RequestsTransport(requests.Session()),
+                        config=ClientConfig(encodings=("zstd", "gzip")))
+    assert ("zstd" in client._accept_encoding) is advertised
+    assert "gzip" in client._accept_encoding
+
+
+def test_stackless_transport_uses_installed_decoders(monkeypatch, zstd_installed):
+    monkeypatch.setattr(_http, "_urllib3_major", lambda: 1)
+    assert _http.accept_encoding(("zstd", "gzip")).startswith("zstd")
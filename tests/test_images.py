@@ -0,0 +1,82 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar, Set
+
+import pytest
+
+from tabletkiua._http import build_session
+from tabletkiua.exceptions import ApiError
+from tabletkiua.images import ImageMirror
+
+PHOTO = b"\xff\xd8jpeg" * 5000
+OTHER = b"\x89PNGdata" * 100
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits: ClassVar[Counter[str]] = Counter()
+    fail_first: ClassVar[Set[str]] = {"/flaky.jpg"}
+
+    def do_GET(self):
+        self.hits[self.path] += 1
+        if self.path in self.fail_first and self.hits[self.path] == 1:
+            return self._reply(503, b"busy")
+        if self.path in ("/a.jpg", "/copy-of-a.jpg"):
+            if self.headers.get("If-None-Match") == '"a"':
+                return self._reply(304, b"")
+            return self._reply(200, PHOTO, {"ETag": '"a"'})
+        if self.path == "/flaky.jpg":
+            return self._reply(200, OTHER)
+        return self._reply(404, b"not found")
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = Counter()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _mirror(root):
+    return ImageMirror(root, max_workers=4,
+                       session=build_session(retries=2, backoff_factor=0, pool_maxsize=4))
+
+
+def test_mirror_fetches_retries_and_reuses_files(server, tmp_path):
+    urls = [f"{server}/{name}" for name in ("a.jpg", "copy-of-a.jpg", "flaky.jpg", "gone.jpg")]
+    with _mirror(tmp_path) as mirror:
+        result = mirror.mirror(urls)
+
+    assert sorted(result.fetched + result.deduped) == sorted(urls[:3])
+    assert len(result.deduped) == 1  # same bytes as the other a.jpg URL
+    assert list(result.failed) == [urls[3]]
+    assert isinstance(result.failed[urls[3]], ApiError)
+    assert _Handler.hits["/flaky.jpg"] == 2  # 503 retried by the session
+    with open(mirror.path_for(urls[2]), "rb") as fh:
+        assert fh.read() == OTHER
+    assert mirror.path_for(urls[0]) == mirror.path_for(urls[1])
+    assert len(list(tmp_path.glob("*/*"))) == 2
+    assert not list(tmp_path.glob("*.part"))
+
+    # A new mirror over the same root reads the manifest
+    with _mirror(tmp_path) as again:
+        hits = sum(_Handler.hits.values())
+        assert again.mirror(urls[:3]).skipped == urls[:3]
+        assert sum(_Handler.hits.values()) == hits
+        revalidated = again.mirror(urls[:1], revalidate=True)
+    assert revalidated.not_modified == urls[:1]
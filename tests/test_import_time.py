@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from benchmarks.import_time import BUDGETS, normalized
+
+# Budgets depend on machine speed, so the check is opt-in (or run
+# benchmarks/import_time.py directly)
+pytestmark = pytest.mark.skipif(not os.environ.get("TABLETKIUA_IMPORT_BUDGETS"),
+                                reason="set TABLETKIUA_IMPORT_BUDGETS=1 to check import time")
+
+# Best of a few fresh interpreters: scheduler noise only ever adds time, so
+# the minimum tracks the real import cost and keeps the check stable.
+RUNS = 5
+
+
+@pytest.mark.parametrize("stmt", list(BUDGETS))
+def test_import_time_within_budget(stmt):
+    best = min(normalized(stmt) for _ in range(RUNS))
+    assert best <= BUDGETS[stmt], f"{stmt}: {best:.1f} ms > {BUDGETS[stmt]:g} ms budget"
@@ -0,0 +1,53 @@
+import warnings
+
+import pytest
+import requests
+
+from tabletkiua import NetworkError
+from tabletkiua.transport import FakeReply, FakeTransport
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from tabletkiua import main as legacy
+
+
+def _client(*replies):
+    client = legacy.TabletkiUA("token", retries=0)
+    fake = FakeTransport()
+    fake.add("GET", "Locations/locationByIp", *replies)
+    client.transport = fake
+    return client
+
+
+@pytest.mark.parametrize("cause, expected", [
+    (requests.ConnectionError("refused"), requests.ConnectionError),
+    (requests.ReadTimeout("slow"), requests.ReadTimeout),
+    (requests.ConnectTimeout("slow"), requests.ConnectTimeout),
+    (requests.RequestException("other"), requests.RequestException),
+])
+def test_network_errors_are_requests_exceptions(cause, expected):
+    error = NetworkError(str(cause))
+    error.__cause__ = cause
+    client = _client(FakeReply(error=error))
+    with pytest.raises(expected) as info:
+        client.location_by_ip()
+    assert isinstance(info.value, NetworkError)
+    assert isinstance(info.value, requests.RequestException)
+
+
+def test_api_errors_are_http_errors():
+    client = _client(FakeReply(500, {"message": "boom"}))
+    with pytest.raises(requests.HTTPError):
+        client.location_by_ip()
+
+
+def test_legacy_attributes_are_writable():
+    client = _client({"id": "1", "name": "Київ"})
+    client.app_api_token = "new-token"
+    client.base_url = "https://example.test/api/"
+    client.timeout = 3
+    client.location_by_ip()
+    call = client.transport.calls[-1]
+    assert call.url == "https://example.test/api/Locations/locationByIp"
+    assert call.headers["AppApiToken"] == "new-token"
+    assert (client.base_url, client.timeout) == ("https://example.test/api", 3)
@@ -0,0 +1,66 @@
+from tabletkiua.locations import LocationRegistry
+from tabletkiua.models import Location
+
+
+def _loc(loc_id, name, sw, ne, *, priority=0, url=None):
+    return Location.from_dict({"id": loc_id, "name": name, "url": url or name.lower(),
+                               "southWestLat": sw[0], "southWestLng": sw[1],
+                               "northEastLat": ne[0], "northEastLng": ne[1],
+                               "priority": priority})
+
+
+def _registry():
+    registry = LocationRegistry(cell_size=0.25)
+    registry.add(_loc("10", "Kyivska oblast", (49.2, 29.2), (51.6, 32.2)))
+    registry.add(_loc("1000", "Kyiv", (50.2, 30.2), (50.6, 30.9)))
+    registry.add(_loc("2000", "Lviv", (49.7, 23.9), (49.9, 24.2)))
+    return registry
+
+
+def test_locate_returns_smallest_containing_box():
+    registry = _registry()
+    assert registry.locate(50.45, 30.52).id == "1000"
+    assert registry.locate(50.0, 31.5).id == "10"
+    assert registry.header_for(49.84, 24.03) == "2000"
+    assert registry.locate(46.48, 30.72) is None
+    assert registry.header_for(46.48, 30.72) == ""
+
+
+def test_equal_boxes_prefer_higher_priority():
+    registry = _registry()
+    registry.add(_loc("1001", "Kyiv center", (50.2, 30.2), (50.6, 30.9), priority=5))
+    assert registry.locate(50.45, 30.52).id == "1001"
+
+
+def test_readding_moves_the_grid_entry():
+    registry = _registry()
+    registry.add(_loc("2000", "Lviv", (48.4, 35.0), (48.6, 35.2)))
+    assert len(registry) == 3
+    assert registry.locate(49.84, 24.03) is None
+    assert registry.locate(48.5, 35.1).id == "2000"
+
+
+def test_lookups_and_persistence(tmp_path):
+    registry = _registry()
+    assert registry.by_url("/kyiv/").id == "1000"
+    assert registry.by_name("  KYIV ").id == "1000"
+    path = tmp_path / "locations.json"
+    registry.save(path)
+    loaded = LocationRegistry.load(path)
+    assert [loc.id for loc in loaded] == ["10", "1000", "2000"]
+    assert loaded.locate(50.45, 30.52) == registry.get("1000")
+    assert len(LocationRegistry.load(tmp_path / "missing.json")) == 0
+
+
+def test_readding_replaces_names_and_urls():
+    registry = _registry()
+    registry.add(_loc("1000", "Kyiv city", (50.2, 30.2), (50.6, 30.9), url="kyiv-city"))
+    assert registry.by_name("Kyiv") is None
+    assert registry.by_url("kyiv") is None
+    assert registry.by_name("kyiv city").id == "1000"
+    assert registry.by_url("kyiv-city").id == "1000"
+
+    # A name held by another location is not taken over, nor dropped by it
+    registry.add(_loc("3000", "Lviv", (45.0, 30.0), (45.1, 30.1), url="lviv-2"))
+    registry.add(_loc("3000", "Lviv village", (45.0, 30.0), (45.1, 30.1), url="lviv-2"))
+    assert registry.by_name("lviv").id == "2000"
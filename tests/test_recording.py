@@ -0,0 +1,47 @@
+from tabletkiua import ClientConfig, FakeTransport, ReplayTransport, TabletkiUA
+from tabletkiua.transport import FakeCall, FakeReply
+
+
+def _card(call: FakeCall) -> FakeReply:
+    # Price depends on goods id and city, like the real endpoint
+    loc = call.headers.get("Location", "")
+    price = int(call.params["id"]) * 1000 + int(loc or 0)
+    return FakeReply(body={"priceMin": price, "priceMax": price + 1, "canBeDelivered": True})
+
+
+def test_replay_keeps_location_dependent_answers_apart(tmp_path):
+    archive = tmp_path / "traffic.jsonl.gz"
+    goods, locations = ["1", "2", "3"], [str(n) for n in range(1, 41)]
+
+    fake = FakeTransport()
+    fake.add("GET", "ProductCard/card", _card)
+    live = TabletkiUA("token", transport=fake, config=ClientConfig(retries=0))
+    with live.record(archive):
+        recorded = live.price_matrix(goods, locations, max_workers=8)
+    assert not recorded.errors
+
+    replay = ReplayTransport(archive, latency_scale=0)
+    client = TabletkiUA("token", transport=replay, config=ClientConfig(retries=0))
+    replayed = client.price_matrix(goods, locations, max_workers=8)
+
+    assert not replayed.errors and not replay.missed
+    for code in goods:
+        for loc in locations:
+            expected = int(code) * 1000 + int(loc)
+            assert replayed.get(code, loc) == (expected, expected + 1, True)
+    assert replayed.price_min == recorded.price_min
+
+
+def test_replay_misses_unrecorded_location(tmp_path):
+    archive = tmp_path / "traffic.jsonl"
+    fake = FakeTransport()
+    fake.add("GET", "ProductCard/card", _card)
+    live = TabletkiUA("token", transport=fake, config=ClientConfig(retries=0))
+    with live.record(archive):
+        live.price_matrix(["1"], ["7"])
+
+    replay = ReplayTransport(archive, latency_scale=0)
+    client = TabletkiUA("token", transport=replay, config=ClientConfig(retries=0))
+    matrix = client.price_matrix(["1"], ["8"])
+    assert matrix.get("1", "8") == (None, None, None)
+    assert len(replay.missed) == 1
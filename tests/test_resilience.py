@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+from tabletkiua import ClientConfig, FakeTransport, NetworkError, Resilience, TabletkiUA
+from tabletkiua.resilience import CLOSED, HALF_OPEN
+from tabletkiua.transport import FakeReply
+
+ENDPOINT = "Locations/locationByIp"
+
+
+def test_unexpected_error_frees_half_open_trial():
+    outcomes = [NetworkError("down")] * 2 + [RuntimeError("bug")]
+
+    def handler(call):
+        if outcomes:
+            raise outcomes.pop(0)
+        return FakeReply(body={})
+
+    transport = FakeTransport()
+    transport.add("GET", ENDPOINT, handler)
+    resilience = Resilience(min_calls=2, reset_timeout=0.05)
+    client = TabletkiUA("token", transport=transport, resilience=resilience,
+                        config=ClientConfig(retries=0))
+    for _ in range(2):
+        with pytest.raises(NetworkError):
+            client.location_by_ip(store=False)
+    time.sleep(0.06)
+    breaker = resilience.breaker(ENDPOINT)
+    assert breaker.state == HALF_OPEN
+
+    with pytest.raises(RuntimeError):
+        client.location_by_ip(store=False)
+    client.location_by_ip(store=False)  # the trial slot was given back
+    assert breaker.state == CLOSED
@@ -0,0 +1,57 @@
+import pytest
+
+from tabletkiua import ApiError, ClientConfig, FakeTransport, NetworkError, TabletkiUA
+from tabletkiua.transport import FakeReply
+
+ENDPOINT = "Locations/locationByIp"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr("tabletkiua.client.time.sleep", slept.append)
+    return slept
+
+
+def _client(*replies, **config):
+    transport = FakeTransport()
+    transport.add("GET", ENDPOINT, *replies)
+    return TabletkiUA("token", transport=transport, config=ClientConfig(**config)), transport
+
+
+def test_retries_forcelisted_statuses_with_backoff(sleeps):
+    client, transport = _client(FakeReply(503), FakeReply(502), FakeReply(500),
+                                FakeReply(body={"id": "1000"}), backoff_factor=0.5)
+    assert client.location_by_ip(store=False).id == "1000"
+    assert len(transport.calls) == 4
+    assert sleeps == [1.0, 2.0]  # urllib3 schedule: the first retry is immediate
+
+
+def test_retry_after_overrides_backoff(sleeps):
+    client, transport = _client(FakeReply(429, headers={"Retry-After": "7"}),
+                                FakeReply(body={"id": "1000"}))
+    client.location_by_ip(store=False)
+    assert sleeps == [7.0]
+
+
+def test_network_errors_are_retried(sleeps):
+    client, transport = _client(FakeReply(error=NetworkError("reset")),
+                                FakeReply(body={"id": "1000"}), backoff_factor=0)
+    assert client.location_by_ip(store=False).id == "1000"
+    assert len(transport.calls) == 2
+
+
+def test_last_response_is_returned_when_retries_run_out(sleeps):
+    client, transport = _client(FakeReply(503, body={"message": "busy"}), retries=2)
+    with pytest.raises(ApiError) as info:
+        client.location_by_ip(store=False)
+    assert info.value.status_code == 503
+    assert len(transport.calls) == 3
+
+
+def test_other_statuses_are_not_retried(sleeps):
+    client, transport = _client(FakeReply(404, body={"message": "no"}))
+    with pytest.raises(ApiError):
+        client.location_by_ip(store=False)
+    assert len(transport.calls) == 1
+    assert sleeps == []
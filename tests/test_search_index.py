@@ -0,0 +1,58 @@
+from tabletkiua.models import SearchItem
+from tabletkiua.search_index import SearchIndex, to_latin
+
+
+def _item(name, code=None):
+    return SearchItem.from_dict({"name": name, "code": code, "screenViewType": "GOODS"})
+
+
+def _index(*names):
+    index = SearchIndex()
+    for i, name in enumerate(names):
+        index.add_item(_item(name, str(i)))
+    return index
+
+
+def test_ranking_prefers_phrase_then_first_word_then_short_names():
+    index = _index("Вода для носа аквамарис", "Аквамарис спрей назальний 30 мл",
+                   "Аквадетрим краплі", "Аква Маріс")
+    names = [it.name for it in index.query("аква")]
+    assert names == ["Аква Маріс", "Аквадетрим краплі", "Аквамарис спрей назальний 30 мл",
+                     "Вода для носа аквамарис"]
+    # Every query word is a prefix and all must match
+    assert [it.name for it in index.query("спр аквам")] == ["Аквамарис спрей назальний 30 мл"]
+    assert index.query("аква таблетки") == []
+
+
+def test_repeated_hits_rank_higher():
+    index = _index("Нурофен форте", "Нурофен дитячий")
+    for _ in range(5):
+        index.add_item(_item("Нурофен форте", "0"))
+    assert len(index) == 2
+    assert [it.name for it in index.query("нуроф")] == ["Нурофен форте", "Нурофен дитячий"]
+
+
+def test_transliterated_queries_cross_scripts():
+    index = _index("Нурофен форте", "Shchedryk vitamin", "Їжачок")
+    assert to_latin("Щедрик") == to_latin("Shchedryk") == "schedrik"
+    assert [it.name for it in index.query("nurofen", transliterate=True)] == ["Нурофен форте"]
+    assert [it.name for it in index.query("щедр", transliterate=True)] == ["Shchedryk vitamin"]
+    assert [it.name for it in index.query("izhach", transliterate=True)] == ["Їжачок"]
+    assert index.query("nurofen") == []  # without transliteration scripts stay apart
+
+
+def test_phrase_bonus_applies_to_transliterated_queries():
+    index = _index("Нурофен дитячий форте", "Нурофен форте таблетки 400 мг №24")
+    expected = ["Нурофен форте таблетки 400 мг №24", "Нурофен дитячий форте"]
+    assert [it.name for it in index.query("нурофен ф")] == expected
+    assert [it.name for it in index.query("nurofen f", transliterate=True)] == expected
+
+
+def test_renamed_item_is_reindexed():
+    index = _index("Стара назва")
+    index.add_item(_item("Нова назва", "0"))
+    assert len(index) == 1
+    assert index.query("стар") == []
+    assert [it.name for it in index.query("нова")] == ["Нова назва"]
+    assert [it.name for it in index.query("nova", transliterate=True)] == ["Нова назва"]
+    assert [it.name for it in index.query("назва")] == ["Нова назва"]
@@ -0,0 +1,53 @@
+from tabletkiua.models import HtmlSection
+from tabletkiua.sections import Block, SectionProcessor, classify, extract_blocks
+
+HTML = """
+<h3>Спосіб застосування</h3>
+<p>Дорослим:   по 1&nbsp;таблетці<br>3 рази на добу.</p>
+<script>track("x")</script>
+<ul><li>до їди</li><li>запивати <b>водою</b></li></ul>
+<table><tr><th>Вік</th><th>Доза</th></tr><tr><td>12+</td><td>500 мг</td></tr></table>
+текст у кінці
+"""
+
+
+def _section(i, title, html):
+    return HtmlSection.from_dict({"id": i, "title": title, "html": html})
+
+
+def test_extract_blocks():
+    assert extract_blocks(HTML) == (
+        Block("heading", "Спосіб застосування"),
+        Block("paragraph", "Дорослим: по 1 таблетці\n3 рази на добу."),
+        Block("list_item", "до їди"),
+        Block("list_item", "запивати водою"),
+        Block("table_row", "Вік | Доза"),
+        Block("table_row", "12+ | 500 мг"),
+        Block("paragraph", "текст у кінці"),
+    )
+
+
+def test_classify_titles():
+    assert classify("СПОСІБ ЗАСТОСУВАННЯ ТА ДОЗИ") == "dosage"
+    assert classify("Противопоказания") == "contraindications"
+    assert classify("Склад") == "composition"
+    assert classify("Виробник") is None
+
+
+def test_process_memoizes_by_html():
+    processor = SectionProcessor()
+    first = processor.process(_section(1, "Дозування", HTML))
+    again = processor.process(_section(2, "Спосіб застосування", HTML))
+    assert first.kind == again.kind == "dosage"
+    assert first.text.splitlines()[:2] == ["Спосіб застосування", "Дорослим: по 1 таблетці"]
+    assert again.blocks is first.blocks
+    assert processor.stats == {"hits": 1, "misses": 1}
+
+
+def test_process_batch_matches_process():
+    sections = [_section(i, "Склад", f"<p>речовина {i % 3}</p>") for i in range(7)]
+    processor = SectionProcessor()
+    batch = processor.process_batch(sections, max_workers=2)
+    assert [s.text for s in batch] == [f"речовина {i % 3}" for i in range(7)]
+    assert processor.stats["misses"] == 3
+    assert processor.process_batch(sections[:2]) == batch[:2]
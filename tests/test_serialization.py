@@ -0,0 +1,107 @@
+import dataclasses
+import marshal
+import struct
+
+import pytest
+
+from benchmarks.serialization import synthetic_card
+from tabletkiua import serialization
+from tabletkiua.exceptions import SerializationError
+from tabletkiua.models import Location, ProductCard, SearchHintsResponse
+
+
+def _instances():
+    """One instance of every serializable model, taken from real-shaped payloads."""
+    hints = SearchHintsResponse.from_dict({"group": [{"name": "Товари", "searchItems": [
+        {"name": "Парацетамол", "code": "1025098", "screenViewType": "GOODS",
+         "canBeDelivered": True}]}], "code": 0, "description": None})
+    location = Location.from_dict({"areaId": "1", "id": "1000", "name": "Київ",
+                                   "northEastLat": 50.59, "southWestLng": 30.24,
+                                   "url": "kyiv", "index": True, "priority": 3})
+    found = {}
+
+    def walk(obj):
+        if dataclasses.is_dataclass(obj):
+            found.setdefault(type(obj), obj)
+            for f in dataclasses.fields(obj):
+                walk(getattr(obj, f.name))
+        elif isinstance(obj, list):
+            for x in obj:
+                walk(x)
+
+    for obj in (ProductCard.from_dict(synthetic_card()), hints, location):
+        walk(obj)
+    return found
+
+
+INSTANCES = _instances()
+
+
+def test_every_model_is_covered():
+    assert {cls.__name__ for cls in INSTANCES} == set(serialization.TAGS)
+
+
+@pytest.mark.parametrize("cls", list(INSTANCES), ids=lambda cls: cls.__name__)
+def test_round_trip(cls):
+    obj = INSTANCES[cls]
+    data = obj.to_bytes()
+    assert cls.from_bytes(data) == obj
+    assert serialization.loads(memoryview(data)) == obj
+
+
+def test_card_without_raw():
+    card = INSTANCES[ProductCard]
+    slim = card.to_bytes(raw=False)
+    assert len(slim) < len(card.to_bytes())
+    decoded = ProductCard.from_bytes(slim)
+    assert decoded.raw == {}
+    assert dataclasses.replace(decoded, raw=card.raw) == card
+
+
+def _with_header(data, *, magic=b"TU", version=serialization.FORMAT_VERSION, tag=None,
+                 schema=None):
+    old = struct.unpack_from(">2sBBI", data)
+    header = struct.pack(">2sBBI", magic, version, old[2] if tag is None else tag,
+                         old[3] if schema is None else schema)
+    return header + bytes(data[8:])
+
+
+@pytest.mark.parametrize("mangle", [
+    lambda d: d[:5],
+    lambda d: _with_header(d, magic=b"XX"),
+    lambda d: _with_header(d, version=serialization.FORMAT_VERSION + 1),
+    lambda d: _with_header(d, tag=250),
+    lambda d: _with_header(d, schema=serialization.SCHEMA ^ 1),
+    lambda d: d[:8] + b"\x00garbage",
+], ids=["truncated", "magic", "version", "tag", "schema", "corrupt"])
+def test_bad_payloads_raise(mangle):
+    data = INSTANCES[Location].to_bytes()
+    with pytest.raises(SerializationError):
+        Location.from_bytes(mangle(data))
+
+
+def test_wrong_model_raises():
+    with pytest.raises(SerializationError, match="is not ProductCard"):
+        ProductCard.from_bytes(INSTANCES[Location].to_bytes())
+
+
+def test_upgrader_dispatch(monkeypatch):
+    location = INSTANCES[Location]
+    old_schema = serialization.SCHEMA ^ 0xFFFF
+    # An older Location layout without the trailing ``priority`` field
+    old_payload = marshal.dumps(dataclasses.astuple(location)[:-1])
+    data = _with_header(location.to_bytes()[:8] + old_payload, schema=old_schema)
+
+    calls = []
+
+    def upgrade(model, payload):
+        calls.append(model)
+        return (*payload, 3)
+
+    monkeypatch.setitem(serialization.UPGRADERS, old_schema, upgrade)
+    assert Location.from_bytes(data) == location
+    assert calls == [Location]
+
+    monkeypatch.setitem(serialization.UPGRADERS, old_schema, lambda model, payload: payload)
+    with pytest.raises(SerializationError, match="does not fit Location"):
+        Location.from_bytes(data)
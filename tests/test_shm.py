@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from tabletkiua.models import ProductCard
+from tabletkiua.shm import CardRing, parse_cards_shared
+
+
+def _payload(i):
+    return json.dumps({"goodsIntCode": i, "goodsName": f"Товар {i}", "priceMin": i / 2,
+                       "priceMax": i, "isDrugs": i % 2 == 0, "canBeDelivered": i % 3 == 0})
+
+
+def _segments():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+@pytest.fixture
+def no_leaks():
+    before = _segments()
+    yield
+    assert not {n for n in _segments() - before if n.startswith("psm_")}
+
+
+def test_round_trip_wraps_small_rings(no_leaks):
+    payloads = [_payload(i) for i in range(1, 201)]
+    payloads[57] = "{not json"
+    seen = {}
+    # 4 slots and a 2 kB heap per worker: both wrap many times
+    for rec in parse_cards_shared(payloads, workers=2, slots=4, heap_size=2048):
+        if rec.ok:
+            card = rec.card()
+            seen[rec.index] = (rec.goods_int_code, rec.price_min, rec.name, rec.is_drugs,
+                               rec.can_be_delivered, card.goodsName)
+        else:
+            seen[rec.index] = rec.error
+
+    assert len(seen) == 200
+    assert seen[57].startswith("JSONDecodeError")
+    for i in (0, 1, 99, 199):
+        n = i + 1
+        assert seen[i] == (n, n / 2, f"Товар {n}", n % 2 == 0, n % 3 == 0, f"Товар {n}")
+
+
+def test_early_break_stops_workers(no_leaks):
+    payloads = [_payload(i) for i in range(1, 2001)]
+    records = parse_cards_shared(payloads, workers=2, slots=4, heap_size=2048, blob=False)
+    first = next(records)
+    assert first.ok
+    records.close()  # producers blocked on full rings are terminated
+
+
+def test_close_with_live_view_fails_clearly(no_leaks):
+    ring = CardRing.create(slots=2, heap_size=1024)
+    ring.put(ProductCard.from_dict(json.loads(_payload(7))), 0)
+    ring.finish()
+    view = next(ring.drain())
+    held = view.name_bytes
+    with pytest.raises(BufferError, match="exported views"):
+        ring.close()
+    assert bytes(held).decode() == "Товар 7"
+    held.release()
+    ring.close()
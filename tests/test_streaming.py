@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from tabletkiua.exceptions import SerializationError
+from tabletkiua.streaming import decode_object, iter_members
+
+DOCUMENTS = [
+    {},
+    {"n": 12},
+    {"a": -1.5e3, "b": True, "c": False, "d": None, "e": 0},
+    {"goodsName": "Парацетамол 500 мг №10", "emoji": "ліки 💊", "e": "\u00e9"},
+    {"quotes": 'він сказав "так"', "slashes": "C:\\temp\\", "braces": "{[}]", "tail": "\\"},
+    {"html": [{"text": "<p>{\"json\": [1, 2]}</p>", "n": [[], [[]], {}]}] * 3, "x": 1},
+    {"skipped": {"deep": [{"s": "}]\"{"}, [1, {"k": "\\\""}]], "more": "💊" * 40},
+     "kept": {"list": list(range(50))}, "last": "end"},
+]
+SIZES = [1, 2, 3, 7, 64, 10_000]
+
+
+def _text(doc, *, escaped):
+    # ensure_ascii=True gives \uXXXX escapes and surrogate pairs; False raw UTF-8
+    return json.dumps(doc, ensure_ascii=escaped, indent=1 if escaped else None)
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("escaped", [False, True])
+@pytest.mark.parametrize("doc", DOCUMENTS)
+def test_matches_json_loads(doc, escaped, size):
+    data = _text(doc, escaped=escaped).encode("utf-8")
+    assert decode_object(_chunks(data, size)) == json.loads(data)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("doc", DOCUMENTS)
+def test_skip_drops_exactly_the_skipped_members(doc, size):
+    skip = {"skipped", "html", "emoji", "b", "n"}
+    data = _text(doc, escaped=True).encode("utf-8")
+    expected = {k: v for k, v in json.loads(data).items() if k not in skip}
+    assert decode_object(_chunks(data, size), skip=skip) == expected
+
+
+def test_members_arrive_before_the_stream_ends():
+    seen = []
+
+    def chunks():
+        yield b'{"first": [1, 2], "second": '
+        seen.append("second chunk requested")
+        yield b'"x"}'
+
+    members = iter_members(chunks())
+    assert next(members) == ("first", [1, 2])
+    assert not seen
+    assert list(members) == [("second", "x")]
+
+
+@pytest.mark.parametrize("data", [
+    b"", b"[1, 2]", b'{"a": 1', b'{"a": "unterminated', b'{"a": {"b": [1}', b'{"a" 1}',
+    b'{"a": 1 "b": 2}', b'{1: 2}', b'{"a": tru}',
+])
+def test_malformed_streams_raise(data):
+    with pytest.raises(SerializationError):
+        decode_object(_chunks(data, 3))